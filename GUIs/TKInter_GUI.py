@@ -1,27 +1,24 @@
 import tkinter as tk
 from tkinter import ttk
 from datetime import datetime
-import yfinance as yf
-import pandas as pd
-import openai
-from Gen_Files.Company_Info_Web_Scraper import get_company_info, get_wiki_info, summarize_article
+from dotenv import load_dotenv
+from Gen_Files.Gen_Funcs import get_wiki_info
 from Gen_Files.GetArticles import get_MW_Articles
-from Gen_Files.Stock_Analyzer import *
+from Gen_Files.Stock_Analyzer import plot_stock_with_moving_averages
+from Gen_Files.Summary import google_summary
+from Gen_Files.Price_Cache import get_price_cache
+from Gen_Files.Metadata_Store import get_metadata_store
+from Gen_Files.Compute import company_profile, price_stats
+from Gen_Files.Render import tk_company_profile, tk_price_stats
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-yf.pdr_override()
-
-# set openai api key
-openai.api_key = os.environ.get('API_KEY')
+# set env vars (the AI analysis reads its API key from them)
+load_dotenv()
 
 
 def get_stock_data(symbol, start_date, end_date):
-    ticker = yf.download(symbol, start_date, end_date)
-
-    # save stock data to csv
-    file = ticker.to_csv("Price_data\\"+symbol + '_Price_Data.csv')
-
-    return file
+    # served from the columnar price cache, only missing dates are downloaded
+    return get_price_cache().get_history(symbol, start_date, end_date)
 
 
 def main():
@@ -36,56 +33,36 @@ def main():
         start_date = start_date_entry.get()
         end_date = end_date_entry.get()
 
-        # download and save stock data
-        stock_data = get_stock_data(ticker_symbol, start_date, end_date)
+        # load stock data
+        data = get_stock_data(ticker_symbol, start_date, end_date)
 
         # display stock data
-        filename = "Price_Data\\" + ticker_symbol + '_Price_Data.csv'
-
-        data = pd.read_csv(filename, index_col=0, parse_dates=True)
-
-        fig = plot_stock_with_moving_averages_from_csv(filename)
+        fig = plot_stock_with_moving_averages(data)
 
         canvas = FigureCanvasTkAgg(fig, master=root)
         canvas.get_tk_widget().pack()
 
-        # Get company info and stock data
-        info = get_company_info(ticker_symbol)
+        # display company info and price statistics
+        info = get_metadata_store().get(ticker_symbol)
 
-        info_label1 = tk.Grid(root, text=info['name'])
-        info_label1.grid(row=2, column=0)
-        info_label2 = tk.Label(root, text=info['sector'])
-        info_label2.pack()
-        info_label3 = tk.Label(root, text=info['industry'])
-        info_label3.pack()
-        info_label4 = tk.Label(root, text=info['summary'])
-        info_label4.config(wraplength=500)
-        info_label4.pack()
+        tk_company_profile(output_frame, company_profile(ticker_symbol, info, data)).pack()
+        tk_price_stats(output_frame, price_stats(ticker_symbol, data)).pack()
 
         # get wiki info
-        wiki_url = get_wiki_info(ticker_symbol)
-        wiki_url_label['text'] = wiki_url
-
-        # read stock price data from csv
-        filename = "Price_Data\\" + ticker_symbol + '_Price_Data.csv'
-        df = pd.read_csv(filename)
+        wiki_url, _ = get_wiki_info(ticker_symbol)
+        wiki_url_label['text'] = wiki_url or "No Wikipedia page found"
 
-        # analyze stock data
-        analyze_result = google_summary(filename)
-        analyze_label['text'] = analyze_result
-
-        analyze_label.insert(tk.END, analyze_result)
+        # analyze stock data, updating the label as the text streams in
+        analyze_label['text'] = ""
+        for chunk in google_summary(data, info, stream=True):
+            analyze_label['text'] += chunk
+            root.update_idletasks()
 
         # get articles
         articles = get_MW_Articles(ticker_symbol)
 
-        articles_label.insert(tk.END, '\n'.join(
-            [article['title'], article['url'], summarize_article(article)]))
-
         # display articles
-        for article in articles:
-            articles_label['text'] = '\n'.join(
-                [article['title'], article['url'], summarize_article(article)])
+        articles_label['text'] = '\n\n'.join(article['title'] + '\n' + article['url'] for article in articles)
 
     root = tk.Tk()
 
@@ -1,28 +1,13 @@
 import tkinter as tk
 from tkinter import ttk
 
-from Company_Info_Web_Scraper import *
-from GetArticles import *
-from Stock_Analyzer import *
-import config
-from docx import Document
 from datetime import datetime
-import yfinance as yf
-import pandas as pd
-import openai
+from dotenv import load_dotenv
 
+from Gen_Files.Report_Builder import build_reports, DEFAULT_REPORT_DIR
 
-# set openai api key
-openai.api_key = config.API_KEY
-
-
-def get_stock_data(symbol, start_date, end_date):
-    ticker = yf.download(symbol, start_date, end_date)
-
-    # save stock data to csv
-    file = ticker.to_csv("Price_data\\"+symbol + '_Price_Data.csv')
-
-    return file
+# set env vars
+load_dotenv()
 
 
 def main():
@@ -32,67 +17,19 @@ def main():
     default_end_date = datetime.today().strftime('%Y-%m-%d')
 
     def fetch_data():
-        # Get user input
-        ticker_symbol = ticker_entry.get()
+        # Get user input, one or more comma separated tickers
+        ticker_symbols = ticker_entry.get().upper().split(",")
         start_date = start_date_entry.get()
         end_date = end_date_entry.get()
 
-        # download and save stock data
-        info = get_stock_data(ticker_symbol, start_date, end_date)
-
-        # Create a new document
-        doc = Document()
-        # doc.save(f"{ticker_symbol}_report.docx")
-
-        # Add a heading of level 0 (largest heading)
-        doc.add_heading(f'Stock Report for {ticker_symbol}', 0)
-
-        # Get company info and stock data
-        info = get_company_info(ticker_symbol)
-
-        # Add company info to document
-        doc.add_heading('Company Information:', 1)
-        doc.add_paragraph(f"Name: {info['name']}")
-        doc.add_paragraph(f"Sector: {info['sector']}")
-        doc.add_paragraph(f"Industry: {info['industry']}")
-        doc.add_paragraph(f"Summary: {info['summary']}")
-
-        # read stock price data from csv
-        filename = "Price_Data\\" + ticker_symbol + '_Price_Data.csv'
-        df = pd.read_csv(filename)
-
-        # get wiki info
-        wiki_url = get_wiki_info(info['name'])
-
-        # Add wiki url to document
-        doc.add_heading('Wikipedia Information', 1)
-        doc.add_paragraph(wiki_url)
-
-        # Add analysis to document
-        doc.add_heading('Stock Analysis', 1)
-        # doc.add_paragraph(get_stock_indicators(
-        #     ticker_symbol, start_date, end_date))
-        doc.add_paragraph(google_summary(
-            ticker_symbol, start_date, end_date))
-
-        # plot stock data
-        fig = plot_stock_with_moving_averages_from_csv(filename)
-        fig.savefig(f'{ticker_symbol}_stock_plot.png')
-        doc.add_picture(f'{ticker_symbol}_stock_plot.png')
-
-        # get articles
-        articles = get_MW_Articles(ticker_symbol, 1)
-
-        # Add articles to document
-        doc.add_heading('Articles', 1)
-        for article in articles:
-            doc.add_paragraph(article['title'])
-            doc.add_paragraph(article['url'])
-            doc.add_paragraph(summarize_article(article))
+        # gather, chart and write every report through the batch pipeline
+        reports, errors, metrics = build_reports(ticker_symbols, start_date, end_date,
+                                                 out_dir=DEFAULT_REPORT_DIR)
 
-        # Save the document
-        doc.save(
-            f'C:\\Users\\Aidan\\Desktop\\USB\\Projects\\Python\\MoneyBots\\{ticker_symbol}_report.docx')
+        for symbol, reason in errors.items():
+            print(f"Report for {symbol} failed: {reason}")
+        print(f"Wrote {metrics['reports']} reports to {DEFAULT_REPORT_DIR} "
+              f"({metrics['reports_per_minute']:.1f} reports/min)")
 
         # close the root window
         root.destroy()
@@ -108,7 +45,7 @@ def main():
     output_frame.pack(side="bottom", fill="both", expand=True)
 
     # User Input
-    ticker_label = tk.Label(input_frame, text="Enter Ticker Symbol:")
+    ticker_label = tk.Label(input_frame, text="Enter Ticker Symbols:")
     ticker_entry = tk.Entry(input_frame)
     start_date_label = tk.Label(input_frame, text="Start date:")
     start_date_entry = tk.Entry(input_frame)
@@ -0,0 +1,110 @@
+# Article_Parser.py
+
+import re
+
+# lxml is much faster than html.parser; fall back to BeautifulSoup without it
+try:
+    import lxml.html
+    import lxml.etree
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# the only elements the extractors look at
+WANTED_TAGS = ['a', 'h3', 'p']
+
+
+# leading <?xml ...?> declaration, which lxml rejects in an already decoded str
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+# parse with lxml, or None for a page without elements (empty, whitespace or comments only)
+def _lxml_tree(html):
+    if not html or not html.strip():
+        return None
+    if isinstance(html, str):
+        # the str is decoded already, so its declared encoding no longer applies
+        html = XML_DECLARATION.sub('', html, count=1)
+    try:
+        return lxml.html.fromstring(html)
+    except (lxml.etree.ParserError, ValueError):
+        return None
+
+
+class ParsedPage:
+    """
+    One parse of an HTML page shared by the link, headline and paragraph
+    extractors.
+
+    With lxml installed the page is parsed by lxml's C parser and elements
+    are selected with XPath; otherwise BeautifulSoup only builds the a, h3
+    and p elements (via SoupStrainer) instead of the whole tree.
+
+    Args:
+        html: Page source (str or bytes).
+    """
+
+    def __init__(self, html):
+        if HAVE_LXML:
+            self._tree = _lxml_tree(html)
+            self._soup = None
+        else:
+            self._tree = None
+            self._soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer(WANTED_TAGS))
+
+    def links(self):
+        """
+        Get (text, href) for every <a> with an href.
+        """
+        if HAVE_LXML:
+            if self._tree is None:
+                return []
+            return [(a.text_content().strip(), a.get('href')) for a in self._tree.iter('a') if a.get('href')]
+        return [(a.text.strip(), a.get('href')) for a in self._soup.find_all('a') if a.get('href')]
+
+    def headlines(self, class_name='article__headline'):
+        """
+        Get (title, href) for every <h3 class=class_name> containing a link.
+        """
+        if HAVE_LXML:
+            if self._tree is None:
+                return []
+            headlines = []
+            for h3 in self._tree.xpath(f'//h3[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]'):
+                link = h3.find('.//a')
+                if link is not None and link.get('href'):
+                    headlines.append((h3.text_content().strip(), link.get('href')))
+            return headlines
+
+        headlines = []
+        for h3 in self._soup.find_all('h3', {'class': class_name}):
+            link = h3.find('a')
+            if link is not None and link.get('href'):
+                headlines.append((h3.text.strip(), link['href']))
+        return headlines
+
+    def paragraphs(self, contains=None):
+        """
+        Get the text of every <p>, optionally only those whose text contains
+        the given string.
+        """
+        if HAVE_LXML:
+            if self._tree is None:
+                return []
+            texts = [p.text_content() for p in self._tree.iter('p')]
+        else:
+            texts = [p.getText() for p in self._soup.find_all('p')]
+
+        if contains is None:
+            return texts
+        return [text for text in texts if contains in text]
+
+
+# parse a page once for all extractors
+def parse_page(html):
+    """
+    Parse html into a ParsedPage.
+    """
+    return ParsedPage(html)
@@ -0,0 +1,250 @@
+# Article_Scraper.py
+
+import threading
+from urllib.parse import urlparse, quote_plus
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from Gen_Files.Article_Parser import parse_page
+
+# default site locations, overridable (e.g. with a local fixture server)
+BASE_URLS = {
+    'marketwatch': 'https://www.marketwatch.com',
+    'google': 'https://www.google.com/finance',
+}
+
+# request defaults
+DEFAULT_TIMEOUT = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_PER_HOST = 4
+DEFAULT_MAX_WORKERS = 16
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; QuickStockInfo)'}
+
+
+# build a pooled session with retries and backoff
+def make_session(retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, pool_size=DEFAULT_MAX_WORKERS):
+    """
+    Create a requests Session that reuses connections and retries failed
+    GETs (connection errors, 429 and 5xx) with exponential backoff.
+    """
+    retry = Retry(total=retries, backoff_factor=backoff,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET']), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# parse MarketWatch search results
+def parse_mw_articles(page, base_url, symbol):
+    """
+    Get article records from a parsed MarketWatch search results page.
+    """
+    articles = []
+    for title, href in page.headlines('article__headline'):
+        articles.append({
+            'symbol': symbol,
+            'source': 'MarketWatch',
+            'title': title,
+            'url': href if href.startswith('http') else base_url + href,
+        })
+    return articles
+
+
+# parse Google Finance quote page links
+def parse_google_links(page, symbol):
+    """
+    Get external link records from a parsed Google Finance quote page.
+    """
+    articles = []
+    for title, href in page.links():
+        if "https:" in href:
+            articles.append({
+                'symbol': symbol,
+                'source': 'Google Finance',
+                'title': title,
+                'url': href,
+            })
+    return articles
+
+
+class ArticleScraper:
+    """
+    Concurrent article scraper over one pooled HTTP session.
+
+    Requests are limited per host, retried with backoff, time out, and use
+    conditional GETs (ETag / If-Modified-Since) so unchanged pages come back
+    as cheap 304 responses served from the local copy.
+
+    Args:
+        base_urls: Site locations, defaults to BASE_URLS.
+        session: requests Session to use, defaults to make_session().
+        timeout: Seconds before a request times out.
+        per_host: Maximum concurrent requests to one host.
+        max_workers: Maximum concurrent requests overall.
+    """
+
+    def __init__(self, base_urls=None, session=None, timeout=DEFAULT_TIMEOUT,
+                 per_host=DEFAULT_PER_HOST, max_workers=DEFAULT_MAX_WORKERS):
+        self.base_urls = dict(BASE_URLS, **(base_urls or {}))
+        self.session = session or make_session(pool_size=max_workers)
+        self.timeout = timeout
+        self.per_host = per_host
+        self.max_workers = max_workers
+
+        self._host_limits = {}
+        self._validators = {}
+        self._lock = threading.Lock()
+
+    # semaphore limiting concurrent requests to one host
+    def _host_limit(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            return self._host_limits.setdefault(host, threading.BoundedSemaphore(self.per_host))
+
+    def fetch(self, url):
+        """
+        GET a page and return its text, revalidating a previously fetched
+        copy instead of downloading it again when the server supports it.
+        """
+        with self._lock:
+            cached = self._validators.get(url)
+
+        headers = {}
+        if cached is not None:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        with self._host_limit(url):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and cached is not None:
+            return cached['text']
+
+        response.raise_for_status()
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._lock:
+                self._validators[url] = {'etag': etag, 'last_modified': last_modified,
+                                         'text': response.text}
+
+        return response.text
+
+    def fetch_many(self, urls):
+        """
+        Fetch many pages concurrently.
+
+        Returns:
+            pages: Dictionary mapping each fetched url to its text.
+            errors: Dictionary mapping each failed url to its error message.
+        """
+        pages = {}
+        errors = {}
+        if not urls:
+            return pages, errors
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(urls)))) as pool:
+            futures = {url: pool.submit(self.fetch, url) for url in urls}
+            for url, future in futures.items():
+                try:
+                    pages[url] = future.result()
+                except Exception as e:
+                    errors[url] = str(e)
+
+        return pages, errors
+
+    def mw_search_url(self, symbol):
+        return f"{self.base_urls['marketwatch']}/search?q={quote_plus(symbol)}"
+
+    def google_quote_url(self, symbol, exchange='NYSE'):
+        return f"{self.base_urls['google']}/quote/{quote_plus(symbol)}:{exchange}"
+
+    def _scrape(self, symbols, make_url, parse, pages=None):
+        symbols = [symbol for symbol in symbols if symbol != "^GSPC"]
+        urls = {symbol: make_url(symbol) for symbol in symbols}
+        texts, url_errors = self.fetch_many(list(urls.values()))
+
+        articles = {}
+        errors = {}
+        for symbol, url in urls.items():
+            if url in texts:
+                # parse once; the caller can reuse the page for other extractors
+                try:
+                    page = parse_page(texts[url])
+                    articles[symbol] = parse(page, symbol)
+                except Exception as e:
+                    # one unparsable page shouldn't cost the other symbols theirs
+                    errors[symbol] = f"Could not parse {url}: {e}"
+                    continue
+                if pages is not None:
+                    pages[symbol] = page
+            else:
+                errors[symbol] = url_errors.get(url, "Not fetched")
+        return articles, errors
+
+    def scrape_mw(self, symbols, pages=None):
+        """
+        Get MarketWatch article records for many symbols in parallel.
+
+        Args:
+            symbols: Ticker symbols.
+            pages: Optional dictionary that receives each symbol's ParsedPage,
+                so paragraphs can be extracted without parsing again.
+
+        Returns:
+            articles: Dictionary mapping symbol to a list of article records.
+            errors: Dictionary mapping each failed symbol to its error message.
+        """
+        base_url = self.base_urls['marketwatch']
+        return self._scrape(symbols, self.mw_search_url,
+                            lambda page, symbol: parse_mw_articles(page, base_url, symbol), pages)
+
+    def scrape_google(self, symbols, pages=None):
+        """
+        Get Google Finance link records for many symbols in parallel.
+
+        Args:
+            symbols: Ticker symbols.
+            pages: Optional dictionary that receives each symbol's ParsedPage.
+
+        Returns:
+            articles: Dictionary mapping symbol to a list of link records.
+            errors: Dictionary mapping each failed symbol to its error message.
+        """
+        return self._scrape(symbols, self.google_quote_url, parse_google_links, pages)
+
+
+# process-wide default scraper
+_scraper = None
+
+
+def get_scraper():
+    """
+    Get the shared ArticleScraper, creating it on first use.
+    """
+    global _scraper
+    if _scraper is None:
+        _scraper = ArticleScraper()
+    return _scraper
+
+
+def set_scraper(scraper):
+    """
+    Replace the shared ArticleScraper, e.g. with one pointed at a local
+    fixture server.
+    """
+    global _scraper
+    _scraper = scraper
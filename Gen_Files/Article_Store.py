@@ -0,0 +1,329 @@
+# Article_Store.py
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from Gen_Files.Price_Cache import DEFAULT_CACHE_DIR
+
+# query parameters that only track where a click came from
+TRACKING_PARAMS = re.compile(r'^(utm_.*|mod|ref|reflink|cmpid|fbclid|gclid|guccounter)$', re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    content_hash TEXT NOT NULL UNIQUE,
+    source TEXT,
+    title TEXT,
+    body TEXT,
+    fetched_at REAL NOT NULL,
+    fetched_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_date ON articles (fetched_date);
+
+CREATE TABLE IF NOT EXISTS article_symbols (
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    symbol TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    fetched_date TEXT NOT NULL,
+    PRIMARY KEY (article_id, symbol)
+);
+CREATE INDEX IF NOT EXISTS article_symbols_symbol ON article_symbols (symbol, fetched_at DESC);
+
+CREATE TABLE IF NOT EXISTS crawls (
+    symbol TEXT NOT NULL,
+    source TEXT NOT NULL,
+    last_crawl REAL NOT NULL,
+    PRIMARY KEY (symbol, source)
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, body, content='articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO articles_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+
+# normalize a url so the same article always has the same key
+def canonical_url(url):
+    """
+    Lowercase scheme and host, drop the fragment, tracking parameters and
+    trailing slash, and sort the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not TRACKING_PARAMS.match(k))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+# lowercase and collapse whitespace
+def _normalize(text):
+    return re.sub(r'\s+', ' ', text or '').strip().lower()
+
+
+# hash of an article's normalized content
+def content_hash(record):
+    """
+    Hash of the lowercased, whitespace-collapsed body, so the same story
+    syndicated under different urls is stored once (urls are unique on
+    their own). Records without a body are hashed by title and source, and
+    bare links without either by their canonical url.
+    """
+    text = _normalize(record.get('body'))
+    if not text:
+        title = _normalize(record.get('title'))
+        text = f"{title}\n{_normalize(record.get('source'))}" if title else canonical_url(record['url'])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# full-text query matching every word of text literally
+def fts_query(text):
+    """
+    Quote each word of user text as an FTS5 string, so characters such as
+    quotes, '-', ':' or '*' and words like NOT or OR are searched for
+    instead of parsed as query syntax.
+    """
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+class ArticleStore:
+    """
+    SQLite article store with deduplication and a full-text index.
+
+    Articles are deduplicated by canonical url and by content hash, indexed
+    per fetch date, and searchable through an FTS5 index on title and body
+    (plain LIKE search when SQLite lacks FTS5). An article is stored once
+    and linked to every symbol it was found for in article_symbols. The
+    crawl table records when each symbol was last crawled per source.
+
+    Args:
+        cache_dir: Directory holding the articles.db database.
+    """
+
+    def __init__(self, cache_dir=None):
+        cache_dir = cache_dir or os.environ.get('QUICKSTOCK_CACHE_DIR', DEFAULT_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.path = os.path.join(cache_dir, 'articles.db')
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+        self._migrate(connection)
+        try:
+            connection.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        connection.commit()
+
+    # one connection per thread
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    # move the single symbol column of older databases into article_symbols
+    def _migrate(self, connection):
+        columns = [row['name'] for row in connection.execute('PRAGMA table_info(articles)')]
+        self._symbol_column = 'symbol' in columns
+        if not self._symbol_column:
+            return
+
+        with connection:
+            connection.execute('INSERT OR IGNORE INTO article_symbols (article_id, symbol, fetched_at, fetched_date) '
+                               'SELECT id, symbol, fetched_at, fetched_date FROM articles')
+        try:
+            with connection:
+                connection.execute('DROP INDEX IF EXISTS articles_symbol')
+                connection.execute('ALTER TABLE articles DROP COLUMN symbol')
+            self._symbol_column = False
+        except sqlite3.OperationalError:
+            # SQLite before 3.35 can't drop columns; keep filling it
+            pass
+
+    def known_urls(self, urls, symbol=None):
+        """
+        Get the subset of urls (compared canonically) already stored, or
+        with symbol, already stored for that symbol.
+        """
+        canonical = {canonical_url(url): url for url in urls}
+        if not canonical:
+            return set()
+
+        connection = self._connection()
+        placeholders = ','.join('?' * len(canonical))
+        if symbol is None:
+            rows = connection.execute(f'SELECT url FROM articles WHERE url IN ({placeholders})',
+                                      list(canonical)).fetchall()
+        else:
+            rows = connection.execute(
+                f'SELECT a.url FROM articles a JOIN article_symbols s ON s.article_id = a.id '
+                f'WHERE s.symbol = ? AND a.url IN ({placeholders})',
+                [symbol.upper()] + list(canonical)).fetchall()
+        return {canonical[row['url']] for row in rows}
+
+    def new_records(self, records):
+        """
+        Filter article records down to the ones not stored yet for their
+        symbol; an article already stored for another symbol still counts
+        as new for this one.
+        """
+        by_symbol = {}
+        for record in records:
+            by_symbol.setdefault(record['symbol'].upper(), []).append(record['url'])
+
+        known = {(symbol, url) for symbol, urls in by_symbol.items()
+                 for url in self.known_urls(urls, symbol)}
+        return [record for record in records if (record['symbol'].upper(), record['url']) not in known]
+
+    def add_articles(self, records):
+        """
+        Store article records, skipping duplicates by url or content.
+
+        Args:
+            records: Dictionaries with 'symbol', 'url' and optionally
+                'source', 'title' and 'body'.
+
+        Returns:
+            Number of articles newly stored for their symbol (new articles,
+            and stored ones now linked to another symbol).
+        """
+        now = time.time()
+        today = datetime.now().strftime('%Y-%m-%d')
+        rows = [(canonical_url(r['url']), content_hash(r), r.get('source'), r.get('title'), r.get('body'),
+                 now, today) + ((r['symbol'].upper(),) if self._symbol_column else ()) for r in records]
+        links = [(r['symbol'].upper(), now, today, url, digest, url)
+                 for r, (url, digest, *_) in zip(records, rows)]
+
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                'INSERT OR IGNORE INTO articles '
+                '(url, content_hash, source, title, body, fetched_at, fetched_date'
+                + (', symbol) VALUES (?, ?, ?, ?, ?, ?, ?, ?)' if self._symbol_column
+                   else ') VALUES (?, ?, ?, ?, ?, ?, ?)'), rows)
+            # a duplicate under another url links the symbol to the stored copy
+            cursor = connection.executemany(
+                'INSERT OR IGNORE INTO article_symbols (article_id, symbol, fetched_at, fetched_date) '
+                'SELECT id, ?, ?, ? FROM articles WHERE url = ? OR content_hash = ? '
+                'ORDER BY url = ? DESC LIMIT 1', links)
+        return max(cursor.rowcount, 0)
+
+    def recent_headlines(self, symbol, limit=10, since=None):
+        """
+        Get the most recently fetched articles for a symbol.
+
+        Args:
+            symbol: Ticker symbol.
+            limit: Maximum number of articles.
+            since: Optional 'YYYY-MM-DD' date; only articles fetched on or
+                after it are returned.
+
+        Returns:
+            List of dictionaries with 'title', 'url', 'source' and 'fetched_date'.
+        """
+        query = ('SELECT a.title, a.url, a.source, s.fetched_date FROM article_symbols s '
+                 'JOIN articles a ON a.id = s.article_id WHERE s.symbol = ?')
+        params = [symbol.upper()]
+        if since is not None:
+            query += ' AND s.fetched_date >= ?'
+            params.append(since)
+        query += ' ORDER BY s.fetched_at DESC, a.id DESC LIMIT ?'
+        params.append(limit)
+
+        rows = self._connection().execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, text, symbol=None, limit=20):
+        """
+        Full-text search over titles and bodies, best matches first. Every
+        word of text must match; it is searched literally, not parsed as
+        FTS query syntax.
+
+        Returns:
+            List of dictionaries with 'title', 'url', 'source', 'symbols'
+            (comma separated) and 'fetched_date'.
+        """
+        if not text.strip():
+            return []
+
+        columns = ("a.title, a.url, a.source, a.fetched_date, "
+                   "(SELECT group_concat(symbol, ',') FROM article_symbols WHERE article_id = a.id) AS symbols")
+        connection = self._connection()
+        if self.has_fts:
+            query = (f'SELECT {columns} FROM articles_fts '
+                     'JOIN articles a ON a.id = articles_fts.rowid WHERE articles_fts MATCH ?')
+            params = [fts_query(text)]
+        else:
+            query = f'SELECT {columns} FROM articles a WHERE (a.title LIKE ? OR a.body LIKE ?)'
+            params = [f'%{text}%', f'%{text}%']
+
+        if symbol is not None:
+            query += ' AND a.id IN (SELECT article_id FROM article_symbols WHERE symbol = ?)'
+            params.append(symbol.upper())
+        query += ' ORDER BY rank LIMIT ?' if self.has_fts else ' ORDER BY a.fetched_at DESC LIMIT ?'
+        params.append(limit)
+
+        return [dict(row) for row in connection.execute(query, params).fetchall()]
+
+    def mark_crawled(self, symbol, source):
+        """
+        Record that symbol was just crawled on source.
+        """
+        connection = self._connection()
+        with connection:
+            connection.execute('INSERT OR REPLACE INTO crawls (symbol, source, last_crawl) VALUES (?, ?, ?)',
+                               (symbol.upper(), source, time.time()))
+
+    def last_crawl(self, symbol, source):
+        """
+        Time (epoch seconds) symbol was last crawled on source, or None.
+        """
+        row = self._connection().execute('SELECT last_crawl FROM crawls WHERE symbol = ? AND source = ?',
+                                          (symbol.upper(), source)).fetchone()
+        return None if row is None else row['last_crawl']
+
+
+# process-wide default store
+_article_store = None
+
+
+def get_article_store():
+    """
+    Get the shared ArticleStore, creating it on first use.
+    """
+    global _article_store
+    if _article_store is None:
+        _article_store = ArticleStore()
+    return _article_store
+
+
+def set_article_store(store):
+    """
+    Replace the shared ArticleStore, e.g. with one in a temporary directory.
+    """
+    global _article_store
+    _article_store = store
@@ -0,0 +1,342 @@
+# Compute.py
+
+import math
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from Gen_Files.Indicators import sma, latest_indicators
+from Gen_Files.Price_Stats import summary_stats
+from Gen_Files.Portfolio_Frontier import (DEFAULT_MAX_CHUNK_BYTES, get_return_stats,
+                                         DEFAULT_SAMPLE_SIZE, simulate_portfolios,
+                                         solve_efficient_frontier)
+
+# Pure computations behind the GUIs, the report builder and the service.
+# Nothing here renders or imports a UI library: results are small immutable
+# records that can be cached (st.cache_data, the shared cache), pickled to
+# worker processes and drawn by any of the adapters in Render.py.
+
+
+@dataclass(frozen=True)
+class PriceStats:
+    """
+    Summary statistics of a price history.
+    """
+    symbol: str
+    start: pd.Timestamp
+    end: pd.Timestamp
+    bars: int
+    last_close: float
+    last_volume: float
+    high: float
+    low: float
+    mean_close: float
+    mean_volume: float
+    vwap: float
+    total_return: float
+    volatility: float
+    max_drawdown: float
+    high_52w: float
+    low_52w: float
+
+    def as_dict(self):
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class CompanyProfile:
+    """
+    Company basics from the info dictionary plus the latest bar.
+    """
+    symbol: str
+    name: str
+    summary: Optional[str]
+    sector: Optional[str]
+    industry: Optional[str]
+    market_cap: Optional[float]
+    last_close: Optional[float]
+    last_volume: Optional[float]
+
+    def as_dict(self):
+        return asdict(self)
+
+
+# IndicatorSet field for each Indicators.compute_indicators name
+INDICATOR_FIELDS = {
+    'SMA Short': 'sma_short',
+    'SMA Long': 'sma_long',
+    'EMA 12': 'ema_12',
+    'EMA 26': 'ema_26',
+    'RSI': 'rsi',
+    'MACD': 'macd',
+    'MACD Signal': 'macd_signal',
+    'MACD Histogram': 'macd_histogram',
+    'Bollinger Middle': 'bollinger_middle',
+    'Bollinger Upper': 'bollinger_upper',
+    'Bollinger Lower': 'bollinger_lower',
+    'Volatility': 'volatility',
+    'Drawdown': 'drawdown',
+    'ATR': 'atr',
+}
+
+
+@dataclass(frozen=True)
+class IndicatorSet:
+    """
+    Latest value of every technical indicator for a price history.
+    """
+    symbol: str
+    as_of: pd.Timestamp
+    sma_short: float
+    sma_long: float
+    ema_12: float
+    ema_26: float
+    rsi: float
+    macd: float
+    macd_signal: float
+    macd_histogram: float
+    bollinger_middle: float
+    bollinger_upper: float
+    bollinger_lower: float
+    volatility: float
+    drawdown: float
+    atr: float = math.nan
+
+    def as_dict(self):
+        return asdict(self)
+
+    def labeled(self):
+        """
+        Indicator values keyed by their display names ('RSI', 'EMA 12', ...).
+        """
+        return {label: getattr(self, field) for label, field in INDICATOR_FIELDS.items()}
+
+
+@dataclass(frozen=True)
+class FrontierResult:
+    """
+    Efficient frontier of a portfolio.
+
+    frontier holds the 'Returns', 'Volatility' and 'Sharpe Ratio' arrays of
+    the analytic frontier curve or of a sample of the simulated portfolios;
+    max_sharpe and min_volatility are portfolio dictionaries as returned by
+    Portfolio_Frontier; random_portfolios is the optional simulated overlay
+    of an analytic frontier (also a sample).
+    """
+    symbols: tuple
+    method: str
+    frontier: dict
+    max_sharpe: Optional[dict]
+    min_volatility: dict
+    random_portfolios: Optional[dict] = None
+
+    def weights(self, portfolio):
+        """
+        Dictionary mapping each symbol to its weight in portfolio.
+        """
+        return dict(zip(self.symbols, (float(weight) for weight in portfolio['Weights'])))
+
+
+@dataclass(frozen=True, eq=False)
+class MovingAverages:
+    """
+    Short and long moving averages of a close series and their crossovers.
+
+    frame has 'Close', 'ShortMA', 'LongMA' and 'Diff' columns; up and down
+    are boolean arrays marking the bars where the short average crosses
+    above or below the long one.
+    """
+    short_window: int
+    long_window: int
+    frame: pd.DataFrame
+    up: np.ndarray
+    down: np.ndarray
+
+
+# PriceStats from one ticker's Price_Stats values
+def price_stats_record(symbol, values, tz=None):
+    """
+    Build a PriceStats from one ticker's entry of Price_Stats.summary_stats
+    (or PriceStatsAccumulator.result()), with start and end in timezone tz.
+    """
+    def timestamp(value):
+        if value is None or np.isnat(value):
+            return None
+        value = pd.Timestamp(value)
+        return value.tz_localize('UTC').tz_convert(tz) if tz is not None else value
+
+    return PriceStats(
+        symbol=symbol,
+        start=timestamp(values['start']),
+        end=timestamp(values['end']),
+        bars=int(values['bars']),
+        **{name: float(values[name]) for name in ('last_close', 'last_volume', 'high', 'low', 'mean_close',
+                                                   'mean_volume', 'vwap', 'total_return', 'volatility',
+                                                   'max_drawdown', 'high_52w', 'low_52w')},
+    )
+
+
+# statistics of a price history
+def price_stats(symbol, hist):
+    """
+    Get the PriceStats of an OHLCV history frame, from one pass of the
+    Price_Stats kernel over its in-memory columns.
+
+    Raises:
+        ValueError: hist has no bars.
+    """
+    if hist.empty:
+        raise ValueError(f"No price data found for {symbol}")
+
+    values = summary_stats(hist['Close'].to_numpy(dtype=float), hist['High'].to_numpy(dtype=float),
+                           hist['Low'].to_numpy(dtype=float), hist['Volume'].to_numpy(dtype=float), hist.index)
+    return price_stats_record(symbol, values, getattr(hist.index, 'tz', None))
+
+
+# statistics of many price histories at once
+def price_stats_many(hists):
+    """
+    Get the PriceStats of many OHLCV history frames in one batched kernel
+    call over their aligned columns.
+
+    Args:
+        hists: Dictionary mapping symbol to history frame.
+
+    Returns:
+        Dictionary mapping symbol to PriceStats; symbols without bars are left out.
+    """
+    hists = {symbol: hist for symbol, hist in hists.items() if not hist.empty}
+    if not hists:
+        return {}
+
+    # scatter every frame onto the union of their dates, nan where a ticker has no bar
+    # (indexes in different timezones union to UTC)
+    index = hists[next(iter(hists))].index
+    for hist in hists.values():
+        if not hist.index.equals(index):
+            index = index.union(hist.index)
+
+    columns = {name: np.full((len(index), len(hists)), np.nan) for name in ('Close', 'High', 'Low', 'Volume')}
+    for i, hist in enumerate(hists.values()):
+        rows = slice(None) if hist.index.equals(index) else index.get_indexer(hist.index)
+        for name, values in columns.items():
+            values[rows, i] = hist[name].to_numpy(dtype=float)
+
+    # start and end come back in each history's own timezone
+    values = summary_stats(columns['Close'], columns['High'], columns['Low'], columns['Volume'], index)
+    return {symbol: price_stats_record(symbol, {name: None if value is None else value[i]
+                                                for name, value in values.items()},
+                                       getattr(hist.index, 'tz', None))
+            for i, (symbol, hist) in enumerate(hists.items())}
+
+
+# company basics
+def company_profile(symbol, info, hist=None):
+    """
+    Get the CompanyProfile of symbol from its info dictionary and, when
+    given, its price history.
+    """
+    has_bars = hist is not None and not hist.empty
+    return CompanyProfile(
+        symbol=symbol,
+        name=info.get('longName') or symbol,
+        summary=info.get('longBusinessSummary'),
+        sector=info.get('sector'),
+        industry=info.get('industry'),
+        market_cap=info.get('marketCap'),
+        last_close=float(hist['Close'].iloc[-1]) if has_bars else None,
+        last_volume=float(hist['Volume'].iloc[-1]) if has_bars else None,
+    )
+
+
+# latest indicator values
+def indicator_set(symbol, hist, short_window=10, long_window=100):
+    """
+    Get the IndicatorSet of an OHLCV history frame.
+
+    Raises:
+        ValueError: hist has no bars.
+    """
+    if hist.empty:
+        raise ValueError(f"No price data found for {symbol}")
+
+    values = latest_indicators(hist, short_window, long_window)
+    return IndicatorSet(symbol=symbol, as_of=hist.index[-1],
+                        **{INDICATOR_FIELDS[name]: value for name, value in values.items()})
+
+
+# efficient frontier of a portfolio
+def compute_frontier(stock_data, method='analytic', num_points=50, long_only=True, risk_free_rate=0.0,
+                     num_portfolios=0, seed=None, max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES,
+                     sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    Get the FrontierResult of a portfolio.
+
+    Args:
+        stock_data: Pandas DataFrame containing asset prices, one column per asset.
+        method: 'analytic' solves the exact minimum-variance frontier,
+            'simulation' samples num_portfolios random portfolios.
+        num_points: Number of target returns on the analytic frontier grid.
+        long_only: Forbid short positions (analytic only).
+        risk_free_rate: Annual risk-free rate used for Sharpe ratios (analytic only).
+        num_portfolios: Random portfolios to simulate, or to overlay on an
+            analytic frontier (0 for none).
+        seed: Optional seed for reproducible portfolios.
+        max_chunk_bytes: Memory ceiling for one simulation batch.
+        sample_size: Simulated portfolios kept for plotting.
+    """
+    expected_returns, cov_matrix = get_return_stats(stock_data)
+    symbols = tuple(stock_data.columns)
+
+    if method == 'simulation':
+        if num_portfolios < 1:
+            raise ValueError("A simulated frontier needs at least one portfolio")
+        sample, max_sharpe, min_volatility = simulate_portfolios(
+            expected_returns, cov_matrix, num_portfolios, max_chunk_bytes=max_chunk_bytes, seed=seed,
+            sample_size=sample_size)
+        return FrontierResult(symbols, method, sample, max_sharpe, min_volatility)
+
+    if method != 'analytic':
+        raise ValueError(f"Unknown frontier method {method!r}")
+
+    frontier, tangency, min_volatility = solve_efficient_frontier(
+        expected_returns, cov_matrix, num_points=num_points, long_only=long_only,
+        risk_free_rate=risk_free_rate)
+
+    random_portfolios = None
+    if num_portfolios > 0:
+        random_portfolios = simulate_portfolios(expected_returns, cov_matrix, num_portfolios,
+                                                max_chunk_bytes=max_chunk_bytes, seed=seed,
+                                                sample_size=sample_size)[0]
+
+    return FrontierResult(symbols, method, frontier, tangency, min_volatility, random_portfolios)
+
+
+# moving averages and crossovers
+def moving_averages(hist, short_window=15, long_window=100, engine=None):
+    """
+    Get the MovingAverages of hist's close prices, without modifying hist.
+
+    With a MA_Engine.MovingAverageEngine its windows and its incrementally
+    detected crossovers are used instead of recomputed.
+    """
+    df = pd.DataFrame({'Close': hist['Close']}, index=hist.index)
+    if engine is not None:
+        short_window, long_window = engine.short_window, engine.long_window
+
+    close = df['Close'].to_numpy()
+    df['ShortMA'] = sma(close, short_window)
+    df['LongMA'] = sma(close, long_window)
+    df['Diff'] = df['ShortMA'] - df['LongMA']
+
+    if engine is not None:
+        up, down = engine.crossover_masks(df.index)
+    else:
+        diff = df['Diff'].to_numpy()
+        previous = df['Diff'].shift(1).to_numpy()
+        up = (diff > 0) & (previous < 0)
+        down = (diff < 0) & (previous > 0)
+
+    return MovingAverages(short_window, long_window, df, up, down)
@@ -0,0 +1,170 @@
+# Downsample.py
+
+import numpy as np
+import pandas as pd
+
+
+# Largest-Triangle-Three-Buckets downsampling
+def lttb_indices(x, y, num_out):
+    """
+    Pick num_out indices of (x, y) that preserve the visual shape of the line.
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket.
+
+    Args:
+        x: 1D numeric array (e.g. timestamps as int64), increasing.
+        y: 1D numeric array of the same length.
+        num_out: Number of points to keep.
+
+    Returns:
+        Sorted 1D int array of kept indices.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = y.shape[0]
+
+    if num_out >= n:
+        return np.arange(n)
+    if num_out < 3:
+        return np.array([0, n - 1])
+
+    # bucket edges over the interior points
+    edges = np.linspace(1, n - 1, num_out - 1).astype(int)
+
+    kept = np.empty(num_out, dtype=int)
+    kept[0] = 0
+    kept[-1] = n - 1
+    previous = 0
+
+    for i in range(num_out - 2):
+        start, stop = edges[i], edges[i + 1]
+
+        # average of the next bucket (or the last point for the final bucket)
+        next_start, next_stop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[next_start:next_stop].mean()
+        next_y = y[next_start:next_stop].mean()
+
+        # triangle area for every candidate in this bucket (times two)
+        area = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        area = np.nan_to_num(area, nan=-1.0)
+
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+
+    return kept
+
+
+# min/max per bucket downsampling
+def minmax_indices(y, num_out):
+    """
+    Keep the minimum and maximum of each bucket, so spikes are never lost.
+
+    Returns:
+        Sorted 1D int array of kept indices (about num_out).
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.shape[0]
+    if num_out >= n:
+        return np.arange(n)
+
+    num_buckets = max(1, num_out // 2)
+    edges = np.linspace(0, n, num_buckets + 1).astype(int)
+
+    # pad every bucket to the same width so argmin/argmax run as one operation
+    width = int(np.diff(edges).max())
+    positions = edges[:-1, np.newaxis] + np.arange(width)
+    valid = positions < edges[1:, np.newaxis]
+    positions = np.minimum(positions, n - 1)
+
+    values = np.where(valid, y[positions], np.nan)
+    filled = np.where(np.isnan(values), np.inf, values)
+    lows = positions[np.arange(num_buckets), np.argmin(filled, axis=1)]
+    filled = np.where(np.isnan(values), -np.inf, values)
+    highs = positions[np.arange(num_buckets), np.argmax(filled, axis=1)]
+
+    return np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+
+
+# downsample a frame for plotting
+def downsample_frame(df, column, max_points, keep=None, method='lttb'):
+    """
+    Downsample every column of df to about max_points rows, chosen from
+    the shape of df[column].
+
+    Args:
+        df: DataFrame indexed by date.
+        column: Column whose shape drives the selection.
+        max_points: Target number of rows.
+        keep: Optional boolean mask of rows that must never be dropped
+            (e.g. crossover points).
+        method: 'lttb' or 'minmax'.
+
+    Returns:
+        DataFrame with the kept rows, in original order.
+    """
+    if len(df) <= max_points:
+        return df
+
+    y = df[column].to_numpy(dtype=float)
+    if method == 'minmax':
+        indices = minmax_indices(y, max_points)
+    else:
+        x = df.index.asi8 if hasattr(df.index, 'asi8') else np.arange(len(df))
+        indices = lttb_indices(x, y, max_points)
+
+    if keep is not None:
+        indices = np.union1d(indices, np.flatnonzero(np.asarray(keep, dtype=bool)))
+
+    return df.iloc[indices]
+
+
+# a window bound in the timezone of the index it is compared with
+def _index_time(value, tz):
+    value = pd.Timestamp(value)
+    if tz is None:
+        return value if value.tz is None else value.tz_localize(None)
+    return value.tz_localize(tz) if value.tz is None else value.tz_convert(tz)
+
+
+# downsample a frame around a visible window
+def downsample_window(df, column, max_points, x_range=None, keep=None, method='lttb'):
+    """
+    Downsample df for a chart showing x_range.
+
+    Rows inside the visible window get the full max_points budget (so a
+    zoomed-in window is drawn at full resolution once it has fewer rows than
+    that), and rows outside it get a quarter of the budget as context for
+    panning. Rows flagged in keep are never dropped.
+
+    The resolution is fixed when the figure is built: zooming in the
+    browser only enlarges the points already sent, so a closer look needs a
+    new figure for the narrower x_range.
+
+    Args:
+        df: DataFrame indexed by date.
+        column: Column whose shape drives the selection.
+        max_points: Point budget for the visible window, e.g. twice the chart
+            width in pixels.
+        x_range: Optional (start, end) of the visible window, naive or in
+            any timezone; the whole frame is visible when omitted.
+        keep: Optional boolean mask of rows that must never be dropped.
+        method: 'lttb' or 'minmax'.
+    """
+    keep = np.zeros(len(df), dtype=bool) if keep is None else np.asarray(keep, dtype=bool)
+
+    if x_range is None:
+        return downsample_frame(df, column, max_points, keep, method)
+
+    tz = getattr(df.index, 'tz', None)
+    start, end = (_index_time(value, tz) for value in x_range)
+    visible = np.asarray((df.index >= start) & (df.index <= end))
+
+    parts = []
+    for mask, budget in ((visible, max_points), (~visible, max(3, max_points // 4))):
+        if mask.any():
+            parts.append(downsample_frame(df[mask], column, budget, keep[mask], method))
+
+    return parts[0] if len(parts) == 1 else parts[0].combine_first(parts[1]).sort_index()
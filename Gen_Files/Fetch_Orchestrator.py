@@ -0,0 +1,108 @@
+# Fetch_Orchestrator.py
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+class FetchOrchestrator:
+    """
+    Run independent page fetches concurrently and hand each result to the
+    part of the page that needs it.
+
+    Every call gets its own timeout, measured from when it was submitted, so
+    one slow source can't hold up the rest of the page. Latency of each call
+    and the time to first paint are recorded in metrics().
+
+    Args:
+        max_workers: Maximum number of fetches running at once.
+    """
+
+    def __init__(self, max_workers=8):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._started = time.perf_counter()
+        self._first_paint = None
+
+    # record when a call finishes, whether it worked or not; a call that
+    # already timed out keeps its 'timeout' status
+    def _timed(self, call, fn, args, kwargs):
+        start = time.perf_counter()
+        try:
+            value = fn(*args, **kwargs)
+            status = 'ok'
+            return value
+        except Exception:
+            status = 'error'
+            raise
+        finally:
+            with self._lock:
+                call['latency'] = time.perf_counter() - start
+                if call['status'] == 'running':
+                    call['status'] = status
+
+    def submit(self, name, fn, *args, timeout=None, **kwargs):
+        """
+        Start fn(*args, **kwargs) in the background under the given name.
+
+        Args:
+            name: Key used to collect the result later.
+            fn: Function to call.
+            timeout: Seconds to wait for the result, counted from now.
+        """
+        call = {
+            'future': None,
+            'deadline': None if timeout is None else time.perf_counter() + timeout,
+            'latency': None,
+            'status': 'running',
+        }
+        with self._lock:
+            self._calls[name] = call
+        future = self._pool.submit(self._timed, call, fn, args, kwargs)
+        with self._lock:
+            call['future'] = future
+        return future
+
+    def result(self, name):
+        """
+        Wait for a submitted call and return its value.
+
+        Raises the call's own exception if it failed, or TimeoutError if it
+        didn't finish before its deadline.
+        """
+        call = self._calls[name]
+
+        remaining = None
+        if call['deadline'] is not None:
+            remaining = max(0.0, call['deadline'] - time.perf_counter())
+
+        try:
+            return call['future'].result(timeout=remaining)
+        except TimeoutError:
+            with self._lock:
+                if call['status'] == 'running':
+                    call['status'] = 'timeout'
+            raise TimeoutError(f"{name} did not finish in time")
+
+    def mark_first_paint(self):
+        """
+        Record the time to first paint (only the first call counts).
+        """
+        if self._first_paint is None:
+            self._first_paint = time.perf_counter() - self._started
+
+    def metrics(self):
+        """
+        Get first paint time and per-call latency and status.
+        """
+        with self._lock:
+            calls = {name: {'latency': call['latency'], 'status': call['status']}
+                     for name, call in self._calls.items()}
+        return {'first_paint': self._first_paint, 'calls': calls}
+
+    def shutdown(self):
+        """
+        Stop accepting work; calls still running finish in the background.
+        """
+        self._pool.shutdown(wait=False)
@@ -1,25 +1,29 @@
 # Gen_Funcs.py
 
-import yfinance as yf
-import streamlit as st
-import plotly.graph_objects as go
 import sys
 import linecache
-import pandas as pd
-from datetime import datetime, timedelta
-import wikipedia
 import dotenv
-import numpy as np
-import random
+
+from Gen_Files.Metadata_Store import get_metadata_store
+from Gen_Files.Wiki_Cache import get_wiki_cache
+from Gen_Files.Shared_Cache import get_shared_cache, get_shared_history, get_shared_info, get_shared_close_panel
+from Gen_Files.Portfolio_Frontier import DEFAULT_MAX_CHUNK_BYTES
+from Gen_Files.Compute import price_stats, company_profile, indicator_set, compute_frontier
+from Gen_Files.Render import streamlit_company_profile, streamlit_price_stats, frontier_figure
+
+# computations live in Compute.py and drawing in Render.py; the functions here
+# combine them for the Streamlit GUI. streamlit and yfinance are imported in
+# the functions that use them, so compute-only callers never load them
 
 # set env vars
 dotenv.load_dotenv()
 
 
-# error message
-def error_message(message):
+# describe the exception being handled
+def exception_message():
     """
-    Display an error message using the Streamlit API.
+    Describe the exception being handled with the file, line and source line
+    it was raised from.
     """
     exc_type, exc_obj, tb = sys.exc_info()
     f = tb.tb_frame
@@ -27,189 +31,174 @@ def error_message(message):
     filename = f.f_code.co_filename
     linecache.checkcache(filename)
     line = linecache.getline(filename, lineno, f.f_globals)
-    response = ('EXCEPTION IN ({}, LINE {} "{}"): {}'.format(filename, lineno, line.strip(), exc_obj))
-        
-    st.error(response)
+    return 'EXCEPTION IN ({}, LINE {} "{}"): {}'.format(filename, lineno, line.strip(), exc_obj)
+
+# error message
+def error_message(message):
+    """
+    Display an error message using the Streamlit API.
+    """
+    import streamlit as st
+
+    st.error(exception_message())
 
 # get stock information
-def get_stock_info(symbol):
+def get_stock_info(symbol, fields=None):
     """
     Get stock information for a given symbol using the yfinance library.
+
+    Served from the shared metadata store, so repeated calls don't hit the
+    network; fields limits the freshness check to the ones the caller needs.
     """
-    stock = yf.Ticker(symbol)
-    info = stock.info
-    return info
+    return get_metadata_store().get(symbol, fields)
 
 # get stock data
 def get_stock_data(symbol, start_date, end_date):
-    ticker = yf.Ticker(symbol)
+    """
+    Get the info and price history for a symbol, and the symbol uppercased.
+
+    History comes from the shared on-disk price cache, so only date ranges
+    that haven't been downloaded yet hit the network, and info comes from
+    the shared metadata store. Both are kept in the process-wide shared
+    cache, so every session asking for the same symbol and dates gets a
+    read-only view of one copy.
+    """
+    symbol = symbol.upper()
+
+    info = get_shared_info(symbol)
+
+    hist = get_shared_history(symbol, start_date, end_date)
+
+    return info, hist, symbol
 
-    symbol = ticker.ticker
+# get latest indicator values
+def get_indicators(symbol, hist):
+    """
+    IndicatorSet of a symbol's history, computed once per distinct history
+    and shared across sessions.
+    """
+    if hist.empty:
+        return indicator_set(symbol, hist)
 
-    info = ticker.info
+    key = ('indicators', symbol, len(hist), str(hist.index[0]), str(hist.index[-1]), float(hist['Close'].iloc[-1]))
+    return get_shared_cache().get_or_compute(key, lambda: indicator_set(symbol, hist))
 
-    hist = ticker.history(period="1d", start=start_date, end=end_date)
+# get portfolio data
+def get_portfolio_data(portfolio_tickers, start_date, end_date, max_workers=8):
+    """
+    Get aligned Close prices for a portfolio of tickers.
 
-    return ticker, info, hist, symbol
+    Args:
+        portfolio_tickers: Comma separated string or list of ticker symbols.
+        start_date: Start date of the price history.
+        end_date: End date of the price history.
+        max_workers: Maximum number of concurrent downloads.
+
+    Returns:
+        stock_data: DataFrame of Close prices, one column per ticker.
+        errors: Dictionary of tickers that failed to load and why.
+    """
+    if isinstance(portfolio_tickers, str):
+        portfolio_tickers = portfolio_tickers.split(",")
+
+    # clean up and de-duplicate symbols, keeping input order
+    tickers = list(dict.fromkeys(t.strip().upper() for t in portfolio_tickers if t.strip()))
+
+    return get_shared_close_panel(tickers, start_date, end_date, max_workers=max_workers)
 
 # display stock information
 def display_stock_info(info, hist):
     """
     Display stock information using the Streamlit API.
     """
-
-    st.write(info["longBusinessSummary"])
-    st.write("Sector:", info['sector'])
-    st.write("Industry:", info['industry'])
-    st.write("Market Cap:", info['marketCap'])
-    st.write("Recent Close Price:", hist['Close'][-1])
-    st.write("Recent Daily Volume:", hist['Volume'][-1])
+    streamlit_company_profile(company_profile(info.get('symbol', ''), info, hist))
 
 # get price info
-def get_price_info(info, hist, primary_ticker, start_of_year):
-        # display finance info
-        st.subheader("Summary:")
-        
-        # read stock price data from csv
-        filename = str(primary_ticker) + '_Price_Data.csv'
-        df = pd.read_csv(filename)
-
-
-        # display current price
-        st.metric(label="Current Price: ",
-                    value=round(hist['Close'].iloc[-1], 2))
-        
-        # display latest volume
-        st.metric(label="Latest Volume: ",
-                    value=hist['Volume'].iloc[-1])
-
-        # display high price
-        st.metric(label="High Price: ",
-                    value=round(df['High'].max(), 2))
-        
-        # display low price
-        st.metric(label="Low Price: ",
-                    value=round(df['Low'].min(), 2))
-        
-        # display average price
-        st.metric(label="Average Price: ",
-                    value=round(df['Close'].mean(), 2))
-        
-        # average volume
-        st.metric(label="Average Volume: ",
-                    value=round(df['Volume'].mean(), 2))
-        
-        # 
+def get_price_info(hist, primary_ticker):
+    """
+    Display the price statistics of the loaded history using the Streamlit API.
+
+    Computed in one kernel pass over hist's in-memory arrays (see
+    Compute.price_stats), without reading the price store again.
+    """
+    streamlit_price_stats(price_stats(primary_ticker, hist))
 
 # get wiki paragraphs
 def get_wiki_info(query):
+    """
+    Get the Wikipedia page for a query (usually a ticker symbol).
+
+    Lookups go through the shared wiki cache, so a known query is answered
+    without any network round-trips.
+
+    Returns:
+        url: URL of the page, or None if no page was resolved.
+        record: Dictionary with the page 'title', 'url' and 'summary', or the
+            'status' ('disambiguation' / 'missing') and disambiguation 'options'.
+    """
+    record = get_wiki_cache().lookup(query)
 
-    results = wikipedia.search(query)
-    if results != None:
-        first_result = results[0]  # get the first result
-        try:
-            # get the page of the first result
-            page = wikipedia.page(first_result)
-            url = page.url  # get the url of the page
-            return url, page  # return the content of the page
-        except wikipedia.DisambiguationError as e:
-            print(
-                f"Disambiguation page found, consider choosing a specific title from: {e.options}")
-        except wikipedia.PageError:
-            print("Page not found on Wikipedia")
-    else:
-        return None  # return None if no results found
+    if record['status'] == 'disambiguation':
+        print(
+            f"Disambiguation page found, consider choosing a specific title from: {record['options']}")
+    elif record['status'] != 'ok':
+        print("Page not found on Wikipedia")
+
+    return record.get('url'), record
 
 # Display efficient frontier
-def get_efficient_frontier(num_portfolios, stock_data):
+def get_efficient_frontier(num_portfolios, stock_data, max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES, seed=None):
     """
     Get the expected returns and covariance matrix of a portfolio using the Efficient Frontier method.
 
+    Portfolios are simulated in batches (see Portfolio_Frontier.simulate_portfolios),
+    so large num_portfolios values stay fast and memory use is capped per batch;
+    only the best portfolios and a sample of points for the plot are kept.
+
     Args:
         num_portfolios: Number of portfolios to simulate.
-        stock_data: Pandas DataFrame containing asset returns.
+        stock_data: Pandas DataFrame containing asset prices, one column per asset.
+        max_chunk_bytes: Memory ceiling for the working set of one simulation batch.
+        seed: Optional seed for reproducible portfolios.
 
     Returns:
-        results_dict: Dictionary containing portfolio data.
+        fig: Plotly figure of the simulated portfolios.
         max_sharpe_portfolio: Dictionary containing the maximum Sharpe ratio portfolio.
         min_volatility_portfolio: Dictionary containing the minimum volatility portfolio.
+        results_dict: Dictionary of 'Returns', 'Volatility' and 'Sharpe Ratio' arrays
+            for a random sample of the simulated portfolios.
     """
     try:
-        # Calculate daily returns
-        returns = stock_data.pct_change()
-
-        # Calculate expected returns and covariance matrix
-        expected_returns = returns.mean()
-        cov_matrix = returns.cov()
-
-        # Initialize variables
-        results = {}
-        results_dict = {}
-        weights = {}
-        max_sharpe = 0
-        min_volatility = float('inf')
-        max_sharpe_portfolio = {}
-        min_volatility_portfolio = {}
-
-        # Simulate num_portfolios
-        for i in range(num_portfolios):
-            # Generate random weights
-            weights = np.random.random(len(stock_data.columns))
-            weights /= np.sum(weights)
-
-            # Calculate portfolio returns, volatility, and Sharpe ratio
-            returns = np.sum(expected_returns * weights) * 252
-            volatility = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights))) * np.sqrt(252)
-            sharpe_ratio = returns / volatility
-
-            # Store results in a dictionary
-            results_dict['Returns'] = returns
-            results_dict['Volatility'] = volatility
-            results_dict['Sharpe Ratio'] = sharpe_ratio
-            results_dict['Weights'] = weights
-
-            # Store results in a list (optional)
-            results[i] = [returns, volatility, sharpe_ratio, weights]
-
-            # Find the portfolio with the minimum volatility
-            if volatility < min_volatility:
-                min_volatility = volatility
-                min_volatility_portfolio = results_dict.copy()
-
-            # Find the portfolio with the maximum Sharpe ratio
-            if sharpe_ratio > max_sharpe:
-                max_sharpe = sharpe_ratio
-                max_sharpe_portfolio = results_dict.copy()
-
-
-            # Extract data for plotting
-            returns = [result['Returns'] for result in results_dict.values()]
-            volatilities = [result['Volatility'] for result in results_dict.values()]
-
-            # Create efficient frontier plot
-            fig = go.Figure()
-
-            # Add efficient frontier
-            fig.add_trace(go.Scatter
-            (
-                x=volatilities,
-                y=returns,
-                mode='markers',
-                marker=dict(size=10, color='blue'),
-                name='Portfolios'
-            ))
-
-            # Add max Sharpe ratio portfolio
-            fig.add_trace(go.Scatter
-            (
-                x=[max_sharpe_portfolio['Volatility']],
-                y=[max_sharpe_portfolio['Returns']],
-                mode='markers',
-                marker=dict(size=12, color='red'),
-                name='Max Sharpe Ratio Portfolio'
-            ))
-
-            return fig, max_sharpe_portfolio, min_volatility_portfolio, results_dict
+        result = compute_frontier(stock_data, method='simulation', num_portfolios=num_portfolios,
+                                  seed=seed, max_chunk_bytes=max_chunk_bytes)
+        return frontier_figure(result), result.max_sharpe, result.min_volatility, result.frontier
     except Exception as e:
       error_message(e)
 
+# Display analytic efficient frontier
+def get_analytic_frontier(stock_data, num_points=50, long_only=True, risk_free_rate=0.0,
+                          num_portfolios=0, seed=None):
+    """
+    Get the exact minimum-variance frontier of a portfolio, optionally overlaid
+    with randomly simulated portfolios.
+
+    Args:
+        stock_data: Pandas DataFrame containing asset prices, one column per asset.
+        num_points: Number of target returns on the frontier grid.
+        long_only: Forbid short positions.
+        risk_free_rate: Annual risk-free rate used for Sharpe ratios.
+        num_portfolios: Number of random portfolios to overlay (0 for none).
+        seed: Optional seed for the overlay simulation.
+
+    Returns:
+        fig: Plotly figure of the frontier.
+        tangency_portfolio: Dictionary containing the maximum Sharpe ratio portfolio.
+        min_volatility_portfolio: Dictionary containing the minimum volatility portfolio.
+        frontier_dict: Dictionary containing the frontier points.
+    """
+    try:
+        result = compute_frontier(stock_data, num_points=num_points, long_only=long_only,
+                                  risk_free_rate=risk_free_rate, num_portfolios=num_portfolios, seed=seed)
+        return frontier_figure(result), result.max_sharpe, result.min_volatility, result.frontier
+    except Exception as e:
+      error_message(e)
@@ -1,5 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
+import time
+
+from Gen_Files.Article_Scraper import get_scraper
+from Gen_Files.Article_Parser import ParsedPage, parse_page
+from Gen_Files.Article_Store import get_article_store
+
+# seconds before a symbol is crawled again on the same source
+CRAWL_INTERVAL = 30 * 60
 
 
 symbols = []
@@ -28,89 +34,153 @@ def get_symbols():
 
 
 def get_Google_articles(symbols):
-    try:
-        for symbol in symbols:
-            if symbol != "^GSPC":
-                with open("Stocks\ArticleGetter\Files\\" + symbol+"GoogleLinks.txt", 'r+') as f:
-                    f.truncate(0)
+    """
+    Fetch Google Finance links for every symbol concurrently and add the
+    new ones to the article store.
 
-                    url = ("https://www.google.com/finance/quote/"+symbol+":NYSE")
+    Returns:
+        Dictionary mapping symbol to its list of link records.
+    """
+    global soup, site
 
-                    global soup, site
+    if isinstance(symbols, str):
+        symbols = [symbols]
 
-                    reqs = requests.get(url)
-                    soup = BeautifulSoup(reqs.text, 'html.parser')
+    pages = {}
+    articles, errors = get_scraper().scrape_google(symbols, pages=pages)
 
-                    site = "Google Finance:"
+    for symbol, reason in errors.items():
+        print("Error getting articles for " + symbol + ": " + reason)
 
-                    links = []
-                    for link in soup.findAll('a'):
-                        links.append(link.get('href'))
+    site = "Google Finance:"
 
-                    f.writelines("MarketWatch Links:\n\n")
+    store = get_article_store()
+    for symbol, links in articles.items():
+        store.add_articles(store.new_records(links))
+        store.mark_crawled(symbol, 'google')
 
-                    for link in links:
-                        if "https:" in str(link):
-                            f.write(link)
-                        else:
-                            pass
-                f.close()
-    except FileNotFoundError as e:
-        print("Error getting articles: " + str(e))
-        pass
+    # keep the last parsed page for get_Paragraphs
+    for page in pages.values():
+        soup = page
 
+    return articles
 
-def get_MW_Articles(symbol, amount):
-    for i in range(amount):
-        if symbol != "^GSPC":
 
-            base_url = 'https://www.marketwatch.com'
-            search_url = f'{base_url}/search?q={symbol}'
+def get_MW_Articles(symbol, amount=10):
+    """
+    Get up to amount MarketWatch article records for a symbol.
+    """
+    if symbol == "^GSPC":
+        return []
 
-            # Send a GET request to the search URL and get the response HTML content
-            response = requests.get(search_url)
-            html_content = response.content
+    articles, errors = get_scraper().scrape_mw([symbol])
+    if symbol in errors:
+        print("Error getting articles for " + symbol + ": " + errors[symbol])
+    else:
+        store = get_article_store()
+        store.add_articles(store.new_records(articles[symbol]))
+        store.mark_crawled(symbol, 'marketwatch')
 
-            # Parse the HTML content with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
+    return articles.get(symbol, [])[:amount]
 
-            # Find the article elements
-            article_elements = soup.find_all(
-                'h3', {'class': 'article__headline'})
 
-            articles = []
+def get_MW_Articles_many(symbols, amount=10):
+    """
+    Get up to amount MarketWatch article records for each of many symbols,
+    fetched in parallel.
 
-            # Extract article information
-            for article_element in article_elements:
-                article_title = article_element.text.strip()
-                article_url = base_url + article_element.find('a')['href']
+    Returns:
+        Dictionary mapping symbol to its list of article records.
+    """
+    articles, errors = get_scraper().scrape_mw(symbols)
+    for symbol, reason in errors.items():
+        print("Error getting articles for " + symbol + ": " + reason)
 
-                articles.append({'title': article_title, 'url': search_url})
+    store = get_article_store()
+    for symbol, records in articles.items():
+        store.add_articles(store.new_records(records))
+        store.mark_crawled(symbol, 'marketwatch')
 
-            return articles
+    return {symbol: records[:amount] for symbol, records in articles.items()}
 
 
-def get_Paragraphs(soup, site, symbol):
+def crawl_articles(symbols, min_interval=CRAWL_INTERVAL, fetch_bodies=False):
+    """
+    Crawl MarketWatch and Google Finance for the symbols that are due and
+    add the articles not seen before to the article store.
 
-    with open("Stocks\ArticleGetter\Files\\"+symbol+"Bodies.txt", "w") as f:
-        f.truncate()
-        for data in soup.findAll('p'):
-            try:
-                if "company" in str(data):
-                    f.writelines("\n" + "Description:" + ":\n\n")
-                    f.write(str(data.getText()))
+    Symbols crawled on a source less than min_interval seconds ago are
+    skipped, and with fetch_bodies only the new articles' pages are
+    downloaded, so repeated crawls cost one search page per due symbol.
 
-                    print(str(site) + ":\n\n")
-                    print(data.getText())
-                    print()
-                    print('-----------------------------------------------')
-                else:
-                    pass
-            except Exception as e:
-                pass
+    Returns:
+        Dictionary mapping symbol to the number of new articles stored.
+    """
+    if isinstance(symbols, str):
+        symbols = [symbols]
 
-            # print(data.getText())
-    f.close()
+    scraper = get_scraper()
+    store = get_article_store()
+    now = time.time()
+    added = {symbol: 0 for symbol in symbols}
+
+    for source, scrape in (('marketwatch', scraper.scrape_mw), ('google', scraper.scrape_google)):
+        due = []
+        for symbol in symbols:
+            last = store.last_crawl(symbol, source)
+            if last is None or now - last >= min_interval:
+                due.append(symbol)
+        if not due:
+            continue
+
+        articles, errors = scrape(due)
+        for symbol, reason in errors.items():
+            print("Error getting articles for " + symbol + ": " + reason)
+
+        for symbol, records in articles.items():
+            new = store.new_records(records)
+            if fetch_bodies and new:
+                # articles already stored for another symbol only need linking
+                stored = store.known_urls([record['url'] for record in new])
+                unfetched = [record for record in new if record['url'] not in stored]
+                pages, _ = scraper.fetch_many([record['url'] for record in unfetched]) if unfetched else ({}, {})
+                for record in unfetched:
+                    if record['url'] in pages:
+                        record['body'] = "\n".join(parse_page(pages[record['url']]).paragraphs())
+            added[symbol] += store.add_articles(new)
+            store.mark_crawled(symbol, source)
+
+    return added
+
+
+def get_Paragraphs(soup, site, symbol, url=None):
+    """
+    Print the paragraphs mentioning "company" from a page and store them in
+    the article store as the page's description.
+
+    Args:
+        soup: ParsedPage (see Article_Parser), or raw HTML to parse.
+        site: Site name used in the printout.
+        symbol: Ticker symbol the page belongs to.
+        url: Page url, defaults to the symbol's Google Finance quote page.
+    """
+    page = soup if isinstance(soup, ParsedPage) else parse_page(soup)
+
+    texts = page.paragraphs(contains="company")
+    for text in texts:
+        print(str(site) + ":\n\n")
+        print(text)
+        print()
+        print('-----------------------------------------------')
+
+    if texts:
+        get_article_store().add_articles([{
+            'symbol': symbol,
+            'source': str(site).rstrip(':'),
+            'title': symbol + " Description",
+            'body': "\n".join(texts),
+            'url': url or get_scraper().google_quote_url(symbol),
+        }])
 
 
 def print_Articles(symbols):
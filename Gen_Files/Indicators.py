@@ -0,0 +1,332 @@
+# Indicators.py
+
+import numpy as np
+
+# trading days per year, used to annualize volatility
+TRADING_DAYS = 252
+
+
+# convert input to a contiguous float array (1D series or 2D bars x tickers)
+def _as_array(values):
+    return np.ascontiguousarray(values, dtype=float)
+
+
+# nan array shaped like values
+def _nan_like(values):
+    return np.full(values.shape, np.nan)
+
+
+# rolling window sums along axis 0 from one cumulative sum
+def _rolling_sum(values, window):
+    """
+    Sum of each window of values along axis 0, NaN until window bars are
+    available and for every window holding a NaN (as pandas rolling with
+    min_periods=window). NaNs are summed as zero and counted apart, so one
+    missing bar only blanks the windows that contain it.
+    """
+    out = _nan_like(values)
+    if window > values.shape[0]:
+        return out
+
+    valid = ~np.isnan(values)
+    complete = valid.all()
+    total = np.cumsum(values if complete else np.where(valid, values, 0.0), axis=0)
+
+    out[window - 1] = total[window - 1]
+    out[window:] = total[window:] - total[:-window]
+    if complete:
+        return out
+
+    count = np.cumsum(valid, axis=0)
+    counted = count[window - 1:].copy()
+    counted[1:] -= count[:-window]
+    out[window - 1:][counted < window] = np.nan
+    return out
+
+
+# forward fill nans along axis 0
+def _ffill(values):
+    rows = np.arange(values.shape[0]).reshape((-1,) + (1,) * (values.ndim - 1))
+    rows = np.where(np.isnan(values), 0, rows)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    if values.ndim == 1:
+        return values[rows]
+    return np.take_along_axis(values, rows, axis=0)
+
+
+# first non-nan value of each column along axis 0 (nan where there is none)
+def _first_valid(values):
+    valid = ~np.isnan(values)
+    rows = np.argmax(valid, axis=0)
+    first = np.take_along_axis(values, np.expand_dims(rows, 0), axis=0)[0] if values.ndim > 1 else values[rows]
+    return np.where(valid.any(axis=0), first, np.nan)
+
+
+# exponential smoothing along axis 0: e[t] = alpha * x[t] + (1 - alpha) * e[t - 1]
+def _smooth(values, alpha, initial=None):
+    """
+    Exponentially smooth values along axis 0 without a per-bar Python loop.
+
+    The recursion is unrolled into a cumulative sum of x[k] / r**k (with
+    r = 1 - alpha), evaluated in blocks short enough that r**k can't
+    underflow, so each block is a handful of vectorized operations.
+
+    NaNs are skipped: a NaN bar repeats the previous value and doesn't
+    count as a step (pandas ewm with ignore_na=True). Without initial,
+    each column is seeded with its first valid value and is NaN before it.
+    """
+    n = values.shape[0]
+    out = np.empty(values.shape)
+    if n == 0:
+        return out
+
+    valid = ~np.isnan(values)
+    start = 0
+    if valid.all():
+        # no gaps: every bar after the seed is a step
+        steps = leading = None
+        previous = values[0] if initial is None else np.asarray(initial, dtype=float)
+        if initial is None:
+            out[0] = previous
+            start = 1
+    elif initial is None:
+        # the seed bar itself isn't a smoothing step
+        previous = _first_valid(values)
+        counted = np.cumsum(valid, axis=0)
+        leading = counted == 0
+        steps = valid & (counted > 1)
+    else:
+        previous = np.asarray(initial, dtype=float)
+        leading = None
+        steps = valid
+
+    r = 1.0 - alpha
+    if r <= 0.0:
+        filled = values if steps is None else _ffill(np.where(steps, values, np.nan))
+        out[start:] = np.where(np.isnan(filled[start:]), previous, filled[start:])
+        if leading is not None:
+            out[leading] = np.nan
+        return out
+
+    x = values if steps is None else np.where(steps, values, 0.0)
+
+    # longest block for which r**-block stays within about 1e100
+    block = max(1, int(100 / -np.log10(r))) if r < 1.0 else n
+
+    while start < n:
+        stop = min(start + block, n)
+
+        # e[t] = r**c * e[start - 1] + alpha * sum(r**(c - c_k) * x[k]), with c
+        # counting the steps taken (valid bars) since the block started
+        if steps is None:
+            powers = r ** np.arange(1, stop - start + 1).reshape((-1,) + (1,) * (values.ndim - 1))
+        else:
+            powers = r ** np.cumsum(steps[start:stop], axis=0)
+        scaled = np.cumsum(x[start:stop] / powers, axis=0)
+        out[start:stop] = powers * (previous + alpha * scaled)
+
+        previous = out[stop - 1]
+        start = stop
+
+    if leading is not None:
+        out[leading] = np.nan
+    return out
+
+
+# Wilder's smoothing of values along axis 0
+def _wilder(values, window):
+    """
+    Seed each column with the plain average of its first window valid
+    values, then smooth with alpha = 1 / window. NaN until the seed, and
+    later NaNs are skipped, so a ticker that starts late or misses a bar
+    still gets a value.
+    """
+    valid = ~np.isnan(values)
+    if valid.all():
+        out = _nan_like(values)
+        out[window - 1] = values[:window].mean(axis=0)
+        out[window:] = _smooth(values[window:], 1.0 / window, out[window - 1])
+        return out
+
+    counted = np.cumsum(valid, axis=0)
+    warmup = counted <= window
+
+    seed = np.sum(values, axis=0, where=valid & warmup) / window
+    out = _smooth(np.where(warmup, np.nan, values), 1.0 / window, seed)
+    out[counted < window] = np.nan
+    return out
+
+
+# simple moving average
+def sma(values, window):
+    """
+    Simple moving average along axis 0 (NaN until window bars are
+    available, and for windows holding a NaN).
+    """
+    values = _as_array(values)
+    return _rolling_sum(values, window) / window
+
+
+# exponential moving average
+def ema(values, span):
+    """
+    Exponential moving average along axis 0, seeded with the first valid
+    value and skipping NaNs (same as pandas ewm(span=span, adjust=False,
+    ignore_na=True).mean()).
+    """
+    values = _as_array(values)
+    return _smooth(values, 2.0 / (span + 1.0))
+
+
+# relative strength index
+def rsi(close, window=14):
+    """
+    Wilder's relative strength index along axis 0.
+    """
+    close = _as_array(close)
+    out = _nan_like(close)
+    if close.shape[0] <= window:
+        return out
+
+    change = np.diff(close, axis=0)
+    avg_gain = _wilder(np.clip(change, 0, None), window)
+    avg_loss = _wilder(np.clip(-change, 0, None), window)
+
+    out[1:] = 100 - 100 / (1 + _ratio(avg_gain, avg_loss))
+    return out
+
+
+# gain/loss ratio where no losses means an RSI of 100
+def _ratio(gain, loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(loss == 0, np.inf, gain / np.where(loss == 0, 1, loss))
+
+
+# moving average convergence divergence
+def macd(close, fast=12, slow=26, signal=9):
+    """
+    MACD line, signal line and histogram along axis 0.
+    """
+    close = _as_array(close)
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+# bollinger bands
+def bollinger_bands(close, window=20, num_std=2.0):
+    """
+    Middle (SMA), upper and lower Bollinger bands along axis 0, using the
+    population standard deviation of each window.
+    """
+    close = _as_array(close)
+
+    # shift by the first value so the sum of squares doesn't lose precision
+    first = _first_valid(close)
+    shifted = close - first
+    mean = _rolling_sum(shifted, window) / window
+    variance = np.maximum(_rolling_sum(shifted * shifted, window) / window - mean * mean, 0.0)
+    std = np.sqrt(variance)
+
+    middle = mean + first
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+# average true range
+def atr(high, low, close, window=14):
+    """
+    Wilder's average true range along axis 0.
+    """
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    if close.shape[0] < window:
+        return _nan_like(close)
+
+    # the largest of the three ranges that are available (fmax skips NaNs)
+    true_range = high - low
+    previous_close = close[:-1]
+    true_range[1:] = np.fmax(true_range[1:], np.fmax(np.abs(high[1:] - previous_close),
+                                                     np.abs(low[1:] - previous_close)))
+
+    return _wilder(true_range, window)
+
+
+# rolling annualized volatility of daily returns
+def rolling_volatility(close, window=21, annualize=True):
+    """
+    Rolling standard deviation (ddof=1) of daily returns along axis 0,
+    annualized by default.
+    """
+    close = _as_array(close)
+    out = _nan_like(close)
+    if close.shape[0] <= window:
+        return out
+
+    returns = close[1:] / close[:-1] - 1
+    mean = _rolling_sum(returns, window) / window
+    variance = (_rolling_sum(returns * returns, window) - window * mean * mean) / (window - 1)
+    out[1:] = np.sqrt(np.maximum(variance, 0.0))
+
+    if annualize:
+        out *= np.sqrt(TRADING_DAYS)
+    return out
+
+
+# drawdown from the running peak
+def drawdown(close):
+    """
+    Fractional drawdown from the running maximum along axis 0 (0 at a peak,
+    negative below it).
+    """
+    close = _as_array(close)
+    return close / np.fmax.accumulate(close, axis=0) - 1
+
+
+# every indicator for one or many tickers
+def compute_indicators(close, high=None, low=None, short_window=10, long_window=100):
+    """
+    Compute the full indicator set in one call.
+
+    Args:
+        close: 1D array of closes, or 2D array (bars x tickers) for a batch.
+        high: Optional highs shaped like close (needed for ATR).
+        low: Optional lows shaped like close (needed for ATR).
+        short_window: Length of the short SMA.
+        long_window: Length of the long SMA.
+
+    Returns:
+        Dictionary of indicator arrays, each shaped like close.
+    """
+    close = _as_array(close)
+    macd_line, signal_line, macd_hist = macd(close)
+    middle, upper, lower = bollinger_bands(close)
+
+    indicators = {
+        'SMA Short': sma(close, short_window),
+        'SMA Long': sma(close, long_window),
+        'EMA 12': ema(close, 12),
+        'EMA 26': ema(close, 26),
+        'RSI': rsi(close),
+        'MACD': macd_line,
+        'MACD Signal': signal_line,
+        'MACD Histogram': macd_hist,
+        'Bollinger Middle': middle,
+        'Bollinger Upper': upper,
+        'Bollinger Lower': lower,
+        'Volatility': rolling_volatility(close),
+        'Drawdown': drawdown(close),
+    }
+
+    if high is not None and low is not None:
+        indicators['ATR'] = atr(high, low, close)
+
+    return indicators
+
+
+# latest value of every indicator for a price history
+def latest_indicators(hist, short_window=10, long_window=100):
+    """
+    Get the most recent value of each indicator for an OHLCV history frame.
+    """
+    indicators = compute_indicators(hist['Close'].to_numpy(), hist['High'].to_numpy(),
+                                    hist['Low'].to_numpy(), short_window, long_window)
+    return {name: float(values[-1]) for name, values in indicators.items()}
@@ -0,0 +1,356 @@
+# LLM_Client.py
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+# default cache policy for generated analyses
+DEFAULT_TTL = 60 * 60
+DEFAULT_MAX_ENTRIES = 256
+
+
+class RequestAbandoned(Exception):
+    """
+    The caller generating a response stopped before it finished (e.g. a
+    stream consumer stopped reading); waiters claim the request again.
+    """
+
+
+class GeminiBackend:
+    """
+    Google Gemini backend. The client is configured and the model built once,
+    on first use, then reused for every request.
+    """
+
+    def __init__(self, model_name='gemini-pro', api_key=None):
+        self.model_name = model_name
+        self.api_key = api_key
+        self._model = None
+        self._lock = threading.Lock()
+
+    # build the model the first time it's needed
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as gai
+
+                gai.configure(api_key=self.api_key or os.environ['google_api_key'])
+                self._model = gai.GenerativeModel(self.model_name)
+            return self._model
+
+    def generate(self, prompt):
+        """
+        Generate the full response text for prompt.
+        """
+        return self._get_model().generate_content(prompt).text
+
+    def stream(self, prompt):
+        """
+        Generate the response for prompt as a stream of text chunks.
+        """
+        for chunk in self._get_model().generate_content(prompt, stream=True):
+            yield chunk.text
+
+
+class ResponseCache:
+    """
+    Cache of generated responses with TTL expiry, LRU eviction and
+    collapsing of identical in-flight requests.
+
+    Args:
+        ttl: Seconds a cached response stays valid.
+        max_entries: Maximum number of cached responses.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    # fresh cached value or None; the caller holds the lock
+    def _fresh(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if time.time() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key):
+        """
+        Get a fresh cached value, or None.
+        """
+        with self._lock:
+            return self._fresh(key)
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entries if needed.
+        """
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def claim(self, key):
+        """
+        Claim the right to compute key.
+
+        The cache is checked again under the same lock, so a request that
+        finished since the caller's get() is returned instead of computed
+        (and billed) a second time.
+
+        Returns:
+            future: Future that will hold the value for key.
+            owner: True if the caller must compute the value and settle the
+                future; False if another caller is already computing it or
+                the value is cached (the future is then already settled).
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            value = self._fresh(key)
+            if value is not None:
+                future.set_result(value)
+                return future, False
+            self._in_flight[key] = future
+            return future, True
+
+    def release(self, key):
+        """
+        Forget the in-flight request for key once its future is settled.
+        """
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def abandon(self, key, future):
+        """
+        Give up a claimed request without a result. The claim is released
+        first, then waiters get RequestAbandoned and claim the request again,
+        so one of them computes it.
+        """
+        self.release(key)
+        future.set_exception(RequestAbandoned(f"Request {key[:12]} was abandoned"))
+
+    def wait(self, key):
+        """
+        Claim key, waiting out in-flight requests that get abandoned.
+
+        Returns:
+            future: Future that will hold the value for key.
+            owner: True if the caller must compute the value (see claim());
+                otherwise the future is settled with a value or the owner's
+                error.
+        """
+        while True:
+            future, owner = self.claim(key)
+            if owner:
+                return future, True
+            try:
+                future.result()
+            except RequestAbandoned:
+                continue
+            except Exception:
+                pass
+            return future, False
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, or compute it once. Callers asking
+        for the same key while it is being computed wait for that result
+        instead of starting their own request.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        future, owner = self.wait(key)
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+            self.put(key, value)
+        except Exception as e:
+            self.release(key)
+            future.set_exception(e)
+            raise
+        except BaseException:
+            self.abandon(key, future)
+            raise
+        self.release(key)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class LatencyTracker:
+    """
+    Record time-to-first-token and total latency of recent LLM requests.
+
+    Args:
+        max_records: Number of recent requests to keep.
+    """
+
+    def __init__(self, max_records=100):
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, first_token, total, cached):
+        with self._lock:
+            self._records.append({'first_token': first_token, 'total': total, 'cached': cached,
+                                  'time': time.time()})
+
+    def summary(self):
+        """
+        Get the latest record and the averages over the kept records.
+        """
+        with self._lock:
+            records = list(self._records)
+        if not records:
+            return {'count': 0, 'last': None, 'avg_first_token': None, 'avg_total': None}
+        return {
+            'count': len(records),
+            'last': records[-1],
+            'avg_first_token': sum(r['first_token'] for r in records) / len(records),
+            'avg_total': sum(r['total'] for r in records) / len(records),
+        }
+
+
+# hash the data a prompt was built from
+def get_prompt_key(data):
+    """
+    Stable hash of the data behind a prompt, used as the cache key.
+    """
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# process-wide backend and cache
+_backend = None
+_response_cache = ResponseCache()
+_latency = LatencyTracker()
+
+
+def get_llm_backend():
+    """
+    Get the shared LLM backend, creating the Gemini backend on first use.
+    """
+    global _backend
+    if _backend is None:
+        _backend = GeminiBackend()
+    return _backend
+
+
+def set_llm_backend(backend):
+    """
+    Replace the shared LLM backend, e.g. with a local stub in tests. Any
+    object with a generate(prompt) method works; a stream(prompt) generator
+    method is used for streaming when present.
+    """
+    global _backend
+    _backend = backend
+    _response_cache.clear()
+
+
+def generate_cached(prompt, key_data=None):
+    """
+    Generate a response for prompt through the shared cache.
+
+    Args:
+        prompt: Prompt text.
+        key_data: Data the prompt was built from; its hash is the cache key.
+            Defaults to the prompt itself.
+    """
+    key = get_prompt_key(prompt if key_data is None else key_data)
+    start = time.perf_counter()
+    cached = _response_cache.get(key) is not None
+
+    text = _response_cache.get_or_compute(key, lambda: get_llm_backend().generate(prompt))
+
+    # without streaming the first token arrives with the whole response
+    elapsed = time.perf_counter() - start
+    _latency.record(elapsed, elapsed, cached=cached)
+    return text
+
+
+def stream_cached(prompt, key_data=None):
+    """
+    Generate a response for prompt as a stream of text chunks.
+
+    A cached response is yielded as one chunk. Otherwise the backend's
+    stream is passed through as it arrives and the full text is cached at
+    the end. If the same prompt is already being generated, this waits for
+    that result instead of starting another request.
+
+    Time to first chunk and total latency are recorded; see get_llm_latency().
+    """
+    key = get_prompt_key(prompt if key_data is None else key_data)
+    start = time.perf_counter()
+
+    cached = _response_cache.get(key)
+    if cached is not None:
+        yield cached
+        elapsed = time.perf_counter() - start
+        _latency.record(elapsed, elapsed, cached=True)
+        return
+
+    # claim the request, or wait for whoever already has it
+    future, owner = _response_cache.wait(key)
+
+    if not owner:
+        text = future.result()
+        first_token = time.perf_counter() - start
+        yield text
+        _latency.record(first_token, time.perf_counter() - start, cached=True)
+        return
+
+    backend = get_llm_backend()
+    chunks = []
+    first_token = None
+    try:
+        stream = backend.stream(prompt) if hasattr(backend, 'stream') else iter([backend.generate(prompt)])
+        for chunk in stream:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            chunks.append(chunk)
+            yield chunk
+
+        text = ''.join(chunks)
+        _response_cache.put(key, text)
+    except Exception as e:
+        _response_cache.release(key)
+        future.set_exception(e)
+        raise
+    except BaseException:
+        # the consumer stopped reading (GeneratorExit) or was interrupted:
+        # waiters recompute instead of getting this exception in their thread
+        _response_cache.abandon(key, future)
+        raise
+    _response_cache.release(key)
+    future.set_result(text)
+
+    total = time.perf_counter() - start
+    _latency.record(total if first_token is None else first_token, total, cached=False)
+
+
+def get_llm_latency():
+    """
+    Get time-to-first-token and total latency stats for recent requests.
+    """
+    return _latency.summary()
@@ -0,0 +1,267 @@
+# MA_Engine.py
+
+import os
+import math
+from collections import deque
+
+import pandas as pd
+
+from Gen_Files.Price_Cache import DEFAULT_CACHE_DIR, read_json, write_json
+
+
+class MovingAverageEngine:
+    """
+    Incremental short/long moving averages with crossover detection.
+
+    Running window sums are kept for both averages, so appending a bar costs
+    O(1) instead of recomputing rolling means over the whole history. The
+    crossover rule matches the chart functions: the short MA crosses above
+    the long MA when the difference turns from negative to positive, and
+    the long MA crosses above the short MA for the opposite change.
+
+    Only the rolling windows, the latest averages and the crossover events
+    are kept, so the saved state stays small however long the history is;
+    charts compute the average series themselves and take the crossovers
+    from crossover_masks().
+
+    Args:
+        short_window: Length of the short moving average.
+        long_window: Length of the long moving average.
+        resync_every: Recompute the window sums from scratch every this many
+            bars, to keep floating point drift bounded.
+    """
+
+    def __init__(self, short_window=15, long_window=100, resync_every=1000):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.resync_every = resync_every
+
+        # the most recent closes, enough to cover the longer window plus one
+        # so the last bar can be replaced without losing the value it evicted
+        self.closes = deque(maxlen=max(short_window, long_window) + 1)
+        self.short_sum = 0.0
+        self.long_sum = 0.0
+        self.since_resync = 0
+
+        # bars seen, first and last timestamps and the latest averages
+        self.count = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.short_ma = math.nan
+        self.long_ma = math.nan
+
+        # difference of the averages at the last bar and at the bar before it
+        self.prev_diff = math.nan
+        self.before_prev_diff = math.nan
+
+        self.events = []
+
+    @property
+    def last_bar(self):
+        """
+        (bars seen, last timestamp, last close), to tell whether bars were added.
+        """
+        return self.count, self.last_timestamp, self.closes[-1] if self.closes else None
+
+    # recompute the window sums from the stored closes
+    def _resync(self):
+        closes = list(self.closes)
+        self.short_sum = math.fsum(closes[-self.short_window:])
+        self.long_sum = math.fsum(closes[-self.long_window:])
+        self.since_resync = 0
+
+    def update(self, timestamp, close):
+        """
+        Append one bar and return the crossover event it triggers, if any.
+
+        A bar with the same timestamp as the last one replaces it (e.g. a
+        revised intraday close for the current trading day).
+        """
+        timestamp = pd.Timestamp(timestamp)
+        close = float(close)
+
+        if self.count and timestamp == self.last_timestamp:
+            self._drop_last()
+
+        # values leaving each window as this close comes in
+        closes = self.closes
+        if len(closes) >= self.short_window:
+            self.short_sum -= closes[-self.short_window]
+        if len(closes) >= self.long_window:
+            self.long_sum -= closes[-self.long_window]
+
+        closes.append(close)
+        self.short_sum += close
+        self.long_sum += close
+
+        self.since_resync += 1
+        if self.since_resync >= self.resync_every:
+            self._resync()
+
+        self.count += 1
+        short_ma = self.short_sum / self.short_window if self.count >= self.short_window else math.nan
+        long_ma = self.long_sum / self.long_window if self.count >= self.long_window else math.nan
+        diff = short_ma - long_ma
+
+        event = None
+        if diff > 0 and self.prev_diff < 0:
+            event = {'Date': timestamp, 'Direction': 'up', 'ShortMA': short_ma, 'LongMA': long_ma}
+        elif diff < 0 and self.prev_diff > 0:
+            event = {'Date': timestamp, 'Direction': 'down', 'ShortMA': short_ma, 'LongMA': long_ma}
+
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+        self.short_ma = short_ma
+        self.long_ma = long_ma
+        self.before_prev_diff = self.prev_diff
+        self.prev_diff = diff
+        if event is not None:
+            self.events.append(event)
+
+        return event
+
+    # undo the most recent bar, just before update() replaces it
+    def _drop_last(self):
+        if self.events and self.events[-1]['Date'] == self.last_timestamp:
+            self.events.pop()
+
+        self.closes.pop()
+        self._resync()
+        self.count -= 1
+        self.prev_diff = self.before_prev_diff
+        if self.count == 0:
+            self.first_timestamp = None
+
+    def extend(self, hist):
+        """
+        Feed every bar of hist newer than the last one seen.
+
+        Args:
+            hist: DataFrame with a 'Close' column indexed by date.
+
+        Returns:
+            List of new crossover events.
+        """
+        close = hist['Close']
+        last = self.last_timestamp
+        if last is not None:
+            close = close[close.index >= last]
+
+        events = []
+        for timestamp, value in close.items():
+            event = self.update(timestamp, value)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def crossover_masks(self, index):
+        """
+        Boolean arrays marking the bars of index where the short average
+        crosses above and below the long one.
+        """
+        index = pd.DatetimeIndex(index)
+        up = pd.DatetimeIndex([event['Date'] for event in self.events if event['Direction'] == 'up'])
+        down = pd.DatetimeIndex([event['Date'] for event in self.events if event['Direction'] == 'down'])
+        return index.isin(up), index.isin(down)
+
+    def to_dict(self):
+        """
+        Serialize the engine state to plain JSON-compatible data.
+        """
+        def clean(value):
+            return None if math.isnan(value) else value
+
+        def stamp(value):
+            return None if value is None else value.value
+
+        # timestamps are stored as epoch nanoseconds plus one timezone name
+        tz = None if self.first_timestamp is None else self.first_timestamp.tz
+
+        return {
+            'short_window': self.short_window,
+            'long_window': self.long_window,
+            'resync_every': self.resync_every,
+            'tz': None if tz is None else str(tz),
+            'closes': list(self.closes),
+            'count': self.count,
+            'first_timestamp': stamp(self.first_timestamp),
+            'last_timestamp': stamp(self.last_timestamp),
+            'short_ma': clean(self.short_ma),
+            'long_ma': clean(self.long_ma),
+            'prev_diff': clean(self.prev_diff),
+            'before_prev_diff': clean(self.before_prev_diff),
+            'events': [dict(event, Date=event['Date'].value) for event in self.events],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild an engine from to_dict() output.
+        """
+        def restore(value):
+            return math.nan if value is None else value
+
+        def to_timestamp(value):
+            if value is None:
+                return None
+            if data['tz'] is None:
+                return pd.Timestamp(value)
+            return pd.Timestamp(value, tz='UTC').tz_convert(data['tz'])
+
+        engine = cls(data['short_window'], data['long_window'], data.get('resync_every', 1000))
+        engine.closes.extend(data['closes'])
+        engine.count = data['count']
+        engine.first_timestamp = to_timestamp(data['first_timestamp'])
+        engine.last_timestamp = to_timestamp(data['last_timestamp'])
+        engine.short_ma = restore(data['short_ma'])
+        engine.long_ma = restore(data['long_ma'])
+        engine.prev_diff = restore(data['prev_diff'])
+        engine.before_prev_diff = restore(data['before_prev_diff'])
+        engine.events = [dict(event, Date=to_timestamp(event['Date'])) for event in data['events']]
+        engine._resync()
+        return engine
+
+
+# path of the saved engine state, next to the price cache
+def get_engine_path(symbol, short_window, long_window, cache_dir=None):
+    cache_dir = cache_dir or os.environ.get('QUICKSTOCK_CACHE_DIR', DEFAULT_CACHE_DIR)
+    return os.path.join(cache_dir, f"{symbol.upper()}_MA_{short_window}_{long_window}.json")
+
+
+# load, update and save the moving average engine for a symbol
+def update_crossovers(symbol, hist, short_window=15, long_window=100, cache_dir=None):
+    """
+    Get an up-to-date MovingAverageEngine for symbol.
+
+    The saved engine is reused only when it started at the first bar of
+    hist and hist holds exactly its bars up to its last one, so its averages
+    and events are the ones hist's own lines give; then only bars from its
+    last one on are processed. Otherwise (a later start, missing or extra
+    bars, a window ending earlier) it is rebuilt from hist. The state is saved back next to the price cache
+    when bars were added.
+    """
+    path = get_engine_path(symbol, short_window, long_window, cache_dir)
+
+    # state saved before the engine dropped its full series is rebuilt
+    data = read_json(path, None)
+    engine = MovingAverageEngine.from_dict(data) if data and 'count' in data else None
+
+    # hist must hold exactly the engine's bars up to its last one
+    reusable = (engine is not None and engine.count and not hist.empty
+                and engine.first_timestamp == hist.index[0] and engine.last_timestamp in hist.index
+                and hist.index.searchsorted(engine.last_timestamp, side='right') == engine.count)
+    if reusable:
+        saved = engine.last_bar
+    else:
+        engine = MovingAverageEngine(short_window, long_window)
+        saved = None
+
+    engine.extend(hist)
+
+    # re-feeding an unchanged last bar leaves nothing new to save
+    if engine.last_bar != saved:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        write_json(path, engine.to_dict())
+
+    return engine
@@ -0,0 +1,228 @@
+# Metadata_Store.py
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Gen_Files.Price_Cache import DEFAULT_CACHE_DIR, read_json, write_json
+
+logger = logging.getLogger(__name__)
+
+# fields that rarely change, trusted for days
+STATIC_FIELDS = {
+    'symbol', 'shortName', 'longName', 'longBusinessSummary', 'sector', 'industry',
+    'country', 'city', 'state', 'website', 'exchange', 'currency', 'quoteType',
+    'fullTimeEmployees', 'sharesOutstanding', 'floatShares',
+}
+
+# default freshness policy, in seconds
+STATIC_TTL = 3 * 24 * 60 * 60
+MARKET_TTL = 15 * 60
+
+
+# fetch company metadata from Yahoo Finance
+def yahoo_info_source(symbol):
+    """
+    Default metadata source: the yfinance .info dictionary for symbol.
+    """
+    import yfinance as yf
+
+    return yf.Ticker(symbol).info
+
+
+class MetadataStore:
+    """
+    Memoized store of company metadata (yfinance .info), kept in memory and
+    on disk.
+
+    Freshness is judged per field: static fields (sector, industry, business
+    summary, share count, ...) last static_ttl seconds, everything else is
+    treated as market data and lasts market_ttl seconds. Callers name the
+    fields they need, so a caller that only reads static fields doesn't
+    trigger a refetch every market_ttl. The source returns one dictionary,
+    so a refresh replaces the whole entry. A stale entry is returned right
+    away and refreshed in the background, so a warm store never blocks on
+    the network.
+
+    Args:
+        cache_dir: Directory holding the metadata files.
+        source: Callable symbol -> info dictionary; defaults to Yahoo.
+        static_ttl: Seconds static fields stay fresh.
+        market_ttl: Seconds market fields stay fresh.
+        offline: Never call the source, serve whatever is stored.
+    """
+
+    def __init__(self, cache_dir=None, source=None, static_ttl=STATIC_TTL, market_ttl=MARKET_TTL,
+                 offline=False, max_workers=8):
+        cache_dir = cache_dir or os.environ.get('QUICKSTOCK_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.metadata_dir = os.path.join(cache_dir, 'Metadata')
+        self.source = source or yahoo_info_source
+        self.static_ttl = static_ttl
+        self.market_ttl = market_ttl
+        self.offline = offline
+        self.max_workers = max_workers
+
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.metadata_dir, exist_ok=True)
+
+    def _path(self, symbol):
+        return os.path.join(self.metadata_dir, symbol.upper() + '.json')
+
+    # stored entry for a symbol, loading it from disk the first time
+    def _entry(self, symbol):
+        symbol = symbol.upper()
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is None:
+            entry = read_json(self._path(symbol), None)
+            if entry is not None:
+                with self._lock:
+                    self._entries.setdefault(symbol, entry)
+        return entry
+
+    # pick up an entry another process (e.g. the refresh worker) saved since
+    def _reload(self, symbol):
+        symbol = symbol.upper()
+        entry = read_json(self._path(symbol), None)
+        if entry is None:
+            return None
+        with self._lock:
+            current = self._entries.get(symbol)
+            if current is None or entry['fetched_at'] > current['fetched_at']:
+                self._entries[symbol] = entry
+            return self._entries[symbol]
+
+    def ttl(self, field):
+        """
+        Seconds the given field stays fresh.
+        """
+        return self.static_ttl if field in STATIC_FIELDS else self.market_ttl
+
+    def is_fresh(self, entry, fields=None):
+        """
+        Whether every requested field of an entry is still fresh (all fields
+        when fields is None).
+        """
+        age = time.time() - entry['fetched_at']
+        fields = entry['info'].keys() if fields is None else fields
+        return all(age <= self.ttl(field) for field in fields)
+
+    def refresh(self, symbol):
+        """
+        Fetch metadata for symbol from the source and store it.
+        """
+        symbol = symbol.upper()
+        info = dict(self.source(symbol))
+        entry = {'fetched_at': time.time(), 'info': info}
+
+        with self._lock:
+            self._entries[symbol] = entry
+        write_json(self._path(symbol), entry)
+
+        return entry
+
+    # refresh in a background thread, at most once per symbol at a time
+    def _refresh_in_background(self, symbol):
+        symbol = symbol.upper()
+        with self._lock:
+            if symbol in self._refreshing:
+                return
+            self._refreshing.add(symbol)
+
+        def run():
+            try:
+                self.refresh(symbol)
+            except Exception as e:
+                logger.warning("Metadata refresh failed for %s: %s", symbol, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(symbol)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get(self, symbol, fields=None):
+        """
+        Get the info dictionary for symbol.
+
+        Args:
+            symbol: Ticker symbol.
+            fields: Optional fields the caller needs; only their freshness
+                decides whether a refresh is started (all fields when None).
+
+        Returns:
+            The stored info dictionary (fetched synchronously only when
+            nothing is stored yet).
+        """
+        entry = self._entry(symbol)
+
+        if entry is None:
+            if self.offline:
+                return {}
+            return self.refresh(symbol)['info']
+
+        if not self.is_fresh(entry, fields):
+            entry = self._reload(symbol) or entry
+            if not self.offline and not self.is_fresh(entry, fields):
+                self._refresh_in_background(symbol)
+
+        return entry['info']
+
+    def preload(self, symbols, fields=None):
+        """
+        Make sure every symbol in a watchlist has fresh metadata, fetching the
+        missing or stale ones concurrently.
+
+        Args:
+            symbols: Ticker symbols.
+            fields: Optional fields that must be fresh (all fields when None).
+
+        Returns:
+            Dictionary mapping each symbol that failed to its error message.
+        """
+        stale = []
+        for symbol in symbols:
+            entry = self._entry(symbol)
+            if entry is None or not self.is_fresh(entry, fields):
+                stale.append(symbol)
+
+        errors = {}
+        if not stale or self.offline:
+            return errors
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(stale)))) as pool:
+            futures = {symbol: pool.submit(self.refresh, symbol) for symbol in stale}
+            for symbol, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[symbol] = str(e)
+
+        return errors
+
+
+# process-wide default store
+_metadata_store = None
+
+
+def get_metadata_store():
+    """
+    Get the shared MetadataStore, creating it on first use.
+    """
+    global _metadata_store
+    if _metadata_store is None:
+        offline = os.environ.get('QUICKSTOCK_OFFLINE', '') not in ('', '0')
+        _metadata_store = MetadataStore(offline=offline)
+    return _metadata_store
+
+
+def set_metadata_store(store):
+    """
+    Replace the shared MetadataStore, e.g. with one backed by a local test source.
+    """
+    global _metadata_store
+    _metadata_store = store
@@ -0,0 +1,356 @@
+# Portfolio_Frontier.py
+
+import numpy as np
+
+# trading days per year, used to annualize daily figures
+TRADING_DAYS = 252
+
+# default working-memory ceiling for one simulation chunk (bytes)
+DEFAULT_MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+# simulated points kept for plotting
+DEFAULT_SAMPLE_SIZE = 10000
+
+
+# get annualized expected returns and covariance from a price frame
+def get_return_stats(stock_data):
+    """
+    Get the daily expected returns and covariance matrix of a price frame.
+
+    Args:
+        stock_data: Pandas DataFrame of prices, one column per asset.
+
+    Returns:
+        expected_returns: 1D numpy array of mean daily returns.
+        cov_matrix: 2D numpy array of daily return covariances.
+    """
+    returns = stock_data.pct_change().dropna(how='all')
+
+    expected_returns = returns.mean().to_numpy(dtype=float)
+    cov_matrix = returns.cov().to_numpy(dtype=float)
+
+    return expected_returns, cov_matrix
+
+
+# work out how many portfolios fit in one chunk
+def get_chunk_size(num_assets, max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES):
+    """
+    Number of portfolios to evaluate per chunk so that the weight matrix and
+    its covariance product stay under max_chunk_bytes.
+    """
+    # weights, (weights @ cov) and its product with weights, plus a few
+    # per-portfolio vectors, all float64
+    bytes_per_portfolio = 8 * (3 * num_assets + 8)
+    return max(1, int(max_chunk_bytes // bytes_per_portfolio))
+
+
+# describe one simulated portfolio as a portfolio dictionary
+def _simulated_portfolio(returns, volatility, sharpe_ratio, weights):
+    return {
+        'Returns': float(returns),
+        'Volatility': float(volatility),
+        'Sharpe Ratio': float(sharpe_ratio),
+        'Weights': weights.copy(),
+    }
+
+
+# simulate random portfolios in chunked matrix operations
+def simulate_portfolios(expected_returns, cov_matrix, num_portfolios,
+                        max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES, seed=None,
+                        sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    Simulate random long-only portfolios in batches.
+
+    Weight vectors are drawn as one matrix per chunk, and returns,
+    volatilities and Sharpe ratios are computed with matrix products instead
+    of one np.dot per portfolio. Nothing is kept per portfolio: each chunk
+    only updates the running max Sharpe and min volatility portfolios and a
+    uniform sample of points for plotting, so memory stays under
+    max_chunk_bytes however many portfolios are simulated.
+
+    Args:
+        expected_returns: 1D array of mean daily returns.
+        cov_matrix: 2D array of daily return covariances.
+        num_portfolios: Number of portfolios to simulate.
+        max_chunk_bytes: Memory ceiling for the working set of one chunk.
+        seed: Optional seed for reproducible draws.
+        sample_size: Number of simulated points to keep for plotting
+            (0 for none).
+
+    Returns:
+        sample: Dictionary with 'Returns', 'Volatility' and 'Sharpe Ratio'
+            arrays of min(num_portfolios, sample_size) randomly chosen
+            portfolios.
+        max_sharpe_portfolio: Dictionary for the highest Sharpe ratio.
+        min_volatility_portfolio: Dictionary for the lowest volatility.
+    """
+    expected_returns = np.asarray(expected_returns, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    num_assets = expected_returns.shape[0]
+
+    rng = np.random.default_rng(seed)
+    chunk_size = get_chunk_size(num_assets, max_chunk_bytes)
+
+    max_sharpe_portfolio = None
+    min_volatility_portfolio = None
+
+    # reservoir: keep the points with the smallest random keys (a uniform sample)
+    sample_keys = np.empty(0)
+    sample = np.empty((0, 3))
+
+    for start in range(0, num_portfolios, chunk_size):
+        stop = min(start + chunk_size, num_portfolios)
+
+        # draw and normalize a block of weight vectors
+        weights = rng.random((stop - start, num_assets))
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        # portfolio variance is the row-wise w . (cov @ w)
+        variance = np.einsum('ij,ij->i', weights @ cov_matrix, weights)
+
+        returns = weights @ expected_returns * TRADING_DAYS
+        volatility = np.sqrt(variance * TRADING_DAYS)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = returns / volatility
+
+        # running best portfolios
+        ranked = np.where(np.isnan(sharpe), -np.inf, sharpe)
+        best = int(np.argmax(ranked))
+        if max_sharpe_portfolio is None or ranked[best] > max_sharpe_portfolio['Sharpe Ratio']:
+            max_sharpe_portfolio = _simulated_portfolio(returns[best], volatility[best], sharpe[best],
+                                                        weights[best])
+
+        lowest = int(np.argmin(np.where(np.isnan(volatility), np.inf, volatility)))
+        if min_volatility_portfolio is None or volatility[lowest] < min_volatility_portfolio['Volatility']:
+            min_volatility_portfolio = _simulated_portfolio(returns[lowest], volatility[lowest],
+                                                            sharpe[lowest], weights[lowest])
+
+        if sample_size > 0:
+            sample_keys = np.concatenate([sample_keys, rng.random(stop - start)])
+            sample = np.vstack([sample, np.column_stack([returns, volatility, sharpe])])
+            if sample_keys.shape[0] > sample_size:
+                keep = np.argpartition(sample_keys, sample_size)[:sample_size]
+                sample_keys, sample = sample_keys[keep], sample[keep]
+
+    sample = {
+        'Returns': sample[:, 0],
+        'Volatility': sample[:, 1],
+        'Sharpe Ratio': sample[:, 2],
+    }
+
+    return sample, max_sharpe_portfolio, min_volatility_portfolio
+
+
+# solve a minimum-variance problem with equality constraints
+def _solve_min_variance(cov_matrix, A, b, w0, long_only=True, max_iter=None, tol=1e-12):
+    """
+    Minimize w' cov w subject to A w = b (and w >= 0 when long_only).
+
+    Without bounds this is a single KKT solve. With bounds it is a primal
+    active-set method started from the feasible point w0, where the working
+    set is the assets pinned at zero weight.
+
+    Args:
+        cov_matrix: 2D covariance array (n x n).
+        A: 2D constraint matrix (m x n).
+        b: 1D constraint targets (m).
+        w0: Feasible starting weights (A w0 = b, w0 >= 0).
+        long_only: Keep every weight non-negative.
+
+    Returns:
+        1D numpy array of optimal weights.
+    """
+    num_assets = cov_matrix.shape[0]
+    num_constraints = A.shape[0]
+
+    # without bounds every asset is free and one KKT solve is enough
+    if not long_only:
+        kkt = np.block([[cov_matrix, A.T], [A, np.zeros((num_constraints, num_constraints))]])
+        rhs = np.concatenate([np.zeros(num_assets), b])
+        solution = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+        return solution[:num_assets]
+
+    if max_iter is None:
+        max_iter = 10 * num_assets + 100
+
+    scale = max(float(np.abs(cov_matrix).max()), 1e-300)
+    w = np.asarray(w0, dtype=float).copy()
+    free = w > 0
+
+    for _ in range(max_iter):
+        free_idx = np.flatnonzero(free)
+        A_free = A[:, free_idx]
+        gradient = cov_matrix @ w
+
+        # step p on the free assets that keeps A w = b and minimizes the objective
+        size = free_idx.size
+        kkt = np.block([[cov_matrix[np.ix_(free_idx, free_idx)], A_free.T],
+                        [A_free, np.zeros((num_constraints, num_constraints))]])
+        rhs = np.concatenate([-gradient[free_idx], np.zeros(num_constraints)])
+        solution = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+        step, nu = solution[:size], solution[size:]
+
+        if np.abs(step).max(initial=0.0) <= 1e-10 * max(1.0, np.abs(w).max()):
+            # stationary on the working set: check the bound multipliers
+            bound_idx = np.flatnonzero(~free)
+            if bound_idx.size == 0:
+                return w
+
+            multipliers = gradient[bound_idx] + A[:, bound_idx].T @ nu
+            worst = int(np.argmin(multipliers))
+            if multipliers[worst] >= -tol * scale:
+                return w
+
+            # release the bound with the most negative multiplier
+            free[bound_idx[worst]] = True
+            continue
+
+        # take the longest step that keeps every weight non-negative
+        alpha = 1.0
+        blocking = None
+        shrinking = step < 0
+        if shrinking.any():
+            ratios = -w[free_idx[shrinking]] / step[shrinking]
+            nearest = int(np.argmin(ratios))
+            if ratios[nearest] < 1.0:
+                alpha = float(ratios[nearest])
+                blocking = free_idx[shrinking][nearest]
+
+        w[free_idx] += alpha * step
+        if blocking is not None:
+            w[blocking] = 0.0
+            free[blocking] = False
+
+    return w
+
+
+# feasible long-only weights for a target daily return
+def _target_start(expected_returns, target_return):
+    lowest = int(np.argmin(expected_returns))
+    highest = int(np.argmax(expected_returns))
+    w0 = np.zeros(expected_returns.shape[0])
+
+    spread = expected_returns[highest] - expected_returns[lowest]
+    if spread <= 0:
+        w0[:] = 1.0 / w0.shape[0]
+        return w0
+
+    t = np.clip((target_return - expected_returns[lowest]) / spread, 0.0, 1.0)
+    w0[highest] += t
+    w0[lowest] += 1.0 - t
+    return w0
+
+
+# describe one set of weights as a portfolio dictionary
+def _portfolio_stats(weights, expected_returns, cov_matrix, risk_free_rate):
+    returns = float(weights @ expected_returns) * TRADING_DAYS
+    volatility = float(np.sqrt(max(weights @ cov_matrix @ weights, 0.0) * TRADING_DAYS))
+    sharpe_ratio = (returns - risk_free_rate) / volatility if volatility > 0 else np.nan
+
+    return {
+        'Returns': returns,
+        'Volatility': volatility,
+        'Sharpe Ratio': sharpe_ratio,
+        'Weights': weights,
+    }
+
+
+# minimum variance portfolio
+def get_min_variance_portfolio(expected_returns, cov_matrix, long_only=True, risk_free_rate=0.0):
+    """
+    Get the global minimum variance portfolio as a portfolio dictionary.
+    """
+    expected_returns = np.asarray(expected_returns, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    num_assets = expected_returns.shape[0]
+
+    weights = _solve_min_variance(cov_matrix, np.ones((1, num_assets)), np.ones(1),
+                                  np.full(num_assets, 1.0 / num_assets), long_only=long_only)
+
+    return _portfolio_stats(weights, expected_returns, cov_matrix, risk_free_rate)
+
+
+# tangency (max Sharpe ratio) portfolio
+def get_tangency_portfolio(expected_returns, cov_matrix, long_only=True, risk_free_rate=0.0):
+    """
+    Get the tangency (maximum Sharpe ratio) portfolio as a portfolio dictionary.
+
+    Solved as min y' cov y subject to (mu - rf)' y = 1, then w = y / sum(y).
+    Returns None when no asset beats the risk-free rate.
+    """
+    expected_returns = np.asarray(expected_returns, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+
+    excess = expected_returns - risk_free_rate / TRADING_DAYS
+    best = int(np.argmax(excess))
+    if excess[best] <= 0:
+        return None
+
+    y0 = np.zeros(expected_returns.shape[0])
+    y0[best] = 1.0 / excess[best]
+    y = _solve_min_variance(cov_matrix, excess[np.newaxis, :], np.ones(1), y0, long_only=long_only)
+
+    if y.sum() <= 0:
+        return None
+
+    return _portfolio_stats(y / y.sum(), expected_returns, cov_matrix, risk_free_rate)
+
+
+# exact minimum-variance frontier over a grid of target returns
+def solve_efficient_frontier(expected_returns, cov_matrix, num_points=50, long_only=True,
+                             risk_free_rate=0.0, target_returns=None):
+    """
+    Solve the minimum-variance frontier exactly instead of sampling it.
+
+    Args:
+        expected_returns: 1D array of mean daily returns.
+        cov_matrix: 2D array of daily return covariances.
+        num_points: Number of frontier points between the minimum variance
+            portfolio and the highest-return asset.
+        long_only: Forbid short positions.
+        risk_free_rate: Annual risk-free rate used for Sharpe ratios.
+        target_returns: Optional annual target returns to solve for instead
+            of the default grid.
+
+    Returns:
+        frontier: Dictionary with 'Returns', 'Volatility', 'Sharpe Ratio'
+            arrays and a 'Weights' matrix, one row per frontier point.
+        tangency_portfolio: Max Sharpe ratio portfolio dictionary (or None).
+        min_volatility_portfolio: Global minimum variance portfolio dictionary.
+    """
+    expected_returns = np.asarray(expected_returns, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    num_assets = expected_returns.shape[0]
+
+    min_volatility_portfolio = get_min_variance_portfolio(expected_returns, cov_matrix,
+                                                          long_only, risk_free_rate)
+    tangency_portfolio = get_tangency_portfolio(expected_returns, cov_matrix,
+                                                long_only, risk_free_rate)
+
+    # default grid runs from the minimum variance return to the best asset
+    if target_returns is None:
+        target_returns = np.linspace(min_volatility_portfolio['Returns'],
+                                     expected_returns.max() * TRADING_DAYS, num_points)
+    daily_targets = np.asarray(target_returns, dtype=float) / TRADING_DAYS
+
+    A = np.vstack([np.ones(num_assets), expected_returns])
+    weights = np.empty((daily_targets.shape[0], num_assets))
+    for i, target in enumerate(daily_targets):
+        w0 = _target_start(expected_returns, target)
+        weights[i] = _solve_min_variance(cov_matrix, A, np.array([1.0, target]), w0,
+                                         long_only=long_only)
+
+    returns = weights @ expected_returns * TRADING_DAYS
+    variance = np.einsum('ij,ij->i', weights @ cov_matrix, weights)
+    volatility = np.sqrt(np.maximum(variance, 0.0) * TRADING_DAYS)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (returns - risk_free_rate) / volatility
+
+    frontier = {
+        'Returns': returns,
+        'Volatility': volatility,
+        'Sharpe Ratio': sharpe,
+        'Weights': weights,
+    }
+
+    return frontier, tangency_portfolio, min_volatility_portfolio
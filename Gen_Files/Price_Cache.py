@@ -0,0 +1,367 @@
+# Price_Cache.py
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from Gen_Files.Price_Store import PriceStore, MARKET_TZ, write_atomic, to_day
+
+# default cache location, overridable with QUICKSTOCK_CACHE_DIR in .env
+DEFAULT_CACHE_DIR = 'Cache'
+
+# how long today's (still changing) bar is trusted, in seconds
+DEFAULT_TODAY_TTL = 15 * 60
+
+# a bar fetched before its session closed (plus a settling margin) is refetched
+SESSION_CLOSE = '16:30'
+
+
+# named chart windows, as offsets back from the last day of the data ('ytd' is handled apart)
+PERIODS = {
+    '5d': pd.DateOffset(days=5),
+    '1m': pd.DateOffset(months=1),
+    '3m': pd.DateOffset(months=3),
+    '6m': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+}
+
+
+# fetch daily history from Yahoo Finance
+def yahoo_source(symbol, start, end):
+    """
+    Default data source: daily OHLCV history for symbol in [start, end).
+    """
+    import yfinance as yf
+
+    return yf.Ticker(symbol).history(period="1d", start=start, end=end)
+
+
+# read a json file, returning default if it is missing or unreadable
+def read_json(path, default):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+# write a json file atomically
+def write_json(path, data):
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+
+    write_atomic(path, write)
+
+
+# merge overlapping or touching [start, end) ranges
+def merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+# merge [start, end, fetched_at] ranges, keeping the fetch time of each merged range's last bar
+def merge_fetched_ranges(ranges):
+    merged = []
+    for start, end, fetched_at in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1:] = [end, fetched_at]
+            elif end == merged[-1][1]:
+                merged[-1][2] = max(merged[-1][2], fetched_at)
+        else:
+            merged.append([start, end, fetched_at])
+    return merged
+
+
+# epoch seconds after which a day's bar is final
+def session_close(day):
+    return pd.Timestamp(f"{to_day(day):%Y-%m-%d} {SESSION_CLOSE}", tz=MARKET_TZ).timestamp()
+
+
+# subtract covered ranges from a requested range
+def subtract_ranges(start, end, covered):
+    missing = []
+    cursor = start
+    for covered_start, covered_end in merge_ranges(covered):
+        if covered_end <= cursor or covered_start >= end:
+            continue
+        if covered_start > cursor:
+            missing.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+# select rows of a frame whose (naive) date falls in [start, end)
+def slice_days(df, start, end):
+    index = df.index
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    mask = (index >= start) & (index < end)
+    return df[mask]
+
+
+# first day of a named window
+def period_start(period, end):
+    """
+    First day of the named window (a key of PERIODS, or 'ytd') that ends
+    at end (exclusive).
+    """
+    period = period.lower()
+    last_day = to_day(end) - timedelta(days=1)
+    if period == 'ytd':
+        return pd.Timestamp(year=last_day.year, month=1, day=1)
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period {period!r}, expected 'ytd' or one of {', '.join(PERIODS)}")
+    return to_day(last_day - PERIODS[period])
+
+
+class PriceCache:
+    """
+    On-disk cache of daily OHLCV history, kept in a columnar PriceStore
+    (one Parquet file per symbol and year).
+
+    Each symbol has a sidecar JSON file listing the [start, end) date ranges
+    already stored, with the time the last bar of each range was fetched,
+    so only the missing ranges are requested from the data source and
+    appended to the store, and reads only load the years they need. A bar
+    fetched before its session closed is unfinished: today's is refetched
+    once today_fetched_at is older than today_ttl seconds, an earlier day's
+    on the next read that covers it.
+
+    Args:
+        cache_dir: Directory holding the cache files.
+        source: Callable (symbol, start, end) -> DataFrame; defaults to Yahoo.
+        today_ttl: Seconds before the current trading day is refetched.
+        offline: Never call the source, serve whatever is cached.
+    """
+
+    def __init__(self, cache_dir=None, source=None, today_ttl=DEFAULT_TODAY_TTL, offline=False):
+        self.cache_dir = cache_dir or os.environ.get('QUICKSTOCK_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.source = source or yahoo_source
+        self.today_ttl = today_ttl
+        self.offline = offline
+        self.store = PriceStore(os.path.join(self.cache_dir, 'Prices'))
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # file paths for a symbol
+    def _paths(self, symbol):
+        base = os.path.join(self.cache_dir, symbol.upper())
+        return base + '.parquet', base + '.json'
+
+    # one lock per symbol so concurrent callers don't double-fetch
+    def _lock(self, symbol):
+        with self._locks_guard:
+            return self._locks.setdefault(symbol.upper(), threading.Lock())
+
+    # load the range metadata, moving an old single-file cache into the store
+    def _load_meta(self, symbol):
+        legacy_path, meta_path = self._paths(symbol)
+        if os.path.exists(legacy_path):
+            self.store.append(symbol, pd.read_parquet(legacy_path))
+            os.remove(legacy_path)
+        meta = read_json(meta_path, {'ranges': [], 'today_fetched_at': 0})
+
+        # older metadata kept one fetch time for the whole symbol
+        fetched_at = meta.pop('fetched_at', 0)
+        meta['ranges'] = [[to_day(r[0]), to_day(r[1]), r[2] if len(r) > 2 else fetched_at]
+                          for r in meta['ranges']]
+        meta.setdefault('today_fetched_at', fetched_at)
+        return meta
+
+    # covered ranges, without unfinished bars that are due for a refetch
+    def _covered(self, meta):
+        today = to_day(datetime.now())
+        covered = []
+
+        for start, end, fetched_at in meta['ranges']:
+            last_day = end - timedelta(days=1)
+            unfinished = last_day.weekday() < 5 and fetched_at < session_close(last_day)
+            if unfinished and (last_day < today or time.time() - meta['today_fetched_at'] > self.today_ttl):
+                end = last_day
+            if start < end:
+                covered.append([start, end, fetched_at])
+
+        return covered
+
+    def missing_ranges(self, symbol, start, end):
+        """
+        Date ranges in [start, end) that would be requested from the source.
+        """
+        meta = self._load_meta(symbol)
+        covered = [[s, e] for s, e, _ in self._covered(meta)]
+        return subtract_ranges(to_day(start), to_day(end), covered)
+
+    def get_history(self, symbol, start, end=None):
+        """
+        Get daily history for symbol in [start, end), fetching only the date
+        ranges that aren't cached yet.
+        """
+        start = to_day(start)
+        end = to_day(end) if end is not None else to_day(datetime.now()) + timedelta(days=1)
+
+        with self._lock(symbol):
+            meta = self._load_meta(symbol)
+            covered = self._covered(meta)
+            missing = subtract_ranges(start, end, [[s, e] for s, e, _ in covered])
+
+            if missing and not self.offline:
+                for missing_start, missing_end in missing:
+                    fetched = self.source(symbol, missing_start.strftime('%Y-%m-%d'),
+                                          missing_end.strftime('%Y-%m-%d'))
+                    self.store.append(symbol, fetched)
+                fetched_at = time.time()
+
+                # record the fetched ranges even when they held no bars (holidays),
+                # but never mark days after today as covered
+                horizon = to_day(datetime.now()) + timedelta(days=1)
+                ranges = covered + [[s, min(e, horizon), fetched_at] for s, e in missing if s < horizon]
+                if any(s < horizon <= e for s, e in missing):
+                    meta['today_fetched_at'] = fetched_at
+                meta['ranges'] = [[s.strftime('%Y-%m-%d'), e.strftime('%Y-%m-%d'), t]
+                                  for s, e, t in merge_fetched_ranges(ranges)]
+                write_json(self._paths(symbol)[1], meta)
+
+            return self.store.read(symbol, start, end)
+
+    def get_period(self, symbol, period, hist=None, loaded=None):
+        """
+        Get a named window ('ytd', '1m', '1y', ... see PERIODS) of symbol's
+        daily history.
+
+        The window is sliced out of an already loaded frame when that frame
+        covers it; only a window reaching back before the loaded data goes
+        through get_history (and so, at most, fetches the missing range).
+
+        Args:
+            symbol: Ticker symbol.
+            period: Window name.
+            hist: History already loaded for symbol.
+            loaded: (start, end) that hist was requested for, end exclusive.
+                The window ends at loaded[1], or at today+1 when loaded is None.
+
+        Returns:
+            DataFrame of the bars in the window.
+        """
+        if loaded is not None:
+            loaded_start, end = to_day(loaded[0]), to_day(loaded[1])
+        else:
+            loaded_start, end = None, to_day(datetime.now()) + timedelta(days=1)
+
+        start = period_start(period, end)
+        if hist is not None and loaded_start is not None and loaded_start <= start:
+            return slice_days(hist, start, end)
+
+        return self.get_history(symbol, start, end)
+
+
+# default number of concurrent downloads for bulk requests
+DEFAULT_MAX_WORKERS = 8
+
+
+# get aligned close prices for many symbols at once
+def get_close_panel(symbols, start, end=None, cache=None, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Get one wide frame of Close prices for many symbols.
+
+    Histories are loaded concurrently through the price cache with a bounded
+    worker pool, then aligned on the trading days every symbol has a bar for;
+    a symbol whose shorter history cuts the panel's date range is reported
+    in errors, although its column is kept.
+
+    Args:
+        symbols: List of ticker symbols.
+        start: First date (inclusive).
+        end: Last date (exclusive), defaults to today.
+        cache: PriceCache to use, defaults to the shared cache.
+        max_workers: Maximum number of concurrent downloads.
+
+    Returns:
+        prices: DataFrame indexed by date with one Close column per symbol.
+        errors: Dictionary mapping each failed or truncating symbol to a message.
+    """
+    cache = cache or get_price_cache()
+
+    closes = {}
+    errors = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as pool:
+        futures = {symbol: pool.submit(cache.get_history, symbol, start, end) for symbol in symbols}
+
+        for symbol, future in futures.items():
+            try:
+                hist = future.result()
+            except Exception as e:
+                errors[symbol] = str(e)
+                continue
+
+            if hist.empty:
+                errors[symbol] = "No price data found"
+                continue
+
+            # key every series by calendar day so different timezones line up
+            close = hist['Close'].copy()
+            if getattr(close.index, 'tz', None) is not None:
+                close.index = close.index.tz_localize(None)
+            close.index = close.index.normalize()
+            closes[symbol] = close[~close.index.duplicated(keep='last')]
+
+    if not closes:
+        return pd.DataFrame(), errors
+
+    prices = pd.concat(closes, axis=1, join='inner').sort_index()
+    prices.index.name = 'Date'
+
+    # name the symbols whose history limits the shared date range
+    firsts = {symbol: close.index.min() for symbol, close in closes.items()}
+    lasts = {symbol: close.index.max() for symbol, close in closes.items()}
+    for symbol in closes:
+        cuts = []
+        if firsts[symbol] > min(firsts.values()) and firsts[symbol] == max(firsts.values()):
+            cuts.append(f"starts {firsts[symbol]:%Y-%m-%d}")
+        if lasts[symbol] < max(lasts.values()) and lasts[symbol] == min(lasts.values()):
+            cuts.append(f"ends {lasts[symbol]:%Y-%m-%d}")
+        if cuts:
+            errors[symbol] = f"History only {' and '.join(cuts)}, so the portfolio is limited to that range"
+
+    return prices, errors
+
+
+# process-wide default cache
+_price_cache = None
+
+
+def get_price_cache():
+    """
+    Get the shared PriceCache, creating it on first use.
+    """
+    global _price_cache
+    if _price_cache is None:
+        offline = os.environ.get('QUICKSTOCK_OFFLINE', '') not in ('', '0')
+        _price_cache = PriceCache(offline=offline)
+    return _price_cache
+
+
+def set_price_cache(cache):
+    """
+    Replace the shared PriceCache, e.g. with one backed by a local test source.
+    """
+    global _price_cache
+    _price_cache = cache
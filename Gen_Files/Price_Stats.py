@@ -0,0 +1,233 @@
+# Price_Stats.py
+
+import numpy as np
+
+from Gen_Files.Indicators import TRADING_DAYS
+
+# length of the 52-week range: by date when bar dates are given, else in bars
+WEEK_52_NS = 52 * 7 * 24 * 3600 * 10**9
+WEEK_52_BARS = TRADING_DAYS
+
+# names returned by PriceStatsAccumulator.result()
+STAT_NAMES = ['bars', 'start', 'end', 'first_close', 'last_close', 'last_volume', 'high', 'low', 'mean_close',
+              'mean_volume', 'vwap', 'total_return', 'volatility', 'max_drawdown', 'high_52w', 'low_52w']
+
+
+# convert input to a float array of bars x tickers
+def _as_2d(values):
+    values = np.asarray(values, dtype=float)
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+# last non-nan value of each column, or fallback where a column has none
+def _last_valid(values, valid, fallback):
+    rows = values.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    found = valid.any(axis=0)
+    return np.where(found, values[rows, np.arange(values.shape[1])], fallback), rows, found
+
+
+# forward fill nans down each column
+def _ffill(values):
+    rows = np.where(~np.isnan(values), np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return values[rows, np.arange(values.shape[1])]
+
+
+class PriceStatsAccumulator:
+    """
+    Summary statistics of one or many price histories, updated in place as
+    bars are appended.
+
+    Every statistic is kept as running state (sums, extremes, the last close,
+    the running peak, Welford mean and variance of daily returns and the bars
+    of the last 52 weeks), so each update only touches the new bars: a whole
+    history is one update, and a new day is one more. Works on 1D arrays for
+    one ticker or 2D arrays (bars x tickers) for a batch; nans mark bars a
+    ticker doesn't have, e.g. before it listed.
+
+    Args:
+        num_tickers: Number of columns of the arrays passed to update().
+    """
+
+    def __init__(self, num_tickers=1):
+        k = num_tickers
+        self.num_tickers = k
+        self.bars = np.zeros(k, dtype=np.int64)
+        self.start = np.full(k, np.iinfo(np.int64).min)
+        self.end = np.full(k, np.iinfo(np.int64).min)
+        self.first_close = np.full(k, np.nan)
+        self.last_close = np.full(k, np.nan)
+        self.last_volume = np.full(k, np.nan)
+        self.high = np.full(k, -np.inf)
+        self.low = np.full(k, np.inf)
+        self.close_sum = np.zeros(k)
+        self.volume_sum = np.zeros(k)
+        self.volume_bars = np.zeros(k, dtype=np.int64)
+        self.value_sum = np.zeros(k)
+        self.return_count = np.zeros(k, dtype=np.int64)
+        self.return_mean = np.zeros(k)
+        self.return_m2 = np.zeros(k)
+        self.peak = np.full(k, np.nan)
+        self.max_drawdown = np.zeros(k)
+
+        # bars of the trailing 52 weeks, for the 52-week range
+        self._tail_dates = np.empty(0, dtype=np.int64)
+        self._tail_high = np.empty((0, k))
+        self._tail_low = np.empty((0, k))
+
+    def update(self, close, high=None, low=None, volume=None, dates=None):
+        """
+        Add bars to the statistics.
+
+        Args:
+            close: Closes, 1D for one ticker or 2D (bars x tickers).
+            high: Optional highs shaped like close (default: close).
+            low: Optional lows shaped like close (default: close).
+            volume: Optional volumes shaped like close.
+            dates: Optional 1D dates of the bars (a DatetimeIndex or
+                datetime64 array, UTC for tz-aware indexes), oldest first.
+
+        Returns:
+            self
+        """
+        close = _as_2d(close)
+        if close.shape[1] != self.num_tickers:
+            raise ValueError(f"Expected {self.num_tickers} tickers, got {close.shape[1]}")
+        if close.shape[0] == 0:
+            return self
+
+        high = close if high is None else _as_2d(high)
+        low = close if low is None else _as_2d(low)
+        valid = ~np.isnan(close)
+        count = valid.sum(axis=0)
+
+        # first and last bars
+        first_rows = np.argmax(valid, axis=0)
+        new = (self.bars == 0) & (count > 0)
+        self.first_close = np.where(new, close[first_rows, np.arange(self.num_tickers)], self.first_close)
+        previous_close = self.last_close
+        self.last_close, last_rows, found = _last_valid(close, valid, self.last_close)
+        if volume is not None:
+            volume = _as_2d(volume)
+            self.last_volume = np.where(found, volume[last_rows, np.arange(self.num_tickers)], self.last_volume)
+        if dates is not None:
+            dates = np.asarray(dates, dtype='datetime64[ns]').view(np.int64)
+            self.start = np.where(new, dates[first_rows], self.start)
+            self.end = np.where(found, dates[last_rows], self.end)
+        self.bars += count
+
+        # extremes and sums
+        self.high = np.fmax(self.high, np.max(high, axis=0, initial=-np.inf, where=~np.isnan(high)))
+        self.low = np.fmin(self.low, np.min(low, axis=0, initial=np.inf, where=~np.isnan(low)))
+        self.close_sum += np.sum(close, axis=0, where=valid)
+
+        # volume weighted average of the typical price
+        if volume is not None:
+            typical = (high + low + close) / 3
+            traded = valid & ~np.isnan(volume)
+            self.volume_sum += np.sum(volume, axis=0, where=traded)
+            self.volume_bars += traded.sum(axis=0)
+            self.value_sum += np.sum(typical * volume, axis=0, where=traded)
+
+        # daily returns, chained to the last close of the previous update
+        prior = _ffill(np.vstack([previous_close, close]))[:-1]
+        returns = close / prior - 1
+        has_return = valid & ~np.isnan(prior)
+        n = has_return.sum(axis=0)
+        mean = np.sum(returns, axis=0, where=has_return) / np.maximum(n, 1)
+        m2 = np.sum((returns - mean) ** 2, axis=0, where=has_return)
+
+        # merge with the running mean and variance (Chan et al.)
+        total = self.return_count + n
+        delta = mean - self.return_mean
+        share = np.divide(n, total, out=np.zeros(self.num_tickers), where=total > 0)
+        self.return_m2 += m2 + delta * delta * self.return_count * share
+        self.return_mean += delta * share
+        self.return_count = total
+
+        # drawdown from the running peak
+        peaks = np.fmax.accumulate(np.vstack([self.peak, close]), axis=0)[1:]
+        self.max_drawdown = np.fmin(self.max_drawdown,
+                                    np.min(close / peaks - 1, axis=0, initial=0.0, where=valid))
+        self.peak = peaks[-1]
+
+        # keep only the bars in some ticker's trailing 52 weeks
+        self._tail_high = np.vstack([self._tail_high, high])
+        self._tail_low = np.vstack([self._tail_low, low])
+        if dates is not None:
+            self._tail_dates = np.concatenate([self._tail_dates, dates])
+        keep = self._tail_window().any(axis=1)
+        if not keep.all():
+            self._tail_high = self._tail_high[keep]
+            self._tail_low = self._tail_low[keep]
+            if dates is not None:
+                self._tail_dates = self._tail_dates[keep]
+
+        return self
+
+    # which tail bars are in each ticker's own 52 weeks, counted back from
+    # its last bar, so a ticker ending early in a batch keeps its window
+    def _tail_window(self):
+        if self._tail_dates.size == self._tail_high.shape[0]:
+            last = np.where(self.bars > 0, self.end, np.iinfo(np.int64).max)
+            return self._tail_dates[:, None] > last - WEEK_52_NS
+        later = np.cumsum(~np.isnan(self._tail_high[::-1]), axis=0)[::-1]
+        return later <= WEEK_52_BARS
+
+    def result(self):
+        """
+        Get the statistics, one array entry per ticker (see STAT_NAMES).
+
+        high, low, mean, first/last and 52-week values are nan for a ticker
+        without bars, volatility needs two returns, start and end are UTC
+        datetime64 values (None without dates), and volatility is the
+        annualized standard deviation (ddof=1) of daily returns.
+        """
+        has_bars = self.bars > 0
+        bars = np.maximum(self.bars, 1)
+        no_date = np.iinfo(np.int64).min
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            window = self._tail_window()
+            high_52w = np.max(self._tail_high, axis=0, initial=-np.inf, where=window & ~np.isnan(self._tail_high))
+            low_52w = np.min(self._tail_low, axis=0, initial=np.inf, where=window & ~np.isnan(self._tail_low))
+            variance = self.return_m2 / (self.return_count - 1)
+
+            return {
+                'bars': self.bars.copy(),
+                'start': None if (self.start == no_date).all() else self.start.view('datetime64[ns]').copy(),
+                'end': None if (self.end == no_date).all() else self.end.view('datetime64[ns]').copy(),
+                'first_close': self.first_close.copy(),
+                'last_close': self.last_close.copy(),
+                'last_volume': self.last_volume.copy(),
+                'high': np.where(has_bars, self.high, np.nan),
+                'low': np.where(has_bars, self.low, np.nan),
+                'mean_close': np.where(has_bars, self.close_sum / bars, np.nan),
+                'mean_volume': np.where(self.volume_bars > 0, self.volume_sum / np.maximum(self.volume_bars, 1),
+                                        np.nan),
+                'vwap': np.where(self.volume_sum > 0, self.value_sum / self.volume_sum, np.nan),
+                'total_return': self.last_close / self.first_close - 1,
+                'volatility': np.where(self.return_count > 1, np.sqrt(variance * TRADING_DAYS), np.nan),
+                'max_drawdown': np.where(has_bars, self.max_drawdown, np.nan),
+                'high_52w': np.where(np.isfinite(high_52w), high_52w, np.nan),
+                'low_52w': np.where(np.isfinite(low_52w), low_52w, np.nan),
+            }
+
+
+# statistics of whole histories in one call
+def summary_stats(close, high=None, low=None, volume=None, dates=None):
+    """
+    Summary statistics of one history (1D arrays) or a batch (2D arrays,
+    bars x tickers), see PriceStatsAccumulator.
+
+    Returns:
+        Dictionary of STAT_NAMES: scalars for 1D input, arrays with one
+        entry per ticker for 2D input.
+    """
+    close = np.asarray(close, dtype=float)
+    num_tickers = 1 if close.ndim == 1 else close.shape[1]
+    stats = PriceStatsAccumulator(num_tickers).update(close, high, low, volume, dates).result()
+
+    if close.ndim == 1:
+        return {name: None if value is None else value[0] for name, value in stats.items()}
+    return stats
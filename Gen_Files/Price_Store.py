@@ -0,0 +1,303 @@
+# Price_Store.py
+
+import os
+import glob
+import argparse
+import tempfile
+import threading
+
+import pandas as pd
+
+# columns every stored frame has, in order
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# suffix of the CSV files the GUIs used to write
+CSV_SUFFIX = '_Price_Data.csv'
+
+# timezone given to migrated CSV bars that carry none, Yahoo's for US listings
+MARKET_TZ = 'America/New_York'
+
+
+# mode bits the process creates files with, for temporary files to match
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+# write a file atomically so readers never see half a file
+def write_atomic(path, write):
+    """
+    Call write(tmp_path) on a fresh temporary file next to path, then move
+    it over path. Each call gets its own temporary file, so concurrent
+    writers of the same path never move each other's file away; the last
+    one to finish wins.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.',
+                                    suffix='.tmp')
+    os.close(fd)
+    try:
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# calendar years of an index, ignoring its timezone
+def _years(index):
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    return index.year
+
+
+# normalize a date-like value to a naive midnight timestamp
+def to_day(value):
+    day = pd.Timestamp(value)
+    if day.tzinfo is not None:
+        day = day.tz_localize(None)
+    return day.normalize()
+
+
+# give bars timezone tz (None for naive), keeping the local time of naive bars
+def _match_tz(bars, tz):
+    bars_tz = getattr(bars.index, 'tz', None)
+    if str(tz) == str(bars_tz):
+        return bars
+
+    bars = bars.copy()
+    if tz is None:
+        bars.index = bars.index.tz_localize(None)
+    elif bars_tz is None:
+        bars.index = bars.index.tz_localize(tz)
+    else:
+        bars.index = bars.index.tz_convert(tz)
+    return bars
+
+
+class PriceStore:
+    """
+    Columnar store of price bars, one directory per symbol and one Parquet
+    file per calendar year.
+
+    Appends rewrite only the years the new bars fall in, and range reads
+    only open the years they overlap and only the columns asked for, so
+    neither touches the whole history. Dtypes and the (timezone-aware)
+    index survive the round trip, unlike CSV.
+
+    Works for daily and intraday bars alike; a bar's year is taken from its
+    local date. All of a symbol's years share one timezone: appended bars
+    are converted to the timezone of the bars already stored.
+
+    Args:
+        root: Directory holding the symbol directories.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, symbol):
+        return os.path.join(self.root, symbol.upper())
+
+    def _path(self, symbol, year):
+        return os.path.join(self._dir(symbol), f'{year}.parquet')
+
+    # one lock per symbol so concurrent appends don't lose bars
+    def _lock(self, symbol):
+        with self._locks_guard:
+            return self._locks.setdefault(symbol.upper(), threading.Lock())
+
+    def symbols(self):
+        """
+        Get the stored symbols.
+        """
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def years(self, symbol):
+        """
+        Get the years stored for symbol, in order.
+        """
+        paths = glob.glob(os.path.join(self._dir(symbol), '*.parquet'))
+        return sorted(int(os.path.basename(path).split('.')[0]) for path in paths)
+
+    def stored_tz(self, symbol):
+        """
+        Get the timezone of symbol's stored bars, None when they are naive
+        or nothing is stored.
+        """
+        years = self.years(symbol)
+        if not years:
+            return None
+        return getattr(pd.read_parquet(self._path(symbol, years[-1]), columns=[]).index, 'tz', None)
+
+    def append(self, symbol, df):
+        """
+        Add bars to symbol's history. Bars at timestamps already stored
+        replace the stored ones.
+
+        Returns:
+            Number of bars written.
+        """
+        if df is None or df.empty:
+            return 0
+
+        df = df.sort_index()
+        df = df[~df.index.duplicated(keep='last')]
+        os.makedirs(self._dir(symbol), exist_ok=True)
+
+        with self._lock(symbol):
+            if self.years(symbol):
+                df = _match_tz(df, self.stored_tz(symbol))
+            for year, bars in df.groupby(_years(df.index)):
+                path = self._path(symbol, year)
+                if os.path.exists(path):
+                    stored = pd.read_parquet(path)
+                    bars = pd.concat([stored, _match_tz(bars, getattr(stored.index, 'tz', None))])
+                    bars = bars[~bars.index.duplicated(keep='last')].sort_index()
+                write_atomic(path, lambda tmp_path, bars=bars: bars.to_parquet(tmp_path))
+
+        return len(df)
+
+    def read(self, symbol, start=None, end=None, columns=None):
+        """
+        Read symbol's bars whose (local) date falls in [start, end).
+
+        Args:
+            symbol: Ticker symbol.
+            start: First date (inclusive), defaults to the first stored bar.
+            end: Last date (exclusive), defaults to after the last stored bar.
+            columns: Columns to load, defaults to all.
+
+        Returns:
+            DataFrame of the bars, empty when none are stored.
+        """
+        start = to_day(start) if start is not None else None
+        end = to_day(end) if end is not None else None
+
+        years = [year for year in self.years(symbol)
+                 if (start is None or year >= start.year) and (end is None or year <= end.year)]
+
+        if not years:
+            return pd.DataFrame(columns=columns or PRICE_COLUMNS)
+
+        # year files can have different columns (e.g. 'Capital Gains' only in
+        # some years), so read each one and concat to the union of columns
+        import pyarrow.parquet as pq
+
+        frames = []
+        for year in years:
+            path = self._path(symbol, year)
+            names = columns
+            if columns is not None:
+                stored = set(pq.read_schema(path).names)
+                names = [column for column in columns if column in stored]
+            frames.append(pd.read_parquet(path, columns=names))
+        if len(frames) > 1:
+            # stores written before appends matched timezones can mix naive
+            # and aware years; bring them all to the aware one
+            tz = next((frame.index.tz for frame in frames if getattr(frame.index, 'tz', None) is not None), None)
+            df = pd.concat([_match_tz(frame, tz) for frame in frames])
+        else:
+            df = frames[0]
+        if columns is not None:
+            df = df.reindex(columns=columns)
+        if start is None and end is None:
+            return df
+
+        index = df.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        mask = True
+        if start is not None:
+            mask = mask & (index >= start)
+        if end is not None:
+            mask = mask & (index < end)
+        return df[mask]
+
+
+# read a price CSV written by DataFrame.to_csv
+def read_price_csv(path):
+    """
+    Read a price CSV (as written by the old GUIs) into a frame indexed by
+    its date column.
+    """
+    df = pd.read_csv(path, index_col=0)
+    df.index = pd.to_datetime(df.index, utc=df.index.astype(str).str.contains(r'[+-]\d\d:\d\d$').any())
+    df.index.name = 'Date'
+    return df
+
+
+# move CSV price files into a store
+def migrate_csv(paths, store, symbol=None, tz=MARKET_TZ):
+    """
+    Import price CSV files into store. Bars get the timezone of the bars
+    already stored for their symbol, or tz when there are none, so migrated
+    and fetched years can be read together.
+
+    Args:
+        paths: CSV files, or directories to search for *_Price_Data.csv.
+        store: PriceStore to append to.
+        symbol: Symbol for a single file; otherwise taken from each file
+            name (<SYMBOL>_Price_Data.csv).
+        tz: Exchange timezone for symbols with nothing stored yet. CSV
+            dates without an offset are taken as local times there.
+
+    Returns:
+        Dictionary mapping each imported symbol to the number of bars.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*' + CSV_SUFFIX))))
+        else:
+            files.append(path)
+
+    imported = {}
+    for path in files:
+        name = symbol or os.path.basename(path)
+        if name.endswith(CSV_SUFFIX):
+            name = name[:-len(CSV_SUFFIX)]
+        elif name.endswith('.csv'):
+            name = name[:-len('.csv')]
+        name = name.upper()
+
+        bars = _match_tz(read_price_csv(path), store.stored_tz(name) if store.years(name) else tz)
+        imported[name] = imported.get(name, 0) + store.append(name, bars)
+
+    return imported
+
+
+# migrate CSV price files from the command line
+def main(argv=None):
+    from Gen_Files.Price_Cache import get_price_cache
+
+    parser = argparse.ArgumentParser(description="Import <SYMBOL>_Price_Data.csv files into the Parquet price store.")
+    parser.add_argument('paths', nargs='+', help="CSV files or directories holding them.")
+    parser.add_argument('--symbol', default=None, help="Symbol to use for a single CSV file.")
+    parser.add_argument('--tz', default=MARKET_TZ,
+                        help="Exchange timezone for symbols not stored yet (default: %(default)s).")
+    parser.add_argument('--store', default=None, help="Store directory, defaults to the price cache's.")
+    parser.add_argument('--delete', action='store_true', help="Delete each CSV after importing it.")
+    args = parser.parse_args(argv)
+
+    store = PriceStore(args.store) if args.store else get_price_cache().store
+    imported = migrate_csv(args.paths, store, symbol=args.symbol, tz=args.tz)
+    for name, count in imported.items():
+        print(f"{name}: {count} bars")
+
+    if args.delete:
+        for path in args.paths:
+            if os.path.isdir(path):
+                for csv_path in glob.glob(os.path.join(path, '*' + CSV_SUFFIX)):
+                    os.remove(csv_path)
+            else:
+                os.remove(path)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,324 @@
+# Refresh_Scheduler.py
+
+import os
+import time
+import heapq
+import random
+import argparse
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from concurrent.futures import ThreadPoolExecutor
+
+from Gen_Files.Price_Cache import get_price_cache
+from Gen_Files.Metadata_Store import get_metadata_store
+from Gen_Files.Wiki_Cache import get_wiki_cache
+
+# first date kept warm in the price cache, the GUI's default start date
+HISTORY_START = '2020-01-01'
+
+# regular US trading session (exchange holidays aren't tracked)
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 0)
+
+# refresh intervals in seconds, (market open, market closed)
+INTERVALS = {
+    'prices': (15 * 60, 6 * 60 * 60),
+    'metadata': (15 * 60, 6 * 60 * 60),
+    'wiki': (24 * 60 * 60, 24 * 60 * 60),
+    'articles': (30 * 60, 3 * 60 * 60),
+}
+
+# rate limits per upstream service, (requests per second, burst)
+RATE_LIMITS = {
+    'yahoo': (2.0, 4),
+    'wikipedia': (1.0, 2),
+    'articles': (0.5, 2),
+}
+
+# which upstream service each job calls
+JOB_SERVICES = {
+    'prices': 'yahoo',
+    'metadata': 'yahoo',
+    'wiki': 'wikipedia',
+    'articles': 'articles',
+}
+
+# fraction of the interval added at random to each delay
+DEFAULT_JITTER = 0.1
+
+
+# check whether the US market is in its regular session
+def is_market_open(now=None):
+    """
+    Whether the US market is in its regular session at now (epoch seconds,
+    defaults to the current time).
+    """
+    moment = datetime.fromtimestamp(time.time() if now is None else now, MARKET_TZ)
+    if moment.weekday() >= 5:
+        return False
+    return MARKET_OPEN <= (moment.hour, moment.minute) < MARKET_CLOSE
+
+
+# watchlist from the environment
+def get_watchlist():
+    """
+    Get the symbols in the comma separated WATCHLIST environment variable.
+    """
+    return [symbol.strip().upper() for symbol in os.environ.get('WATCHLIST', '').split(',') if symbol.strip()]
+
+
+class RateLimiter:
+    """
+    Token bucket allowing rate calls per second on average and bursts of up
+    to burst calls.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, sleeping until one is available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# the refresh jobs, each writing into its shared cache
+def refresh_prices(symbol):
+    get_price_cache().get_history(symbol, HISTORY_START)
+
+
+def refresh_metadata(symbol):
+    get_metadata_store().refresh(symbol)
+
+
+def refresh_wiki(symbol):
+    get_wiki_cache().lookup(symbol)
+
+
+def refresh_articles(symbol):
+    # imported here so a worker without the scraping dependencies still runs the other jobs
+    from Gen_Files.GetArticles import crawl_articles
+
+    crawl_articles([symbol], min_interval=0)
+
+
+JOBS = {
+    'prices': refresh_prices,
+    'metadata': refresh_metadata,
+    'wiki': refresh_wiki,
+    'articles': refresh_articles,
+}
+
+
+class RefreshScheduler:
+    """
+    Keep the shared caches warm for a watchlist in the background.
+
+    Every (job, symbol) pair runs on its own timer: short intervals while
+    the market is open and long ones while it's closed, with random jitter
+    so the watchlist doesn't refresh in lockstep. Calls to each upstream
+    service go through a shared rate limiter. Results land in the shared
+    price cache, metadata store, wiki cache and article store, so
+    interactive page loads are served from the caches.
+
+    Jitter only ever delays a run, so a refresh never fires before its
+    cache's freshness window has run out.
+
+    Args:
+        watchlist: Ticker symbols to keep warm.
+        jobs: Job names to run, defaults to every job in JOBS.
+        intervals: Overrides for INTERVALS.
+        rate_limits: Overrides for RATE_LIMITS.
+        jitter: Fraction of the interval added at random to each delay.
+        max_workers: Maximum number of jobs running at once.
+    """
+
+    def __init__(self, watchlist, jobs=None, intervals=None, rate_limits=None,
+                 jitter=DEFAULT_JITTER, max_workers=4):
+        self.watchlist = [symbol.upper() for symbol in watchlist]
+        self.jobs = list(jobs or JOBS)
+        self.intervals = dict(INTERVALS, **(intervals or {}))
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.limiters = {service: RateLimiter(rate, burst)
+                         for service, (rate, burst) in dict(RATE_LIMITS, **(rate_limits or {})).items()}
+
+        self._queue = []
+        self._status = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pool = None
+
+    def interval(self, job, now=None):
+        """
+        Seconds between runs of job at now, depending on the market session.
+        """
+        open_interval, closed_interval = self.intervals[job]
+        return open_interval if is_market_open(now) else closed_interval
+
+    def _delay(self, job, now):
+        return self.interval(job, now) * (1 + random.uniform(0, self.jitter))
+
+    def _schedule(self, due, job, symbol):
+        with self._lock:
+            heapq.heappush(self._queue, (due, job, symbol))
+            self._status.setdefault(job, {}).setdefault(symbol, {})['next_run'] = due
+        self._wake.set()
+
+    def run_job(self, job, symbol):
+        """
+        Run one job for one symbol now, rate limited, and record the outcome.
+
+        Returns:
+            True if the job succeeded.
+        """
+        self.limiters[JOB_SERVICES[job]].acquire()
+        start = time.time()
+        try:
+            JOBS[job](symbol)
+            status, error = 'ok', None
+        except Exception as e:
+            status, error = 'error', str(e)
+            print(f"Refresh of {job} failed for {symbol}: {e}")
+
+        with self._lock:
+            self._status.setdefault(job, {}).setdefault(symbol, {}).update(
+                last_run=start, duration=time.time() - start, status=status, error=error)
+        return status == 'ok'
+
+    def run_once(self):
+        """
+        Run every job for every watchlist symbol once, concurrently, and wait.
+
+        Returns:
+            Dictionary mapping (job, symbol) to whether it succeeded.
+        """
+        tasks = [(job, symbol) for symbol in self.watchlist for job in self.jobs]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {task: pool.submit(self.run_job, *task) for task in tasks}
+        return {task: future.result() for task, future in futures.items()}
+
+    # run a job, then put it back in the queue
+    def _run_and_reschedule(self, job, symbol):
+        try:
+            self.run_job(job, symbol)
+        finally:
+            if not self._stop.is_set():
+                now = time.time()
+                self._schedule(now + self._delay(job, now), job, symbol)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            now = time.time()
+            due = []
+            with self._lock:
+                while self._queue and self._queue[0][0] <= now:
+                    due.append(heapq.heappop(self._queue))
+                wait = self._queue[0][0] - now if self._queue else None
+                self._wake.clear()
+
+            for _, job, symbol in due:
+                self._pool.submit(self._run_and_reschedule, job, symbol)
+
+            self._wake.wait(wait)
+
+    def start(self):
+        """
+        Start refreshing in a background thread; the first round starts right
+        away, spread out by the rate limiters.
+        """
+        if self._thread is not None:
+            return self
+
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        now = time.time()
+        for symbol in self.watchlist:
+            for job in self.jobs:
+                self._schedule(now, job, symbol)
+
+        self._thread = threading.Thread(target=self._loop, name='refresh-scheduler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, wait=True):
+        """
+        Stop scheduling new runs; jobs already running finish first when wait.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._pool.shutdown(wait=wait)
+        self._thread = None
+        self._pool = None
+        with self._lock:
+            self._queue.clear()
+
+    def status(self):
+        """
+        Get a copy of the per-job, per-symbol status: last_run, next_run,
+        duration, status ('ok' or 'error') and error.
+        """
+        with self._lock:
+            return {job: {symbol: dict(entry) for symbol, entry in symbols.items()}
+                    for job, symbols in self._status.items()}
+
+
+# run the scheduler as a standalone worker
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep the QuickStockInfo caches warm for a watchlist.")
+    parser.add_argument('--watchlist', default=None,
+                        help="Comma separated ticker symbols, defaults to the WATCHLIST environment variable.")
+    parser.add_argument('--jobs', default=','.join(JOBS),
+                        help="Comma separated jobs to run (default: all).")
+    parser.add_argument('--once', action='store_true', help="Refresh everything once and exit.")
+    args = parser.parse_args(argv)
+
+    if args.watchlist is not None:
+        watchlist = [symbol.strip().upper() for symbol in args.watchlist.split(',') if symbol.strip()]
+    else:
+        watchlist = get_watchlist()
+    if not watchlist:
+        parser.error("no watchlist given, set WATCHLIST or pass --watchlist")
+
+    scheduler = RefreshScheduler(watchlist, jobs=[job.strip() for job in args.jobs.split(',') if job.strip()])
+    if args.once:
+        results = scheduler.run_once()
+        failed = [f"{job}:{symbol}" for (job, symbol), ok in results.items() if not ok]
+        print(f"Refreshed {len(results) - len(failed)} of {len(results)} jobs.")
+        return 1 if failed else 0
+
+    scheduler.start()
+    print(f"Refreshing {', '.join(watchlist)} in the background, Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        scheduler.stop(wait=False)
+    return 0
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    raise SystemExit(main())
@@ -0,0 +1,219 @@
+# Render.py
+
+import math
+
+# Thin adapters that draw the Compute.py results in each front end. Every UI
+# library is imported inside the adapter that uses it, so importing this
+# module never loads Streamlit, Plotly, Tkinter or python-docx.
+
+# indicators shown by default, in order
+DISPLAY_INDICATORS = ['RSI', 'MACD', 'ATR', 'Volatility', 'Bollinger Upper', 'Bollinger Lower', 'EMA 12',
+                      'Drawdown']
+
+
+def _number(value, digits=2):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return '-'
+    return f"{value:,.{digits}f}"
+
+
+def _percent(value):
+    if value is None or math.isnan(value):
+        return '-'
+    return f"{value:.2%}"
+
+
+# label / text rows shared by every front end
+def price_stat_rows(stats):
+    """
+    Get (label, text) rows for a PriceStats.
+    """
+    return [
+        ("Current Price", _number(stats.last_close)),
+        ("Latest Volume", _number(stats.last_volume, 0)),
+        ("High Price", _number(stats.high)),
+        ("Low Price", _number(stats.low)),
+        ("Average Price", _number(stats.mean_close)),
+        ("Average Volume", _number(stats.mean_volume)),
+        ("VWAP", _number(stats.vwap)),
+        ("52-Week High", _number(stats.high_52w)),
+        ("52-Week Low", _number(stats.low_52w)),
+        ("Return", _percent(stats.total_return)),
+        ("Volatility", _percent(stats.volatility)),
+        ("Max Drawdown", _percent(stats.max_drawdown)),
+    ]
+
+
+def company_profile_rows(profile):
+    """
+    Get (label, text) rows for a CompanyProfile, without its summary.
+    """
+    return [
+        ("Sector", profile.sector or '-'),
+        ("Industry", profile.industry or '-'),
+        ("Market Cap", _number(profile.market_cap, 0)),
+        ("Recent Close Price", _number(profile.last_close)),
+        ("Recent Daily Volume", _number(profile.last_volume, 0)),
+    ]
+
+
+def indicator_rows(indicators, names=DISPLAY_INDICATORS):
+    """
+    Get (label, text) rows for the named values of an IndicatorSet.
+    """
+    values = indicators.labeled()
+    return [(name, _number(values[name])) for name in names]
+
+
+def portfolio_rows(result, portfolio):
+    """
+    Get (label, text) rows for one portfolio of a FrontierResult.
+    """
+    rows = [
+        ("Return", _number(portfolio['Returns'], 4)),
+        ("Volatility", _number(portfolio['Volatility'], 4)),
+        ("Sharpe Ratio", _number(portfolio['Sharpe Ratio'], 4)),
+    ]
+    rows += [(symbol, _number(weight, 4)) for symbol, weight in result.weights(portfolio).items()]
+    return rows
+
+
+# plotly figure of a FrontierResult
+def frontier_figure(result):
+    """
+    Plot the frontier curve (or the simulated portfolios) with the max
+    Sharpe ratio and min volatility portfolios.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    if result.method == 'simulation':
+        # simulated portfolios colored by Sharpe ratio
+        fig.add_trace(go.Scattergl(
+            x=result.frontier['Volatility'], y=result.frontier['Returns'], mode='markers',
+            marker=dict(size=5, color=result.frontier['Sharpe Ratio'], colorscale='Viridis', showscale=True),
+            name='Portfolios'))
+    else:
+        # random portfolios underneath the frontier
+        if result.random_portfolios is not None:
+            fig.add_trace(go.Scattergl(
+                x=result.random_portfolios['Volatility'], y=result.random_portfolios['Returns'],
+                mode='markers', marker=dict(size=4, color='lightgray'), name='Random Portfolios'))
+        fig.add_trace(go.Scatter(
+            x=result.frontier['Volatility'], y=result.frontier['Returns'], mode='lines',
+            line=dict(color='blue', width=3), name='Efficient Frontier'))
+
+    if result.max_sharpe is not None:
+        fig.add_trace(go.Scatter(
+            x=[result.max_sharpe['Volatility']], y=[result.max_sharpe['Returns']], mode='markers',
+            marker=dict(size=12, color='red'), name='Max Sharpe Ratio Portfolio'))
+
+    fig.add_trace(go.Scatter(
+        x=[result.min_volatility['Volatility']], y=[result.min_volatility['Returns']], mode='markers',
+        marker=dict(size=12, color='green'), name='Min Volatility Portfolio'))
+
+    fig.update_layout(xaxis_title='Volatility', yaxis_title='Returns')
+    return fig
+
+
+### Streamlit
+
+def streamlit_company_profile(profile):
+    import streamlit as st
+
+    if profile.summary:
+        st.write(profile.summary)
+    for label, text in company_profile_rows(profile):
+        st.write(label + ":", text)
+
+
+def streamlit_price_stats(stats):
+    import streamlit as st
+
+    st.subheader("Summary:")
+    for label, text in price_stat_rows(stats):
+        st.metric(label=label + ": ", value=text)
+
+
+def streamlit_indicators(indicators, names=DISPLAY_INDICATORS, columns=4):
+    import streamlit as st
+
+    cols = st.columns(columns)
+    for i, (label, text) in enumerate(indicator_rows(indicators, names)):
+        cols[i % columns].metric(label=label, value=text)
+
+
+def streamlit_portfolio(title, result, portfolio):
+    import streamlit as st
+
+    st.write(title)
+    if portfolio is None:
+        st.write("No portfolio beats the risk-free rate.")
+        return
+    for label, text in portfolio_rows(result, portfolio):
+        st.write(label + ": " + text)
+
+
+### Tkinter
+
+def _tk_rows(parent, title, rows):
+    import tkinter as tk
+
+    frame = tk.Frame(parent)
+    tk.Label(frame, text=title, font=('TkDefaultFont', 11, 'bold')).grid(row=0, column=0, columnspan=2, sticky='w')
+    for i, (label, text) in enumerate(rows, start=1):
+        tk.Label(frame, text=label + ":").grid(row=i, column=0, sticky='w')
+        tk.Label(frame, text=text).grid(row=i, column=1, sticky='e')
+    return frame
+
+
+def tk_company_profile(parent, profile):
+    """
+    Frame with the company name, its basics and summary; the caller places it.
+    """
+    import tkinter as tk
+
+    frame = _tk_rows(parent, profile.name, company_profile_rows(profile))
+    if profile.summary:
+        tk.Label(frame, text=profile.summary, wraplength=500, justify='left').grid(
+            row=len(company_profile_rows(profile)) + 1, column=0, columnspan=2, sticky='w')
+    return frame
+
+
+def tk_price_stats(parent, stats):
+    return _tk_rows(parent, "Summary", price_stat_rows(stats))
+
+
+def tk_indicators(parent, indicators, names=DISPLAY_INDICATORS):
+    return _tk_rows(parent, "Technical Indicators", indicator_rows(indicators, names))
+
+
+### docx
+
+def _docx_table(doc, rows):
+    table = doc.add_table(rows=0, cols=2)
+    for label, text in rows:
+        cells = table.add_row().cells
+        cells[0].text = label
+        cells[1].text = text
+    return table
+
+
+def docx_company_profile(doc, profile):
+    doc.add_heading('Company Information:', 1)
+    doc.add_paragraph(f"Name: {profile.name}")
+    doc.add_paragraph(f"Sector: {profile.sector or '-'}")
+    doc.add_paragraph(f"Industry: {profile.industry or '-'}")
+    doc.add_paragraph(f"Summary: {profile.summary or '-'}")
+
+
+def docx_price_stats(doc, stats):
+    doc.add_heading('Price Summary', 1)
+    doc.add_paragraph(f"{stats.start:%Y-%m-%d} to {stats.end:%Y-%m-%d} ({stats.bars} bars)")
+    _docx_table(doc, price_stat_rows(stats))
+
+
+def docx_indicators(doc, indicators, names=DISPLAY_INDICATORS):
+    doc.add_heading('Technical Indicators', 1)
+    _docx_table(doc, indicator_rows(indicators, names))
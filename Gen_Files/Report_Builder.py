@@ -0,0 +1,304 @@
+# Report_Builder.py
+
+import io
+import os
+import time
+import argparse
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from Gen_Files.Price_Cache import get_price_cache
+from Gen_Files.Metadata_Store import get_metadata_store
+from Gen_Files.Wiki_Cache import get_wiki_cache
+from Gen_Files.Compute import price_stats, company_profile, indicator_set
+from Gen_Files.Render import docx_company_profile, docx_price_stats, docx_indicators
+
+# where reports are written by default
+DEFAULT_REPORT_DIR = 'Reports'
+
+# default pool sizes: data gathering is network bound, chart rendering CPU bound
+DEFAULT_WORKERS = 16
+DEFAULT_PROCESSES = max(1, (os.cpu_count() or 2) - 1)
+
+# chart size in the document
+CHART_WIDTH_INCHES = 6.5
+
+
+# collect everything one report needs
+def gather_report_data(symbol, start_date, end_date, summary=True, articles=5):
+    """
+    Collect price history, company info, Wikipedia page, AI analysis and
+    articles for one symbol, all through the shared caches.
+
+    Parts other than the price history are optional: a failure is recorded
+    under 'errors' and the report is written without that part.
+
+    Returns:
+        Dictionary with 'symbol', 'hist', 'info', 'stats', 'indicators',
+        'wiki', 'summary', 'articles' and 'errors'.
+    """
+    data = {'symbol': symbol, 'info': {}, 'indicators': None, 'wiki': None, 'summary': None, 'articles': [],
+            'errors': {}}
+
+    data['hist'] = get_price_cache().get_history(symbol, start_date, end_date)
+    data['stats'] = price_stats(symbol, data['hist'])
+
+    try:
+        data['indicators'] = indicator_set(symbol, data['hist'])
+    except Exception as e:
+        data['errors']['indicators'] = str(e)
+
+    try:
+        data['info'] = get_metadata_store().get(symbol)
+    except Exception as e:
+        data['errors']['info'] = str(e)
+
+    try:
+        record = get_wiki_cache().lookup(data['info'].get('longName') or symbol)
+        data['wiki'] = record if record['status'] == 'ok' else None
+    except Exception as e:
+        data['errors']['wiki'] = str(e)
+
+    if summary:
+        try:
+            from Gen_Files.Summary import google_summary
+
+            data['summary'] = google_summary(data['hist'], data['info'])
+        except Exception as e:
+            data['errors']['summary'] = str(e)
+
+    if articles:
+        try:
+            from Gen_Files.GetArticles import get_MW_Articles
+
+            data['articles'] = get_MW_Articles(symbol, articles)
+        except Exception as e:
+            data['errors']['articles'] = str(e)
+
+    return data
+
+
+# make pyplot render off-screen in chart worker processes
+def _init_chart_worker():
+    import matplotlib
+
+    matplotlib.use('Agg', force=True)
+
+
+# render a report chart to PNG bytes
+def render_chart(hist, short_window=15, long_window=100, dpi=100):
+    """
+    Render the moving average chart for hist and return it as PNG bytes,
+    without touching the file system. Runs in a worker process.
+    """
+    import matplotlib.pyplot as plt
+    from Gen_Files.Stock_Analyzer import plot_stock_with_moving_averages
+
+    fig = plot_stock_with_moving_averages(hist, short_window, long_window)
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+# render a chart and time it, in whichever worker runs it
+def _render_timed(hist):
+    start = time.perf_counter()
+    chart = render_chart(hist)
+    return chart, time.perf_counter() - start
+
+
+# write one report document
+def write_report(data, chart, out_dir):
+    """
+    Write the docx report for gathered data and an in-memory PNG chart.
+
+    Returns:
+        Path of the written document.
+    """
+    from docx import Document
+    from docx.shared import Inches
+
+    symbol = data['symbol']
+
+    doc = Document()
+    doc.add_heading(f'Stock Report for {symbol}', 0)
+
+    docx_company_profile(doc, company_profile(symbol, data['info'], data['hist']))
+
+    doc.add_heading('Wikipedia Information', 1)
+    doc.add_paragraph(data['wiki']['url'] if data['wiki'] else "No Wikipedia page found")
+
+    doc.add_heading('Stock Analysis', 1)
+    if data['summary']:
+        doc.add_paragraph(data['summary'])
+    if chart is not None:
+        doc.add_picture(io.BytesIO(chart), width=Inches(CHART_WIDTH_INCHES))
+
+    docx_price_stats(doc, data['stats'])
+    if data['indicators'] is not None:
+        docx_indicators(doc, data['indicators'])
+
+    if data['articles']:
+        doc.add_heading('Articles', 1)
+        for article in data['articles']:
+            doc.add_paragraph(article['title'])
+            doc.add_paragraph(article['url'])
+
+    path = os.path.join(out_dir, f'{symbol}_report.docx')
+    doc.save(path)
+    return path
+
+
+def build_reports(symbols, start_date, end_date=None, out_dir=DEFAULT_REPORT_DIR, workers=DEFAULT_WORKERS,
+                  processes=DEFAULT_PROCESSES, summary=True, articles=5):
+    """
+    Build a docx report for every symbol in a watchlist.
+
+    Data for all symbols is gathered on a thread pool; each chart is
+    rendered in a process pool as soon as its data is in, kept in memory as
+    PNG bytes, and handed to a document writer thread as soon as it is
+    rendered. The stages overlap: the first reports are written while
+    other symbols are still being gathered.
+
+    Args:
+        symbols: Ticker symbols.
+        start_date: Start date of the price history.
+        end_date: End date of the price history, defaults to today.
+        out_dir: Directory the reports are written to.
+        workers: Threads gathering data and writing documents.
+        processes: Chart rendering processes; 0 renders on a single thread.
+        summary: Include the AI analysis.
+        articles: Number of MarketWatch articles to list (0 for none).
+
+    Returns:
+        reports: Dictionary mapping symbol to its report path.
+        errors: Dictionary mapping each failed symbol to its error message.
+        metrics: Dictionary with 'reports', 'failed', 'seconds',
+            'reports_per_minute' and 'stage_seconds' (time spent in each
+            stage, summed over workers).
+
+    Raises:
+        ImportError: python-docx is not installed.
+    """
+    # fail once up front rather than for every symbol after gathering its data
+    try:
+        import docx  # noqa: F401
+    except ImportError as e:
+        raise ImportError("building reports needs python-docx (pip install python-docx)") from e
+
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+    end_date = end_date or datetime.today().strftime('%Y-%m-%d')
+    os.makedirs(out_dir, exist_ok=True)
+
+    reports = {}
+    errors = {}
+    stage_seconds = {'gather': 0.0, 'render': 0.0, 'write': 0.0}
+    stage_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def add_time(stage, seconds):
+        with stage_lock:
+            stage_seconds[stage] += seconds
+
+    def timed(stage, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            add_time(stage, time.perf_counter() - start)
+
+    # pyplot isn't thread safe, so without processes charts render on one thread;
+    # workers are spawned rather than forked from this (threaded) process
+    if processes:
+        charts = ProcessPoolExecutor(max_workers=processes, initializer=_init_chart_worker,
+                                     mp_context=multiprocessing.get_context('spawn'))
+    else:
+        charts = ThreadPoolExecutor(max_workers=1)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as threads:
+        try:
+            # stage and symbol (or gathered data) of every unfinished future
+            stages = {threads.submit(timed, 'gather', gather_report_data, symbol, start_date, end_date,
+                                     summary, articles): ('gather', symbol) for symbol in symbols}
+
+            # hand each result to the next stage as soon as it is in
+            while stages:
+                done, _ = wait(stages, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, item = stages.pop(future)
+                    if stage == 'gather':
+                        try:
+                            data = future.result()
+                        except Exception as e:
+                            errors[item] = str(e)
+                            continue
+                        stages[charts.submit(_render_timed, data['hist'])] = ('render', data)
+                    elif stage == 'render':
+                        try:
+                            chart, seconds = future.result()
+                            add_time('render', seconds)
+                        except Exception as e:
+                            item['errors']['chart'] = str(e)
+                            chart = None
+                        stages[threads.submit(timed, 'write', write_report, item, chart, out_dir)] = \
+                            ('write', item['symbol'])
+                    else:
+                        try:
+                            reports[item] = future.result()
+                        except Exception as e:
+                            errors[item] = str(e)
+        finally:
+            charts.shutdown()
+
+    seconds = time.perf_counter() - started
+    metrics = {
+        'reports': len(reports),
+        'failed': len(errors),
+        'seconds': seconds,
+        'reports_per_minute': len(reports) / seconds * 60 if seconds > 0 else None,
+        'stage_seconds': stage_seconds,
+    }
+    return reports, errors, metrics
+
+
+# run the batch from the command line
+def main(argv=None):
+    from Gen_Files.Refresh_Scheduler import get_watchlist
+
+    parser = argparse.ArgumentParser(description="Write a docx stock report for every ticker in a watchlist.")
+    parser.add_argument('--watchlist', default=None,
+                        help="Comma separated ticker symbols, defaults to the WATCHLIST environment variable.")
+    parser.add_argument('--start', default='2020-01-01', help="Start date of the price history.")
+    parser.add_argument('--end', default=None, help="End date of the price history (default: today).")
+    parser.add_argument('--out', default=DEFAULT_REPORT_DIR, help="Directory to write the reports to.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Data gathering threads.")
+    parser.add_argument('--processes', type=int, default=DEFAULT_PROCESSES, help="Chart rendering processes.")
+    parser.add_argument('--articles', type=int, default=5, help="Articles per report (0 for none).")
+    parser.add_argument('--no-summary', action='store_true', help="Leave out the AI analysis.")
+    args = parser.parse_args(argv)
+
+    watchlist = args.watchlist.split(',') if args.watchlist is not None else get_watchlist()
+    if not watchlist:
+        parser.error("no watchlist given, set WATCHLIST or pass --watchlist")
+
+    reports, errors, metrics = build_reports(watchlist, args.start, args.end, out_dir=args.out,
+                                             workers=args.workers, processes=args.processes,
+                                             summary=not args.no_summary, articles=args.articles)
+
+    for symbol, reason in errors.items():
+        print(f"{symbol}: failed ({reason})")
+    stages = ', '.join(f"{stage} {seconds:.1f}s" for stage, seconds in metrics['stage_seconds'].items())
+    print(f"Wrote {metrics['reports']} reports in {metrics['seconds']:.1f}s "
+          f"({metrics['reports_per_minute']:.1f} reports/min; {stages}).")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    raise SystemExit(main())
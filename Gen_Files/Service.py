@@ -0,0 +1,351 @@
+# Service.py
+
+import sys
+import json
+import math
+import argparse
+from datetime import datetime, date
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+import pandas as pd
+
+from Gen_Files.Shared_Cache import (enable_copy_on_write, get_shared_cache, get_shared_history, get_shared_info,
+                                    get_shared_close_panel)
+from Gen_Files.Wiki_Cache import get_wiki_cache
+from Gen_Files.MA_Engine import update_crossovers
+from Gen_Files.Compute import price_stats, indicator_set, compute_frontier
+
+# defaults matching the Streamlit GUI
+DEFAULT_START = '2020-01-01'
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# seconds a computed response is served from the shared cache
+RESPONSE_TTL = 60
+
+
+# make numpy, pandas and date values JSON serializable
+def to_json(value):
+    """
+    Convert a result into plain JSON types: numpy scalars and arrays become
+    numbers and lists, timestamps ISO strings, NaN and infinity None.
+    """
+    if isinstance(value, dict) or hasattr(value, 'items'):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return to_json(value.tolist())
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _history(symbol, start, end):
+    hist = get_shared_history(symbol, start, end)
+    if hist.empty:
+        raise ValueError(f"No price data found for {symbol}")
+    return hist
+
+
+# serve a computed response from the shared cache
+def _cached(name, args, compute):
+    key = ('service', name) + tuple(str(arg) for arg in args)
+    return get_shared_cache().get_or_compute(key, lambda: to_json(compute()), ttl=RESPONSE_TTL)
+
+
+def quote(symbol):
+    """
+    Latest close, change and volume for symbol plus its company basics.
+    """
+    symbol = symbol.upper()
+
+    def compute():
+        hist = _history(symbol, pd.Timestamp.now().normalize() - pd.Timedelta(days=10), None)
+        info = get_shared_info(symbol)
+        close = hist['Close'].to_numpy(dtype=float)
+        previous = close[-2] if len(close) > 1 else math.nan
+        return {
+            'symbol': symbol,
+            'name': info.get('longName'),
+            'sector': info.get('sector'),
+            'industry': info.get('industry'),
+            'market_cap': info.get('marketCap'),
+            'as_of': hist.index[-1],
+            'close': close[-1],
+            'change': close[-1] - previous,
+            'change_pct': close[-1] / previous - 1,
+            'volume': hist['Volume'].iloc[-1],
+        }
+
+    return _cached('quote', (symbol,), compute)
+
+
+def stats(symbol, start=DEFAULT_START, end=None):
+    """
+    Price statistics for symbol over [start, end) (see Compute.PriceStats).
+    """
+    symbol = symbol.upper()
+
+    def compute():
+        return price_stats(symbol, _history(symbol, start, end)).as_dict()
+
+    return _cached('stats', (symbol, start, end), compute)
+
+
+def indicators(symbol, start=DEFAULT_START, end=None):
+    """
+    Latest technical indicator values for symbol (see Compute.IndicatorSet).
+    """
+    symbol = symbol.upper()
+
+    def compute():
+        return indicator_set(symbol, _history(symbol, start, end)).as_dict()
+
+    return _cached('indicators', (symbol, start, end), compute)
+
+
+def crossovers(symbol, start=DEFAULT_START, end=None, short_window=15, long_window=100):
+    """
+    Moving average crossovers for symbol, oldest first, with the latest
+    short and long averages.
+    """
+    symbol = symbol.upper()
+    short_window, long_window = int(short_window), int(long_window)
+
+    def compute():
+        hist = _history(symbol, start, end)
+        engine = update_crossovers(symbol, hist, short_window, long_window)
+        return {
+            'symbol': symbol,
+            'short_window': short_window,
+            'long_window': long_window,
+            'short_ma': engine.short_ma,
+            'long_ma': engine.long_ma,
+            'events': list(engine.events),
+        }
+
+    return _cached('crossovers', (symbol, start, end, short_window, long_window), compute)
+
+
+def frontier(symbols, start=DEFAULT_START, end=None, num_points=50, long_only=True, risk_free_rate=0.0):
+    """
+    Exact efficient frontier for a portfolio, with its max Sharpe ratio and
+    minimum volatility portfolios.
+    """
+    if isinstance(symbols, str):
+        symbols = symbols.split(',')
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+    if len(symbols) < 2:
+        raise ValueError("A frontier needs at least two symbols")
+    num_points, risk_free_rate = int(num_points), float(risk_free_rate)
+
+    def compute():
+        prices, errors = get_shared_close_panel(symbols, start, end)
+        if prices.shape[1] < 2:
+            raise ValueError(f"Not enough price data: {errors}")
+
+        result = compute_frontier(prices, num_points=num_points, long_only=long_only,
+                                  risk_free_rate=risk_free_rate)
+
+        def portfolio(chosen):
+            if chosen is None:
+                return None
+            return {
+                'return': chosen['Returns'],
+                'volatility': chosen['Volatility'],
+                'sharpe_ratio': chosen['Sharpe Ratio'],
+                'weights': result.weights(chosen),
+            }
+
+        return {
+            'symbols': list(result.symbols),
+            'errors': errors,
+            'frontier': {'return': result.frontier['Returns'], 'volatility': result.frontier['Volatility'],
+                         'sharpe_ratio': result.frontier['Sharpe Ratio']},
+            'max_sharpe': portfolio(result.max_sharpe),
+            'min_volatility': portfolio(result.min_volatility),
+        }
+
+    return _cached('frontier', (tuple(symbols), start, end, num_points, long_only, risk_free_rate), compute)
+
+
+def summary(symbol, start=DEFAULT_START, end=None):
+    """
+    AI analysis of symbol (cached by the data behind the prompt).
+    """
+    from Gen_Files.Summary import google_summary
+
+    symbol = symbol.upper()
+
+    def compute():
+        hist = _history(symbol, start, end)
+        return {'symbol': symbol, 'as_of': hist.index[-1],
+                'summary': google_summary(hist, get_shared_info(symbol))}
+
+    return _cached('summary', (symbol, start, end), compute)
+
+
+def wiki(symbol):
+    """
+    Wikipedia page record for symbol.
+    """
+    return to_json(get_wiki_cache().lookup(symbol.upper()))
+
+
+def metrics():
+    """
+    Shared cache metrics.
+    """
+    return get_shared_cache().metrics()
+
+
+# name -> (function, required query parameters)
+ENDPOINTS = {
+    'quote': (quote, ['symbol']),
+    'stats': (stats, ['symbol']),
+    'indicators': (indicators, ['symbol']),
+    'crossovers': (crossovers, ['symbol']),
+    'frontier': (frontier, ['symbols']),
+    'summary': (summary, ['symbol']),
+    'wiki': (wiki, ['symbol']),
+    'metrics': (metrics, []),
+}
+
+# query parameters accepted by the endpoints besides the required ones
+OPTIONAL_PARAMS = {'start', 'end', 'short_window', 'long_window', 'num_points', 'long_only', 'risk_free_rate'}
+
+
+# call an endpoint with string parameters
+def call(name, params):
+    """
+    Call the endpoint name with query-string style parameters.
+
+    Raises:
+        KeyError: Unknown endpoint.
+        ValueError: Missing or invalid parameters, or no data.
+    """
+    fn, required = ENDPOINTS[name]
+    missing = [param for param in required if not params.get(param)]
+    if missing:
+        raise ValueError(f"Missing parameter(s): {', '.join(missing)}")
+
+    kwargs = {key: value for key, value in params.items()
+              if key in OPTIONAL_PARAMS or key in required}
+    if 'long_only' in kwargs:
+        kwargs['long_only'] = str(kwargs['long_only']).lower() not in ('0', 'false', 'no')
+    return fn(**kwargs)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    GET /<endpoint>?param=value... returning JSON, e.g. /quote?symbol=AAPL
+    or /frontier?symbols=AAPL,MSFT,GOOG.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        name = url.path.strip('/')
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if name == 'health':
+            return self._send(200, {'status': 'ok'})
+        if name not in ENDPOINTS:
+            return self._send(404, {'error': f"Unknown endpoint {name!r}", 'endpoints': list(ENDPOINTS)})
+
+        try:
+            self._send(200, call(name, params))
+        except (ValueError, TypeError) as e:
+            self._send(400, {'error': str(e)})
+        except Exception as e:
+            self._send(500, {'error': str(e)})
+
+    # keep the console quiet at high request rates
+    def log_message(self, format, *args):
+        pass
+
+
+# start the JSON service
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Serve the endpoints as JSON over HTTP until interrupted.
+    """
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    print(f"Serving on http://{host}:{server.server_port}/ ({', '.join(ENDPOINTS)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# command line entry point
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless QuickStockInfo: print JSON results or serve them over HTTP.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name in ('quote', 'stats', 'indicators', 'crossovers', 'summary', 'wiki'):
+        command = commands.add_parser(name)
+        command.add_argument('symbol')
+        if name not in ('quote', 'wiki'):
+            command.add_argument('--start', default=DEFAULT_START)
+            command.add_argument('--end', default=None)
+        if name == 'crossovers':
+            command.add_argument('--short-window', type=int, default=15)
+            command.add_argument('--long-window', type=int, default=100)
+
+    command = commands.add_parser('frontier')
+    command.add_argument('symbols', help="Comma separated ticker symbols.")
+    command.add_argument('--start', default=DEFAULT_START)
+    command.add_argument('--end', default=None)
+    command.add_argument('--num-points', type=int, default=50)
+    command.add_argument('--allow-short', action='store_true')
+    command.add_argument('--risk-free-rate', type=float, default=0.0)
+
+    command = commands.add_parser('serve')
+    command.add_argument('--host', default=DEFAULT_HOST)
+    command.add_argument('--port', type=int, default=DEFAULT_PORT)
+
+    args = vars(parser.parse_args(argv))
+    name = args.pop('command')
+    enable_copy_on_write()
+    if name == 'serve':
+        serve(**args)
+        return 0
+
+    if name == 'frontier':
+        args['long_only'] = not args.pop('allow_short')
+
+    try:
+        result = ENDPOINTS[name][0](**args)
+    except ValueError as e:
+        print(json.dumps({'error': str(e)}), file=sys.stderr)
+        return 1
+
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    raise SystemExit(main())
@@ -0,0 +1,302 @@
+# Shared_Cache.py
+
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from Gen_Files.Price_Cache import get_price_cache, get_close_panel
+from Gen_Files.Metadata_Store import get_metadata_store, MARKET_TTL
+
+# default memory budget in megabytes, overridable with QUICKSTOCK_SHARED_CACHE_MB
+DEFAULT_MAX_MB = 512
+
+# default seconds an entry stays valid, the price cache's TTL for today's bar
+DEFAULT_TTL = 15 * 60
+
+
+# approximate memory held by a cached value
+def estimate_size(value):
+    """
+    Approximate size of value in bytes, counting DataFrame and array data.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+# whether pandas copies shared data on write (always from pandas 3)
+def copy_on_write():
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return bool(pd.options.mode.copy_on_write)
+    except (AttributeError, pd.errors.OptionError):
+        return False
+
+
+# opt in to copy-on-write on pandas 2, from an app's entry point
+def enable_copy_on_write():
+    """
+    Turn on pandas copy-on-write, so cached frames can be handed out as
+    shallow copies. It changes pandas behavior for the whole process, so
+    only entry points (Streamlit_GUI, the service) call it; without it
+    frames are handed out as deep copies.
+    """
+    if not copy_on_write():
+        pd.set_option('mode.copy_on_write', True)
+
+
+# read-only view of a cached value that shares its data
+def read_only_view(value):
+    """
+    View of value that callers can't use to change the cached copy.
+
+    With copy-on-write, DataFrames and Series come back as shallow copies
+    that become private copies only when a caller modifies them; without
+    it they come back as deep copies. Arrays come back as non-writeable
+    views, dictionaries as shallow copies (plain dicts, so they still
+    serialize to JSON), and tuples hold views of their items.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not copy_on_write())
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, tuple):
+        return tuple(read_only_view(item) for item in value)
+    return value
+
+
+class SharedCache:
+    """
+    Process-wide cache of price frames, metadata and derived results, shared
+    by every Streamlit session on the server.
+
+    Entries are held against a memory budget and the least recently used
+    ones are evicted to stay under it. Values are handed out as read-only
+    views (see read_only_view), so with copy-on-write enabled sessions
+    share one copy of the data. Concurrent requests for
+    the same key are collapsed into one computation.
+
+    Args:
+        max_bytes: Memory budget for all entries.
+        ttl: Default seconds an entry stays valid.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, ttl=DEFAULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    # drop one entry; the caller holds the lock
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry['size']
+
+    # unexpired entry for key, or None; the caller holds the lock
+    def _live(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and time.time() > entry['expires']:
+            self._remove(key)
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key, default=None):
+        """
+        Get a read-only view of the value for key, or default when it's
+        missing or expired.
+        """
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._hits += 1
+            return read_only_view(entry['value'])
+
+    def put(self, key, value, ttl=None):
+        """
+        Store value under key, evicting least recently used entries to stay
+        within the memory budget. Values larger than the whole budget aren't
+        stored.
+
+        Returns:
+            A read-only view of value.
+        """
+        size = estimate_size(value)
+        ttl = self.ttl if ttl is None else ttl
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size <= self.max_bytes:
+                self._entries[key] = {'value': value, 'size': size, 'expires': time.time() + ttl}
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    self._remove(next(iter(self._entries)))
+                    self._evictions += 1
+
+        return read_only_view(value)
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """
+        Get the value for key, computing and storing it on a miss. Callers
+        asking for a key while it is being computed wait for that result.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        # check again under the lock: an owner may have stored the value and
+        # dropped its in-flight future since the miss above
+        with self._lock:
+            entry = self._live(key)
+            if entry is not None:
+                return read_only_view(entry['value'])
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+        if not owner:
+            return read_only_view(future.result())
+
+        try:
+            value = compute()
+            future.set_result(value)
+            return self.put(key, value, ttl)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def invalidate(self, key):
+        """
+        Drop the entry for key, if any.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def metrics(self):
+        """
+        Get hits, misses, hit_rate, evictions, entries, bytes and max_bytes.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else None,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# process-wide default cache
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    Get the process-wide SharedCache, creating it on first use with the
+    QUICKSTOCK_SHARED_CACHE_MB budget.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            max_mb = float(os.environ.get('QUICKSTOCK_SHARED_CACHE_MB', DEFAULT_MAX_MB))
+            _shared_cache = SharedCache(max_bytes=int(max_mb * 1024 * 1024))
+        return _shared_cache
+
+
+def set_shared_cache(cache):
+    """
+    Replace the process-wide SharedCache, e.g. with one on a small budget.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        _shared_cache = cache
+
+
+# shared price history for a symbol and date range
+def get_shared_history(symbol, start_date, end_date=None):
+    """
+    Read-only view of symbol's history in [start_date, end_date), loaded
+    through the price cache once per process.
+    """
+    key = ('history', symbol.upper(), str(start_date), str(end_date))
+    return get_shared_cache().get_or_compute(
+        key, lambda: get_price_cache().get_history(symbol, start_date, end_date))
+
+
+# shared company info for a symbol
+def get_shared_info(symbol, fields=None):
+    """
+    Copy of symbol's info dictionary from the metadata store; fields are the
+    ones the caller needs (see MetadataStore.get).
+    """
+    key = ('info', symbol.upper(), None if fields is None else tuple(sorted(fields)))
+    return get_shared_cache().get_or_compute(
+        key, lambda: get_metadata_store().get(symbol, fields), ttl=MARKET_TTL)
+
+
+# shared close price panel for a portfolio
+def get_shared_close_panel(symbols, start_date, end_date=None, max_workers=8):
+    """
+    Aligned Close prices for many symbols (see Price_Cache.get_close_panel).
+    Only panels with every symbol loaded are shared; failed symbols are
+    retried next time.
+
+    Returns:
+        prices: Read-only view of the price frame.
+        errors: Dictionary mapping each failed or truncating symbol to a message.
+    """
+    shared = get_shared_cache()
+    key = ('portfolio', tuple(symbols), str(start_date), str(end_date))
+    cached = shared.get(key)
+    if cached is not None:
+        prices, errors = cached
+        return prices, dict(errors)
+
+    prices, errors = get_close_panel(symbols, start_date, end_date, max_workers=max_workers)
+    if set(prices.columns) == set(symbols):
+        prices, _ = shared.put(key, (prices, errors))
+    return prices, errors
@@ -1,113 +1,32 @@
-import os
 from dotenv import load_dotenv
-import yfinance as yf
 import pandas as pd
-from datetime import datetime
-import sys
 
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import streamlit as st
+from Gen_Files.Downsample import downsample_window
+from Gen_Files.Compute import moving_averages
+from Gen_Files.Summary import get_summary_prompt, google_summary
 
 load_dotenv()
 
-# get stock info and feed to it to google ai, get response
-def google_summary(hist, info):
-
-    # Get the latest closing price
-    latest_close = hist['Close'].iloc[-1]
-
-    # Get the highest and lowest closing prices
-    high_close = hist['Close'].max()
-    low_close = hist['Close'].min()
-
-    # Calculate the average closing price
-    avg_close = hist['Close'].mean()
-
-    stock_data = {}
-
-
-    # Technical Indicators
-    stock_data['P/E Ratio'] = info.get('trailingPE')
-    stock_data['P/B Ratio'] = info.get('priceToBook')
-    stock_data['Dividend Yield'] = info.get('dividendYield')
-    stock_data['EPS'] = info.get('trailingEps')
-    stock_data['D/E Ratio'] = info.get('debtToEquity')
-    stock_data['Beta'] = info.get('beta')
-    stock_data['Market Cap'] = info.get('marketCap')
-    stock_data['Shares Outstanding'] = info.get('sharesOutstanding')
-    stock_data['Return on Equity'] = info.get('returnOnEquity')
-    stock_data['Return on Assets'] = info.get('returnOnAssets')
-    stock_data['Return on Capital'] = info.get('returnOnCapital')
-    stock_data['Profit Margin'] = info.get('profitMargins')
-    stock_data['Operating Margin'] = info.get('operatingMargins')
-    stock_data['Gross Profit'] = info.get('grossProfits')
-    stock_data['Operating Cash Flow'] = info.get('operatingCashflow')
-    stock_data['Leveraged Free Cash Flow'] = info.get('freeCashflow')
-    stock_data['Revenue'] = info.get('revenue')
-    stock_data['Revenue Per Share'] = info.get('revenuePerShare')
-    stock_data['Revenue Growth'] = info.get('revenueGrowth')
-    stock_data['Gross Profit Growth'] = info.get('grossMargins')
-    stock_data['EBITDA'] = info.get('ebitda')
-    stock_data['EBITDA Margin'] = info.get('ebitdaMargins')
-    stock_data['EBITDA Growth'] = info.get('ebitdaGrowth')
-    stock_data['EPS Growth'] = info.get('earningsGrowth')
-    stock_data['EPS Diluted Growth'] = info.get('earningsQuarterlyGrowth')
-    stock_data['EPS Diluted'] = info.get('trailingEps')
-
-    # Fundamental Indicators
-    stock_data['52 Week High'] = info.get('fiftyTwoWeekHigh')
-    stock_data['52 Week Low'] = info.get('fiftyTwoWeekLow')
-
-    # Historical Market Data
-    stock_data['Average Open'] = hist['Open'].mean()
-    stock_data['Average High'] = hist['High'].mean()
-    stock_data['Average Low'] = hist['Low'].mean()
-    stock_data['Average Close'] = hist['Close'].mean()
-    stock_data['Average Volume'] = hist['Volume'].mean()
-
-    # Moving Averages
-    stock_data['10 Day Moving Average'] = hist['Close'].rolling(
-        window=10).mean().iloc[-1]
-    stock_data['100 Day Moving Average'] = hist['Close'].rolling(
-        window=100).mean().iloc[-1]
-
-    # Create a summary of the stock data
-    summary = f"The stock had its highest closing price of ${high_close} and its lowest of ${low_close}. "
-    summary += f"The average closing price was ${avg_close:.2f}. "
-    summary += f"As of {datetime.now}, the closing price was ${latest_close}."
-    summary += f"Here are some other key data points about the stock: {stock_data}"
-
-    # Construct the ChatGPT prompt
-    prompt = f"{summary} What could these figures suggest about the stock's performance and potential future trends?"
-
-    gai.configure(api_key=os.environ['google_api_key'])
-
-    # Generate a response using the google gemini model
-    model = gai.GenerativeModel('gemini-pro')
-
-    response = model.generate_content(prompt)
-
-    return response.text
+# matplotlib and plotly are imported by the plotting functions that use them,
+# so importing this module (or the summary it re-exports) stays cheap
 
 # plot from csv
-def plot_stock_with_moving_averages_from_csv(filename, short_window=15, long_window=100):
+def plot_stock_with_moving_averages_from_csv(filename, short_window=15, long_window=100, crossover_style='markers'):
     # Read data from CSV file
     df = pd.read_csv(filename, parse_dates=['Date'], index_col='Date')
 
-    # Calculate short and long moving averages
-    df['ShortMA'] = df['Close'].rolling(window=short_window).mean()
-    df['LongMA'] = df['Close'].rolling(window=long_window).mean()
+    return plot_stock_with_moving_averages(df, short_window, long_window, crossover_style)
 
-    # Create a column for the difference between the short and long MAs
-    df['Diff'] = df['ShortMA'] - df['LongMA']
+# plot from a price frame
+def plot_stock_with_moving_averages(hist, short_window=15, long_window=100, crossover_style='markers'):
+    """
+    Plot close price with short and long moving averages and their
+    crossovers on a matplotlib figure, from an in-memory price frame.
+    """
+    import matplotlib.pyplot as plt
 
-    # Identify crossover points
-    df['ShortCrossesAboveLong'] = (
-        (df['Diff'] > 0) & (df['Diff'].shift(1) < 0))
-    df['LongCrossesAboveShort'] = (
-        (df['Diff'] < 0) & (df['Diff'].shift(1) > 0))
+    ma = moving_averages(hist, short_window, long_window)
+    df = ma.frame
 
     # Create plot
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -116,14 +35,26 @@ def plot_stock_with_moving_averages_from_csv(filename, short_window=15, long_win
     plt.plot(df['ShortMA'], label=f'{short_window} Day MA', color='red')
     plt.plot(df['LongMA'], label=f'{long_window} Day MA', color='green')
 
-    # Add arrows for crossover points
-    for i in df[df['ShortCrossesAboveLong']].index:
-        plt.annotate('', xy=(i, df['ShortMA'][i]), xytext=(i, df['ShortMA'][i] - 5),
-                     arrowprops={'arrowstyle': '->', 'color': 'purple'})  # green for ShortMA crosses above LongMA
-
-    for i in df[df['LongCrossesAboveShort']].index:
-        plt.annotate('', xy=(i, df['LongMA'][i]), xytext=(i, df['LongMA'][i] + 5),
-                     arrowprops={'arrowstyle': '->', 'color': 'purple'})  # red for LongMA crosses above ShortMA
+    # boolean masks and plain arrays for the crossover points
+    up, down = ma.up, ma.down
+    short_ma = df['ShortMA'].to_numpy()
+    long_ma = df['LongMA'].to_numpy()
+
+    if crossover_style == 'markers':
+        # one marker collection per direction
+        plt.scatter(df.index[up], short_ma[up], marker='^', color='purple', zorder=3,
+                    label='Short MA Crosses Above')
+        plt.scatter(df.index[down], long_ma[down], marker='v', color='purple', zorder=3,
+                    label='Long MA Crosses Above')
+    else:
+        # Add arrows for crossover points
+        for i, y in zip(df.index[up], short_ma[up]):
+            plt.annotate('', xy=(i, y), xytext=(i, y - 5),
+                         arrowprops={'arrowstyle': '->', 'color': 'purple'})  # green for ShortMA crosses above LongMA
+
+        for i, y in zip(df.index[down], long_ma[down]):
+            plt.annotate('', xy=(i, y), xytext=(i, y + 5),
+                         arrowprops={'arrowstyle': '->', 'color': 'purple'})  # red for LongMA crosses above ShortMA
 
     plt.title(
         f'Close Price with {short_window}-Day & {long_window}-Day Moving Averages')
@@ -137,44 +68,68 @@ def plot_stock_with_moving_averages_from_csv(filename, short_window=15, long_win
     return fig
 
 # plot stock data on an interactive chart
-def plot_stock_with_interactive_chart(ticker, hist, short_window=15, long_window=100):
-    # Read data from CSV file
-    df = hist
-    
-
-    # Calculate short and long moving averages
-    df['ShortMA'] = df['Close'].rolling(window=short_window).mean()
-    df['LongMA'] = df['Close'].rolling(window=long_window).mean()
-
-    # Create a column for the difference between the short and long MAs
-    df['Diff'] = df['ShortMA'] - df['LongMA']
-
-    # Identify crossover points
-    df['ShortCrossesAboveLong'] = (
-        (df['Diff'] > 0) & (df['Diff'].shift(1) < 0))
-    df['LongCrossesAboveShort'] = (
-        (df['Diff'] < 0) & (df['Diff'].shift(1) > 0))
+def plot_stock_with_interactive_chart(ticker, hist, short_window=15, long_window=100, engine=None,
+                                      crossover_style='markers', width=1200, max_points=None,
+                                      x_range=None):
+    """
+    Plot close price with short and long moving averages and their crossovers.
+
+    The line traces are downsampled to about max_points (default: twice the
+    chart width in pixels) for the visible window given by x_range, so long
+    histories stay light in the browser. Crossover points are always kept.
+    Browser zoom doesn't add detail; pass a narrower x_range (naive or in
+    any timezone) to draw that window at full resolution. The figure is
+    returned for the caller to show (st.plotly_chart, ...).
+    """
+    import plotly.graph_objects as go
+
+    # averages and crossovers come from the compute layer, hist isn't modified
+    ma = moving_averages(hist, short_window, long_window, engine)
+    df = ma.frame
+    short_window, long_window = ma.short_window, ma.long_window
+
+    # boolean masks and plain arrays for the crossover points
+    up, down = ma.up, ma.down
+    short_ma = df['ShortMA'].to_numpy()
+    long_ma = df['LongMA'].to_numpy()
+
+    # downsample the lines to the chart's pixel width, never dropping crossovers
+    if max_points is None:
+        max_points = 2 * width
+    lines = downsample_window(df[['Close', 'ShortMA', 'LongMA']], 'Close', max_points,
+                              x_range=x_range, keep=up | down)
 
     # Create plot
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=df.index, y=df['Close'], mode='lines', name='Close Price'))
+        x=lines.index, y=lines['Close'], mode='lines', name='Close Price'))
     fig.add_trace(go.Scatter(
-        x=df.index, y=df['ShortMA'], mode='lines', name=f'{short_window} Day MA'))
+        x=lines.index, y=lines['ShortMA'], mode='lines', name=f'{short_window} Day MA'))
     fig.add_trace(go.Scatter(
-        x=df.index, y=df['LongMA'], mode='lines', name=f'{long_window} Day MA'))
-
-    # Add arrows for crossover points
-    for i in df[df['ShortCrossesAboveLong']].index:
-        fig.add_annotation(x=i, y=df['ShortMA'][i], text='', arrowhead=1, arrowsize=1, arrowwidth=2, arrowcolor='green')
-
-    for i in df[df['LongCrossesAboveShort']].index:
-        fig.add_annotation(x=i, y=df['LongMA'][i], text='', arrowhead=1, arrowsize=1, arrowwidth=2, arrowcolor='red')
+        x=lines.index, y=lines['LongMA'], mode='lines', name=f'{long_window} Day MA'))
+
+    if crossover_style == 'markers':
+        # one marker trace per direction instead of one annotation per crossover
+        fig.add_trace(go.Scatter(
+            x=df.index[up], y=short_ma[up], mode='markers', name='Short MA Crosses Above',
+            marker=dict(symbol='triangle-up', size=12, color='green')))
+        fig.add_trace(go.Scatter(
+            x=df.index[down], y=long_ma[down], mode='markers', name='Long MA Crosses Above',
+            marker=dict(symbol='triangle-down', size=12, color='red')))
+    else:
+        # Add arrows for crossover points
+        for i, y in zip(df.index[up], short_ma[up]):
+            fig.add_annotation(x=i, y=y, text='', arrowhead=1, arrowsize=1, arrowwidth=2, arrowcolor='green')
+
+        for i, y in zip(df.index[down], long_ma[down]):
+            fig.add_annotation(x=i, y=y, text='', arrowhead=1, arrowsize=1, arrowwidth=2, arrowcolor='red')
 
     fig.update_layout(title=f'Close Price with {short_window}-Day & {long_window}-Day Moving Averages',
-                      xaxis_title='Date', yaxis_title='Close Price ($)', autosize=False, width=1200, height=800, plot_bgcolor='white')
+                      xaxis_title='Date', yaxis_title='Close Price ($)', autosize=False, width=width, height=800, plot_bgcolor='white')
 
-    st.plotly_chart(fig, use_container_width=True)
+    # zoom to the visible window
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
 
     return fig
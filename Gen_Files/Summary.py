@@ -0,0 +1,122 @@
+# Summary.py
+
+from Gen_Files.Indicators import latest_indicators
+from Gen_Files.LLM_Client import generate_cached, stream_cached
+
+
+# build the analysis prompt from stock info and price history
+def get_summary_prompt(hist, info):
+    """
+    Build the AI analysis prompt for a stock.
+
+    Returns:
+        prompt: Prompt text.
+        key_data: The figures the prompt was built from, used as its cache key.
+    """
+
+    close = hist['Close'].to_numpy(dtype=float)
+
+    # Get the latest closing price
+    latest_close = close[-1]
+
+    # Get the highest and lowest closing prices
+    high_close = close.max()
+    low_close = close.min()
+
+    # Calculate the average closing price
+    avg_close = close.mean()
+
+    stock_data = {}
+
+
+    # Technical Indicators
+    stock_data['P/E Ratio'] = info.get('trailingPE')
+    stock_data['P/B Ratio'] = info.get('priceToBook')
+    stock_data['Dividend Yield'] = info.get('dividendYield')
+    stock_data['EPS'] = info.get('trailingEps')
+    stock_data['D/E Ratio'] = info.get('debtToEquity')
+    stock_data['Beta'] = info.get('beta')
+    stock_data['Market Cap'] = info.get('marketCap')
+    stock_data['Shares Outstanding'] = info.get('sharesOutstanding')
+    stock_data['Return on Equity'] = info.get('returnOnEquity')
+    stock_data['Return on Assets'] = info.get('returnOnAssets')
+    stock_data['Return on Capital'] = info.get('returnOnCapital')
+    stock_data['Profit Margin'] = info.get('profitMargins')
+    stock_data['Operating Margin'] = info.get('operatingMargins')
+    stock_data['Gross Profit'] = info.get('grossProfits')
+    stock_data['Operating Cash Flow'] = info.get('operatingCashflow')
+    stock_data['Leveraged Free Cash Flow'] = info.get('freeCashflow')
+    stock_data['Revenue'] = info.get('revenue')
+    stock_data['Revenue Per Share'] = info.get('revenuePerShare')
+    stock_data['Revenue Growth'] = info.get('revenueGrowth')
+    stock_data['Gross Profit Growth'] = info.get('grossMargins')
+    stock_data['EBITDA'] = info.get('ebitda')
+    stock_data['EBITDA Margin'] = info.get('ebitdaMargins')
+    stock_data['EBITDA Growth'] = info.get('ebitdaGrowth')
+    stock_data['EPS Growth'] = info.get('earningsGrowth')
+    stock_data['EPS Diluted Growth'] = info.get('earningsQuarterlyGrowth')
+    stock_data['EPS Diluted'] = info.get('trailingEps')
+
+    # Fundamental Indicators
+    stock_data['52 Week High'] = info.get('fiftyTwoWeekHigh')
+    stock_data['52 Week Low'] = info.get('fiftyTwoWeekLow')
+
+    # Historical Market Data
+    averages = hist[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(dtype=float).mean(axis=0)
+    stock_data['Average Open'] = averages[0]
+    stock_data['Average High'] = averages[1]
+    stock_data['Average Low'] = averages[2]
+    stock_data['Average Close'] = averages[3]
+    stock_data['Average Volume'] = averages[4]
+
+    # Moving Averages and other technical indicators
+    indicators = latest_indicators(hist, short_window=10, long_window=100)
+    stock_data['10 Day Moving Average'] = indicators['SMA Short']
+    stock_data['100 Day Moving Average'] = indicators['SMA Long']
+    stock_data['RSI (14)'] = indicators['RSI']
+    stock_data['MACD'] = indicators['MACD']
+    stock_data['MACD Signal'] = indicators['MACD Signal']
+    stock_data['ATR (14)'] = indicators['ATR']
+    stock_data['21 Day Volatility'] = indicators['Volatility']
+    stock_data['Drawdown From Peak'] = indicators['Drawdown']
+
+    # date of the latest bar, so the prompt only changes when the data does
+    latest_date = hist.index[-1].strftime('%Y-%m-%d')
+
+    # Create a summary of the stock data
+    summary = f"The stock had its highest closing price of ${high_close} and its lowest of ${low_close}. "
+    summary += f"The average closing price was ${avg_close:.2f}. "
+    summary += f"As of {latest_date}, the closing price was ${latest_close}."
+    summary += f"Here are some other key data points about the stock: {stock_data}"
+
+    # Construct the ChatGPT prompt
+    prompt = f"{summary} What could these figures suggest about the stock's performance and potential future trends?"
+
+    key_data = {
+        'symbol': info.get('symbol'),
+        'latest_date': latest_date,
+        'latest_close': latest_close,
+        'high_close': high_close,
+        'low_close': low_close,
+        'avg_close': avg_close,
+        'stock_data': stock_data,
+    }
+
+    return prompt, key_data
+
+# get stock info and feed to it to google ai, get response
+def google_summary(hist, info, stream=False):
+    """
+    Get an AI analysis of the stock. Responses are cached by the data behind
+    the prompt, so reruns with unchanged data don't call the model again.
+
+    With stream=True a generator of text chunks is returned instead of the
+    full text, so the caller can show the analysis as it is generated.
+    """
+    prompt, key_data = get_summary_prompt(hist, info)
+
+    if stream:
+        return stream_cached(prompt, key_data)
+
+    # Generate a response using the shared (cached) google gemini backend
+    return generate_cached(prompt, key_data)
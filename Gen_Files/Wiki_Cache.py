@@ -0,0 +1,210 @@
+# Wiki_Cache.py
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Gen_Files.Price_Cache import DEFAULT_CACHE_DIR, read_json, write_json
+
+# how long resolved and negative lookups are trusted, in seconds
+FOUND_TTL = 30 * 24 * 60 * 60
+NOT_FOUND_TTL = 24 * 60 * 60
+
+# how many search results to try before giving up on a query
+MAX_CANDIDATES = 3
+
+
+# one lock per cache file, shared by every WikiCache using it
+_file_locks = {}
+_file_locks_guard = threading.Lock()
+
+
+def _file_lock(path):
+    with _file_locks_guard:
+        return _file_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+# look a query up on Wikipedia
+def wikipedia_source(query):
+    """
+    Default lookup: resolve query to a Wikipedia page record.
+
+    Tries the first few search results in order, skipping disambiguation
+    pages, and remembers the disambiguation options it ran into.
+    """
+    import wikipedia
+
+    results = wikipedia.search(query)
+    if not results:
+        return {'status': 'missing'}
+
+    options = []
+    for title in results[:MAX_CANDIDATES]:
+        try:
+            page = wikipedia.page(title, auto_suggest=False)
+            return {'status': 'ok', 'title': page.title, 'url': page.url,
+                    'summary': page.summary, 'options': options}
+        except wikipedia.DisambiguationError as e:
+            options.extend(e.options)
+        except wikipedia.PageError:
+            continue
+
+    if options:
+        return {'status': 'disambiguation', 'options': options}
+    return {'status': 'missing'}
+
+
+class WikiCache:
+    """
+    Local cache mapping a query (usually a ticker symbol) to its resolved
+    Wikipedia page title, URL and summary.
+
+    Disambiguation outcomes and misses are stored too, with a shorter TTL,
+    so a warm cache answers every known query without network round-trips.
+
+    Args:
+        cache_dir: Directory holding the cache file.
+        source: Callable query -> record; defaults to the wikipedia library.
+        found_ttl: Seconds a resolved page is trusted.
+        not_found_ttl: Seconds a miss or disambiguation is trusted.
+        offline: Never call the source.
+    """
+
+    def __init__(self, cache_dir=None, source=None, found_ttl=FOUND_TTL, not_found_ttl=NOT_FOUND_TTL,
+                 offline=False, max_workers=8):
+        cache_dir = cache_dir or os.environ.get('QUICKSTOCK_CACHE_DIR', DEFAULT_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.path = os.path.join(cache_dir, 'wiki.json')
+        self.source = source or wikipedia_source
+        self.found_ttl = found_ttl
+        self.not_found_ttl = not_found_ttl
+        self.offline = offline
+        self.max_workers = max_workers
+
+        self._records = read_json(self.path, {})
+        self._lock = threading.Lock()
+        self._file_lock = _file_lock(self.path)
+
+    # normalized cache key
+    def _key(self, query):
+        return query.strip().upper()
+
+    def _is_fresh(self, record):
+        ttl = self.found_ttl if record['status'] == 'ok' else self.not_found_ttl
+        return time.time() - record['resolved_at'] <= ttl
+
+    def cached(self, query):
+        """
+        Get the stored record for query, fresh or not, without any lookup.
+        """
+        with self._lock:
+            return self._records.get(self._key(query))
+
+    # pick up records another process (e.g. the refresh worker) saved since
+    def _reload(self):
+        records = read_json(self.path, {})
+        with self._lock:
+            for key, record in records.items():
+                current = self._records.get(key)
+                if current is None or record['resolved_at'] > current['resolved_at']:
+                    self._records[key] = record
+
+    def _store(self, records):
+        # merge first so another process's newer records aren't overwritten,
+        # and hold the file lock so this process's other writers don't either
+        with self._file_lock:
+            self._reload()
+            with self._lock:
+                self._records.update(records)
+                snapshot = dict(self._records)
+            write_json(self.path, snapshot)
+
+    # look a query up and build its record
+    def _resolve(self, query):
+        record = dict(self.source(query))
+        record['query'] = query
+        record['resolved_at'] = time.time()
+        return record
+
+    def lookup(self, query):
+        """
+        Get the record for query, resolving it only on a miss or when the
+        stored record has expired.
+
+        Returns:
+            Dictionary with 'status' ('ok', 'disambiguation' or 'missing')
+            and, when found, 'title', 'url' and 'summary'.
+        """
+        record = self.cached(query)
+        if record is None or not self._is_fresh(record):
+            self._reload()
+            record = self.cached(query)
+        if record is not None and (self.offline or self._is_fresh(record)):
+            return record
+        if self.offline:
+            return {'query': query, 'status': 'missing'}
+
+        record = self._resolve(query)
+        self._store({self._key(query): record})
+        return record
+
+    def lookup_many(self, queries):
+        """
+        Resolve a whole watchlist, looking up the unknown or expired queries
+        concurrently and saving the cache once at the end.
+
+        Returns:
+            Dictionary mapping each query to its record.
+        """
+        self._reload()
+
+        records = {}
+        pending = []
+        for query in queries:
+            record = self.cached(query)
+            if record is not None and (self.offline or self._is_fresh(record)):
+                records[query] = record
+            elif self.offline:
+                records[query] = {'query': query, 'status': 'missing'}
+            else:
+                pending.append(query)
+
+        if pending:
+            resolved = {}
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending)))) as pool:
+                futures = {query: pool.submit(self._resolve, query) for query in pending}
+                for query, future in futures.items():
+                    try:
+                        records[query] = future.result()
+                        resolved[self._key(query)] = records[query]
+                    except Exception as e:
+                        # network failures aren't cached, only real outcomes
+                        records[query] = {'query': query, 'status': 'error', 'error': str(e)}
+            self._store(resolved)
+
+        return records
+
+
+# process-wide default cache
+_wiki_cache = None
+
+
+def get_wiki_cache():
+    """
+    Get the shared WikiCache, creating it on first use.
+    """
+    global _wiki_cache
+    if _wiki_cache is None:
+        offline = os.environ.get('QUICKSTOCK_OFFLINE', '') not in ('', '0')
+        _wiki_cache = WikiCache(offline=offline)
+    return _wiki_cache
+
+
+def set_wiki_cache(cache):
+    """
+    Replace the shared WikiCache, e.g. with one backed by a local test source.
+    """
+    global _wiki_cache
+    _wiki_cache = cache
@@ -2,23 +2,62 @@
 # Date Created: 5/15/23
 
 from datetime import timedelta, datetime, time
-import yfinance as yf
 import pandas as pd
 from dotenv import load_dotenv
 import os
 
-from Gen_Files.GetArticles import *
-from Gen_Files.Stock_Analyzer import *
+from Gen_Files.GetArticles import crawl_articles
+from Gen_Files.Stock_Analyzer import plot_stock_with_interactive_chart
+from Gen_Files.Summary import google_summary
 import streamlit as st
-from Gen_Files.Gen_Funcs import *
+from Gen_Files.Gen_Funcs import (error_message, get_stock_data, get_indicators, get_portfolio_data,
+                                 get_wiki_info)
+from Gen_Files.Compute import company_profile, price_stats, compute_frontier
+from Gen_Files.Render import (streamlit_company_profile, streamlit_price_stats, streamlit_indicators,
+                              streamlit_portfolio, frontier_figure)
+from Gen_Files.Fetch_Orchestrator import FetchOrchestrator
+from Gen_Files.MA_Engine import update_crossovers
+from Gen_Files.Price_Cache import get_price_cache
+from Gen_Files.LLM_Client import get_llm_latency
+from Gen_Files.Article_Store import get_article_store
+from Gen_Files.Refresh_Scheduler import RefreshScheduler, get_watchlist
+from Gen_Files.Shared_Cache import get_shared_cache, enable_copy_on_write
 
 # set env vars
 load_dotenv()
 
+# let the shared cache hand out frames as shallow copies (always on from pandas 3)
+enable_copy_on_write()
+
 # Page config (Title at top and icon at top )
 st.set_page_config(layout='wide', initial_sidebar_state="expanded", )
 
 
+# keep the caches warm for the WATCHLIST symbols, once per server process
+# (set QUICKSTOCK_BACKGROUND_REFRESH=0 when running the worker separately)
+@st.cache_resource
+def start_refresh_scheduler():
+    watchlist = get_watchlist()
+    if not watchlist or os.environ.get('QUICKSTOCK_BACKGROUND_REFRESH', '1') in ('', '0'):
+        return None
+    return RefreshScheduler(watchlist).start()
+
+
+refresh_scheduler = start_refresh_scheduler()
+
+
+# pure results are cached by their inputs, so reruns (every widget change)
+# don't recompute them
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_price_stats(symbol, hist):
+    return price_stats(symbol, hist)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_frontier(stock_data, method, num_portfolios):
+    return compute_frontier(stock_data, method=method, num_portfolios=num_portfolios)
+
+
 # set page parameters
 # Title
 st.title("Quick Stock Info")
@@ -43,13 +82,19 @@ with st.sidebar:
 
     # if button is pressed
     if fetch_button or primary_ticker != "":
+        # start every independent fetch at once, each tab waits only for its own data
+        orchestrator = FetchOrchestrator()
+        orchestrator.submit("stock_data", get_stock_data, primary_ticker, start_date, end_date, timeout=30)
+        orchestrator.submit("wiki_info", get_wiki_info, primary_ticker, timeout=15)
+        orchestrator.submit("articles", crawl_articles, primary_ticker, timeout=20)
+
         try:
             # display company info
-            global ticker, info, hist, symbol
-            ticker, info, hist, symbol = get_stock_data(primary_ticker, start_date, end_date)
+            global info, hist, symbol
+            info, hist, symbol = orchestrator.result("stock_data")
 
-            # get ytd data
-            ytd_data = ticker.history(period="ytd")
+            # get ytd data, sliced from the loaded history
+            ytd_data = get_price_cache().get_period(primary_ticker, "ytd", hist, loaded=(start_date, end_date))
 
             # get daily returns
             # daily_returns = get_daily_returns(symbol, start_date, end_date)
@@ -66,8 +111,25 @@ with tab1:
             st.subheader(info['longName'] + " (" + primary_ticker + ")")
             
             try:
-                # plot price stock data                
-                plot_stock_with_interactive_chart(primary_ticker, hist)
+                # quick ranges are sliced from the loaded history, fetching only
+                # when the window reaches back before the start date
+                quick_range = st.radio("Range", ["All", "1M", "3M", "6M", "YTD", "1Y", "5Y"],
+                                       horizontal=True, label_visibility="collapsed")
+
+                # plot price stock data, reusing the saved moving average state
+                ma_engine = update_crossovers(primary_ticker, hist)
+                if quick_range == "All" or hist.empty:
+                    fig = plot_stock_with_interactive_chart(primary_ticker, hist, engine=ma_engine)
+                else:
+                    window = get_price_cache().get_period(primary_ticker, quick_range, hist,
+                                                          loaded=(start_date, end_date))
+                    if len(window) and window.index[0] >= hist.index[0]:
+                        fig = plot_stock_with_interactive_chart(primary_ticker, hist, engine=ma_engine,
+                                                                x_range=(window.index[0], hist.index[-1]))
+                    else:
+                        fig = plot_stock_with_interactive_chart(primary_ticker, window)
+                st.plotly_chart(fig, use_container_width=True)
+                orchestrator.mark_first_paint()
 
             except Exception as e:
                 error_message(e)
@@ -79,8 +141,10 @@ with tab1:
                 try:
                     # display company info
                     st.write("Company Info:")
-                    display_stock_info(info, hist)
-                    
+                    streamlit_company_profile(company_profile(primary_ticker, info, hist))
+
+                    # price statistics of the loaded range
+                    streamlit_price_stats(cached_price_stats(primary_ticker, hist))
 
                 except Exception as e:
                     error_message(e)
@@ -91,8 +155,12 @@ with tab1:
                 try:
                     # display wiki info
                     st.write("Wiki Info:")
-                    wiki_info = get_wiki_info(primary_ticker)
-                    st.markdown(wiki_info)
+                    wiki_url, wiki_record = orchestrator.result("wiki_info")
+                    if wiki_url is not None:
+                        st.markdown(wiki_url)
+                        st.write(wiki_record['summary'])
+                    else:
+                        st.write("No Wikipedia page found")
 
                 except Exception as e:
                     error_message(e)
@@ -132,6 +200,8 @@ with tab3:
     st.subheader("Efficient Frontier")
     try:
         portfolio_tickers = st.text_input("Portfolio Tickers (comma separated):").upper()
+        frontier_method = st.radio("Frontier Method:", ["Analytic", "Simulation"], horizontal=True)
+        overlay_portfolios = st.checkbox("Overlay random portfolios", value=False)
         col1, col2 = st.columns((1, 1))
     except Exception as e:
         pass
@@ -139,62 +209,35 @@ with tab3:
     if portfolio_tickers != "":
         # get stock data for the input tickers
         try:
-            stock_data = get_stock_data(portfolio_tickers, start_date, end_date)
-            tickers = portfolio_tickers.split(",")
+            stock_data, failed_tickers = get_portfolio_data(portfolio_tickers, start_date, end_date)
+
+            # report tickers that couldn't be loaded
+            for failed_ticker, reason in failed_tickers.items():
+                st.warning(failed_ticker + ": " + reason)
         except Exception as e:
             error_message(e)
     
     try:
         if portfolio_tickers != "":
-            fig, max_sharpe_portfolio, min_volatility_portfolio, results_dict = get_efficient_frontier(1000, stock_data)
+            if frontier_method == "Analytic":
+                frontier = cached_frontier(stock_data, "analytic", 5000 if overlay_portfolios else 0)
+            else:
+                frontier = cached_frontier(stock_data, "simulation", 100000)
 
             container = st.container()
 
             # display the efficient frontier
             with container:
-                st.plotly_chart(fig, use_container_width=True)
-
+                st.plotly_chart(frontier_figure(frontier), use_container_width=True)
 
             with col1:
-                # display the max sharpe portfolio
-                st.write("Max Sharpe Portfolio:")
-
-                st.write("Return:")
-                st.markdown(max_sharpe_portfolio['Return'])
-
-                st.write("Volatility:")
-                st.markdown(max_sharpe_portfolio['Volatility'])
-
-                st.write("Sharpe Ratio:")
-                st.markdown(max_sharpe_portfolio['Sharpe Ratio'])
-
-                # display the weights from the max sharpe portfolio
-                st.write("Weights:")
-                for key, value in results_dict['Weights']:
-                    if key in tickers:
-                        st.write(key + ": " + str(value))
-                
+                # display the max sharpe portfolio and its weights
+                streamlit_portfolio("Max Sharpe Portfolio:", frontier, frontier.max_sharpe)
 
             with col2:
-                # display the min volatility portfolio
-                st.write("Min Volatility Portfolio:")
+                # display the min volatility portfolio and its weights
+                streamlit_portfolio("Min Volatility Portfolio:", frontier, frontier.min_volatility)
 
-                st.write("Return:")
-                st.markdown(min_volatility_portfolio['Return'])
-
-                st.write("Volatility:")
-                st.markdown(min_volatility_portfolio['Volatility'])
-
-                st.write("Sharpe Ratio:")
-                st.markdown(min_volatility_portfolio['Sharpe Ratio'])
-
-                # display the weights of each stock from the min volatility portfolio
-                st.write("Weights:")
-                for key, value in results_dict['Weights']:
-                    if key in tickers:
-                        st.write(key + ": " + str(value))
-
-    
     except Exception as e:
         error_message(e)
 
@@ -202,32 +245,68 @@ with tab3:
 with tab4:
     try:
         if primary_ticker != "":            
-            # plot price stock data                
-            plot_stock_with_interactive_chart(primary_ticker, hist)
+            # plot price stock data
+            st.plotly_chart(plot_stock_with_interactive_chart(primary_ticker, hist), use_container_width=True)
         
     except Exception as e:
         error_message(e)
 
     try:
         if primary_ticker != "":
-            # analyze stock data
-            st.write(google_summary(hist, info))
+            # display technical indicators
+            st.write("Technical Indicators:")
+            streamlit_indicators(get_indicators(primary_ticker, hist))
+
+    except Exception as e:
+        error_message(e)
+
+    try:
+        if primary_ticker != "":
+            # analyze stock data, showing the text as it is generated
+            st.write_stream(google_summary(hist, info, stream=True))
     
     except Exception as e:
         error_message(e)
     
     try:
-            # get articles
-            # articles = get_MW_Articles(primary_ticker, 5)
-
-            # # display articles
-            # st.write("Articles:")
-
-            # # display articles
-            # for article in articles[:5]:
-            #     col2.write(article['title'])
-            #     col2.write(article['url'])
-
-            st.markdown("***Placeholder text for article analysis***")
+        if primary_ticker != "":
+            # wait for this run's crawl, stored headlines are shown even if it failed
+            try:
+                orchestrator.result("articles")
+            except Exception as e:
+                print(f"Article crawl failed for {primary_ticker}: {e}")
+
+            # display recent headlines from the article store
+            st.write("Recent Headlines:")
+            headlines = get_article_store().recent_headlines(primary_ticker, limit=10)
+            if not headlines:
+                st.write("No articles found.")
+            for article in headlines:
+                st.markdown(f"[{article['title'] or article['url']}]({article['url']}) "
+                            f"- {article['source']}, {article['fetched_date']}")
     except Exception as e:
         error_message(e)
+
+# page load timings
+if fetch_button or primary_ticker != "":
+    with st.sidebar:
+        load_metrics = orchestrator.metrics()
+        if load_metrics['first_paint'] is not None:
+            st.caption(f"First paint: {load_metrics['first_paint']:.2f}s")
+        with st.expander("Fetch timings"):
+            for name, call in load_metrics['calls'].items():
+                latency = "-" if call['latency'] is None else f"{call['latency']:.2f}s"
+                st.write(f"{name}: {latency} ({call['status']})")
+
+            # cross-session data layer
+            shared_metrics = get_shared_cache().metrics()
+            hit_rate = "-" if shared_metrics['hit_rate'] is None else f"{shared_metrics['hit_rate']:.0%}"
+            st.write(f"shared cache: {hit_rate} hits, {shared_metrics['entries']} entries, "
+                     f"{shared_metrics['bytes'] / 2**20:.1f} of {shared_metrics['max_bytes'] / 2**20:.0f} MB")
+
+            # perceived latency of the AI analysis
+            llm_latency = get_llm_latency()
+            if llm_latency['last'] is not None:
+                st.write(f"analysis first token: {llm_latency['last']['first_token']:.2f}s, "
+                         f"total: {llm_latency['last']['total']:.2f}s")
+    orchestrator.shutdown()
@@ -0,0 +1,72 @@
+# bench_article_parsing.py
+#
+# Compare the old article extraction (a full html.parser BeautifulSoup tree
+# per extractor) with Article_Parser's single shared parse.
+#
+# Run from the repo root:  python -m benchmarks.bench_article_parsing [saved_page.html ...]
+# Without arguments a synthetic finance page is used.
+
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from Gen_Files.Article_Parser import HAVE_LXML, parse_page
+
+# a large page shaped like a finance quote / search page
+def make_fixture(num_blocks=400):
+    parts = ['<html><head><script>var x = 1;</script><style>.a{}</style></head><body>']
+    for i in range(num_blocks):
+        parts.append(
+            f'<div class="row"><div class="meta"><span>{i}</span><span>+0.{i}%</span>'
+            f'<table><tr><td>Open</td><td>{i}.00</td></tr><tr><td>Close</td><td>{i}.50</td></tr></table></div>'
+            f'<h3 class="article__headline"><a href="/story/{i}">Headline number {i}</a></h3>'
+            f'<p>The company reported results for quarter {i}.</p>'
+            f'<ul><li><a href="https://example.com/{i}">External {i}</a></li><li>item</li></ul></div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def load_fixtures(paths):
+    if not paths:
+        return {'synthetic_finance_page.html': make_fixture()}
+
+    fixtures = {}
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+# old approach: one full html.parser tree per extractor
+def extract_old(html):
+    links = [a.get('href') for a in BeautifulSoup(html, 'html.parser').find_all('a')]
+    headlines = [h3.text.strip() for h3 in BeautifulSoup(html, 'html.parser').find_all(
+        'h3', {'class': 'article__headline'})]
+    paragraphs = [p.getText() for p in BeautifulSoup(html, 'html.parser').find_all('p') if "company" in str(p)]
+    return links, headlines, paragraphs
+
+
+# new approach: one shared parse
+def extract_new(html):
+    page = parse_page(html)
+    return page.links(), page.headlines(), page.paragraphs(contains="company")
+
+
+def best_of(fn, html, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    print(f"parser backend: {'lxml' if HAVE_LXML else 'html.parser + SoupStrainer'}")
+    for name, html in load_fixtures(sys.argv[1:]).items():
+        old_seconds = best_of(extract_old, html)
+        new_seconds = best_of(extract_new, html)
+        print(f"{name} ({len(html) / 1024:.0f} KiB): old {old_seconds * 1000:8.1f} ms  "
+              f"new {new_seconds * 1000:8.1f} ms  ({old_seconds / new_seconds:.1f}x)")
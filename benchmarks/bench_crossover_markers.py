@@ -0,0 +1,43 @@
+# bench_crossover_markers.py
+#
+# Compare figure build time and browser payload size for crossover
+# annotations (one layout object per crossover) against marker traces
+# (one trace per direction).
+#
+# Run from the repo root:  python -m benchmarks.bench_crossover_markers
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from Gen_Files.Stock_Analyzer import plot_stock_with_interactive_chart
+
+
+# synthetic daily history with lots of crossovers
+def make_history(num_bars, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('1990-01-01', periods=num_bars)
+    close = 100 + np.cumsum(rng.normal(0, 1, num_bars))
+    return pd.DataFrame({'Close': close}, index=index)
+
+
+def bench(style, hist, short_window, long_window, repeat=2):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = plot_stock_with_interactive_chart('BENCH', hist.copy(), short_window, long_window,
+                                                crossover_style=style)
+        payload = fig.to_json()
+        best = min(best, time.perf_counter() - start)
+    return best, len(payload)
+
+
+if __name__ == '__main__':
+    for num_bars in (2500, 5000, 10000):
+        hist = make_history(num_bars)
+        for short_window, long_window in ((5, 20), (15, 100)):
+            print(f"{num_bars} bars, {short_window}/{long_window} MA:")
+            for style in ('annotations', 'markers'):
+                seconds, size = bench(style, hist, short_window, long_window)
+                print(f"  {style:<12} build+serialize {seconds * 1000:8.1f} ms  payload {size / 1024:8.1f} KiB")
@@ -0,0 +1,103 @@
+# bench_import_time.py
+#
+# Cold-start guard for Gen_Files: import each module in a fresh interpreter,
+# time the import, and check that none of them loads a UI or network-client
+# dependency (those are imported by the functions that use them).
+#
+# Exits non-zero when a module pulls in a heavy dependency or takes more than
+# --budget-ms longer to import than pandas itself, so it can gate a CI step.
+#
+# Run from the repo root:  python -m benchmarks.bench_import_time [--repeat 5] [--budget-ms 250]
+
+import sys
+import json
+import argparse
+import subprocess
+
+# modules that must stay cheap to import
+MODULES = [
+    'Gen_Files.Indicators',
+    'Gen_Files.Price_Stats',
+    'Gen_Files.Portfolio_Frontier',
+    'Gen_Files.Downsample',
+    'Gen_Files.LLM_Client',
+    'Gen_Files.Summary',
+    'Gen_Files.Render',
+    'Gen_Files.Compute',
+    'Gen_Files.Fetch_Orchestrator',
+    'Gen_Files.Price_Store',
+    'Gen_Files.Price_Cache',
+    'Gen_Files.Metadata_Store',
+    'Gen_Files.Wiki_Cache',
+    'Gen_Files.MA_Engine',
+    'Gen_Files.Shared_Cache',
+    'Gen_Files.Article_Store',
+    'Gen_Files.Refresh_Scheduler',
+    'Gen_Files.Report_Builder',
+    'Gen_Files.Service',
+    'Gen_Files.Gen_Funcs',
+    'Gen_Files.Stock_Analyzer',
+]
+
+# dependencies only the functions that need them may import
+HEAVY = ['streamlit', 'plotly', 'matplotlib', 'yfinance', 'wikipedia', 'tkinter', 'docx',
+         'google.generativeai', 'google.genai']
+
+# every module needs pandas, so its import time is the floor
+BASELINE = 'pandas'
+
+# measure one import in a fresh interpreter
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    """
+    Best import time of module over repeat fresh interpreters, and the heavy
+    dependencies it loaded.
+    """
+    best = float('inf')
+    heavy = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY)],
+                                capture_output=True, text=True, check=True)
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        best = min(best, sample['seconds'])
+        heavy = sample['heavy']
+    return best, heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time cold imports of the Gen_Files modules.")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per module (best is kept).")
+    parser.add_argument('--budget-ms', type=float, default=250,
+                        help=f"Allowed import time above importing {BASELINE} alone.")
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    args = parser.parse_args(argv)
+
+    baseline, _ = measure(BASELINE, args.repeat)
+    print(f"{BASELINE:32s} {baseline * 1000:8.1f} ms  (baseline)")
+
+    failures = []
+    for module in args.modules:
+        seconds, heavy = measure(module, args.repeat)
+        over = (seconds - baseline) * 1000 > args.budget_ms
+        note = ', '.join(heavy) if heavy else ''
+        print(f"{module:32s} {seconds * 1000:8.1f} ms  {'OVER BUDGET ' if over else ''}{note}")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)}")
+        if over:
+            failures.append(f"{module} takes {(seconds - baseline) * 1000:.0f} ms over {BASELINE}")
+
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+# bench_indicators.py
+#
+# Compare Gen_Files.Indicators against the equivalent pandas rolling/ewm
+# calls, for one long history and for a batch of tickers at once.
+#
+# Before timing, check the NaN handling against pandas: a missing bar in
+# the middle of a history, and a ticker in a batch that starts later than
+# the others (leading NaNs). Exits non-zero when a check fails.
+#
+# Run from the repo root:  python -m benchmarks.bench_indicators
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from Gen_Files.Indicators import compute_indicators, sma, ema, drawdown, bollinger_bands, rolling_volatility
+
+
+# synthetic OHLC panel (bars x tickers)
+def make_panel(num_bars, num_tickers, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (num_bars, num_tickers)), axis=0)
+    high = close + rng.random((num_bars, num_tickers))
+    low = close - rng.random((num_bars, num_tickers))
+    return close, high, low
+
+
+# the same indicator set with pandas, one ticker at a time
+def pandas_indicators(close, high, low):
+    out = []
+    for column in range(close.shape[1]):
+        c, h, l = pd.Series(close[:, column]), pd.Series(high[:, column]), pd.Series(low[:, column])
+
+        ema_12 = c.ewm(span=12, adjust=False).mean()
+        ema_26 = c.ewm(span=26, adjust=False).mean()
+        macd_line = ema_12 - ema_26
+
+        change = c.diff()
+        avg_gain = change.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        avg_loss = (-change).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+
+        true_range = pd.concat([h - l, (h - c.shift()).abs(), (l - c.shift()).abs()], axis=1).max(axis=1)
+
+        out.append({
+            'SMA Short': c.rolling(10).mean(),
+            'SMA Long': c.rolling(100).mean(),
+            'EMA 12': ema_12,
+            'EMA 26': ema_26,
+            'RSI': 100 - 100 / (1 + avg_gain / avg_loss),
+            'MACD': macd_line,
+            'MACD Signal': macd_line.ewm(span=9, adjust=False).mean(),
+            'Bollinger Middle': c.rolling(20).mean(),
+            'Bollinger Std': c.rolling(20).std(ddof=0),
+            'Volatility': c.pct_change().rolling(21).std() * np.sqrt(252),
+            'Drawdown': c / c.cummax() - 1,
+            'ATR': true_range.ewm(alpha=1 / 14, adjust=False).mean(),
+        })
+    return out
+
+
+# NaN handling: a gap mid-history, and a late-starting ticker in a batch
+def check_nans(num_bars=10000, lead=700):
+    close, high, low = make_panel(num_bars, 1)
+    close, high, low = close[:, 0], high[:, 0], low[:, 0]
+
+    gap = close.copy()
+    gap[num_bars // 2] = np.nan
+    series = pd.Series(gap)
+    middle, upper, _ = bollinger_bands(gap)
+
+    checks = {
+        'SMA, NaN mid-history': (sma(gap, 10), series.rolling(10).mean()),
+        'EMA, NaN mid-history': (ema(gap, 12), series.ewm(span=12, adjust=False, ignore_na=True).mean()),
+        'Bollinger middle, NaN mid-history': (middle, series.rolling(20).mean()),
+        'Bollinger std, NaN mid-history': ((upper - middle) / 2, series.rolling(20).std(ddof=0)),
+        'Volatility, NaN mid-history': (rolling_volatility(gap),
+                                        series.pct_change(fill_method=None).rolling(21).std() * np.sqrt(252)),
+        'Drawdown, NaN mid-history': (drawdown(gap), series / series.cummax() - 1),
+    }
+
+    # a ticker listed lead bars later gets the same values as its history alone
+    def late(values):
+        return np.column_stack([values, np.concatenate([np.full(lead, np.nan), values[:-lead]])])
+
+    batch = compute_indicators(late(close), late(high), late(low))
+    alone = compute_indicators(close[:-lead], high[:-lead], low[:-lead])
+    for name, values in batch.items():
+        expected = np.concatenate([np.full(lead, np.nan), alone[name]])
+        checks[f"{name}, late-starting ticker"] = (values[:, 1], expected)
+
+    failures = []
+    for name, (values, expected) in checks.items():
+        ok = np.allclose(values, expected, rtol=1e-7, atol=1e-7, equal_nan=True)
+        print(f"  {name:40s} {'ok' if ok else 'MISMATCH'}")
+        if not ok:
+            failures.append(name)
+    return failures
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    print("NaN handling:")
+    failures = check_nans()
+
+    for num_bars, num_tickers in ((10000, 1), (2500, 50), (2500, 500)):
+        close, high, low = make_panel(num_bars, num_tickers)
+        pandas_seconds = best_of(lambda: pandas_indicators(close, high, low))
+        numpy_seconds = best_of(lambda: compute_indicators(close, high, low))
+        print(f"{num_bars} bars x {num_tickers} tickers: pandas {pandas_seconds * 1000:8.1f} ms  "
+              f"Indicators {numpy_seconds * 1000:8.1f} ms  ({pandas_seconds / numpy_seconds:.1f}x)")
+
+    raise SystemExit(1 if failures else 0)
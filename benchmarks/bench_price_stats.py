@@ -0,0 +1,144 @@
+# bench_price_stats.py
+#
+# Compare the Price_Stats kernel against the column-by-column pandas scans
+# get_price_info used to do after rereading the price store: one long
+# history, a batch of tickers at once, and appending one bar to a running
+# PriceStatsAccumulator instead of recomputing the whole history.
+#
+# Before timing, check that a batch of histories of different lengths gives
+# each ticker the same statistics as computing it alone. Exits non-zero when
+# a check fails.
+#
+# Run from the repo root:  python -m benchmarks.bench_price_stats
+
+import os
+import time
+import tempfile
+import dataclasses
+
+import numpy as np
+import pandas as pd
+
+from Gen_Files.Price_Store import PriceStore
+from Gen_Files.Price_Stats import summary_stats, PriceStatsAccumulator
+from Gen_Files.Compute import price_stats, price_stats_many
+
+
+# synthetic daily OHLCV bars
+def make_bars(periods, seed=0, start='1980-01-01'):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=periods, tz='America/New_York', name='Date')
+    close = 100 + np.abs(np.cumsum(rng.normal(0, 1, periods)))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.1, periods),
+        'High': close + rng.random(periods),
+        'Low': close - rng.random(periods),
+        'Close': close,
+        'Volume': rng.integers(1_000, 1_000_000, periods),
+    }, index=index)
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# what get_price_info computed before: reread the store, then one scan per metric
+def old_price_info(store, symbol, hist):
+    df = store.read(symbol, hist.index[0], hist.index[-1] + pd.Timedelta(days=1),
+                    columns=['High', 'Low', 'Close', 'Volume'])
+    return (hist['Close'].iloc[-1], hist['Volume'].iloc[-1], df['High'].max(), df['Low'].min(),
+            df['Close'].mean(), df['Volume'].mean())
+
+
+# the same metrics plus the new ones, with pandas one column at a time
+def pandas_stats(hist):
+    returns = hist['Close'].pct_change()
+    last_year = hist[hist.index > hist.index[-1] - pd.Timedelta(weeks=52)]
+    typical = (hist['High'] + hist['Low'] + hist['Close']) / 3
+    return (hist['High'].max(), hist['Low'].min(), hist['Close'].mean(), hist['Volume'].mean(),
+            (typical * hist['Volume']).sum() / hist['Volume'].sum(),
+            hist['Close'].iloc[-1] / hist['Close'].iloc[0] - 1, returns.std() * np.sqrt(252),
+            (hist['Close'] / hist['Close'].cummax() - 1).min(), last_year['High'].max(), last_year['Low'].min())
+
+
+# batched statistics must match each ticker computed alone
+def check_batched():
+    hists = {
+        'LONG': make_bars(800, seed=1, start='2020-01-01'),
+        'ENDS EARLY': make_bars(400, seed=2, start='2020-01-01'),
+        'STARTS LATE': make_bars(300, seed=3, start='2021-06-01'),
+        'SHORT': make_bars(30, seed=4, start='2020-06-01'),
+    }
+    batch = price_stats_many(hists)
+
+    failures = []
+    for symbol, hist in hists.items():
+        alone = dataclasses.asdict(price_stats(symbol, hist))
+        batched = dataclasses.asdict(batch[symbol])
+        mismatched = [name for name, value in alone.items()
+                      if not (value == batched[name] or isinstance(value, float)
+                              and np.isclose(value, batched[name], rtol=1e-9, equal_nan=True))]
+        print(f"  {symbol:12s} {'ok' if not mismatched else 'MISMATCH ' + ', '.join(mismatched)}")
+        if mismatched:
+            failures.append(symbol)
+    return failures
+
+
+def report(label, old_seconds, new_seconds):
+    print(f"  {label:34s} old {old_seconds * 1000:9.2f} ms  new {new_seconds * 1000:8.2f} ms  "
+          f"({old_seconds / new_seconds:.1f}x)")
+
+
+if __name__ == '__main__':
+    print("batched vs single-ticker:")
+    failures = check_batched()
+
+    hist = make_bars(45 * 252)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PriceStore(os.path.join(tmp_dir, 'Prices'))
+        store.append('BENCH', hist)
+
+        print(f"one history ({len(hist)} bars):")
+        report("store read + column scans", best_of(lambda: old_price_info(store, 'BENCH', hist)),
+               best_of(lambda: price_stats('BENCH', hist)))
+        report("pandas, all metrics", best_of(lambda: pandas_stats(hist)),
+               best_of(lambda: price_stats('BENCH', hist)))
+
+    hists = {f'T{i}': make_bars(10 * 252, seed=i, start='2010-01-01') for i in range(500)}
+    print(f"batch ({len(hists)} tickers x {10 * 252} bars):")
+    report("pandas per ticker vs batched",
+           best_of(lambda: [pandas_stats(h) for h in hists.values()], 1),
+           best_of(lambda: price_stats_many(hists), 1))
+    panel = np.column_stack([h['Close'].to_numpy(dtype=float) for h in hists.values()])
+    report("kernel per ticker vs one 2D call",
+           best_of(lambda: [summary_stats(panel[:, i]) for i in range(panel.shape[1])], 1),
+           best_of(lambda: summary_stats(panel), 1))
+
+    # append one bar at a time to a running accumulator
+    base, new_bars = hist.iloc[:-250], hist.iloc[-250:]
+    columns = [new_bars[name].to_numpy(dtype=float) for name in ('Close', 'High', 'Low', 'Volume')]
+
+    def incremental():
+        accumulator = PriceStatsAccumulator().update(base['Close'].to_numpy(dtype=float), dates=base.index)
+        start = time.perf_counter()
+        for i in range(len(new_bars)):
+            accumulator.update(*(column[i:i + 1] for column in columns), dates=new_bars.index[i:i + 1])
+            accumulator.result()
+        return time.perf_counter() - start
+
+    def recompute():
+        start = time.perf_counter()
+        for i in range(len(new_bars)):
+            price_stats('BENCH', hist.iloc[:len(base) + i + 1])
+        return time.perf_counter() - start
+
+    print(f"append {len(new_bars)} bars one at a time:")
+    report("recompute vs accumulator", recompute(), incremental())
+
+    raise SystemExit(1 if failures else 0)
@@ -0,0 +1,81 @@
+# bench_price_store.py
+#
+# Compare the Parquet PriceStore against the <ticker>_Price_Data.csv files
+# the GUIs used to write: full writes, full reads, one-year range reads and
+# appending a day of bars, for a long daily and an intraday history.
+#
+# Run from the repo root:  python -m benchmarks.bench_price_store
+
+import os
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from Gen_Files.Price_Store import PriceStore, read_price_csv
+
+
+# synthetic OHLCV bars
+def make_bars(start, periods, freq, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=periods, freq=freq, tz='America/New_York', name='Date')
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.1, periods),
+        'High': close + rng.random(periods),
+        'Low': close - rng.random(periods),
+        'Close': close,
+        'Volume': rng.integers(1_000, 1_000_000, periods),
+    }, index=index)
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(name, bars, tmp_dir):
+    csv_path = os.path.join(tmp_dir, name + '_Price_Data.csv')
+    store = PriceStore(os.path.join(tmp_dir, 'store'))
+
+    last_year = bars.index[-1].year
+    year_start, year_end = f'{last_year}-01-01', f'{last_year + 1}-01-01'
+    new_bars = make_bars(bars.index[-1] + (bars.index[-1] - bars.index[-2]), 400, bars.index.freq, seed=1)
+
+    def csv_range():
+        df = read_price_csv(csv_path)
+        index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        return df[(index >= year_start) & (index < year_end)]
+
+    def csv_append():
+        df = pd.concat([read_price_csv(csv_path), new_bars.tz_convert('UTC')])
+        df.to_csv(csv_path)
+
+    results = {
+        'write': (best_of(lambda: bars.to_csv(csv_path), 1),
+                  best_of(lambda: store.append(name, bars), 1)),
+        'read all': (best_of(lambda: read_price_csv(csv_path)),
+                     best_of(lambda: store.read(name))),
+        'read 1y': (best_of(csv_range),
+                    best_of(lambda: store.read(name, year_start, year_end))),
+        'read Close 1y': (best_of(lambda: csv_range()['Close']),
+                          best_of(lambda: store.read(name, year_start, year_end, columns=['Close']))),
+        'append': (best_of(csv_append, 1),
+                   best_of(lambda: store.append(name, new_bars), 1)),
+    }
+
+    print(f"{name}: {len(bars)} bars, CSV {os.path.getsize(csv_path) / 2**20:.1f} MB")
+    for label, (csv_seconds, store_seconds) in results.items():
+        print(f"  {label:14s} CSV {csv_seconds * 1000:9.1f} ms  Parquet {store_seconds * 1000:8.1f} ms  "
+              f"({csv_seconds / store_seconds:.1f}x)")
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run('DAILY', make_bars('1980-01-01', 45 * 252, 'B'), tmp_dir)
+        run('MINUTE', make_bars('2021-01-01', 500_000, 'min'), tmp_dir)
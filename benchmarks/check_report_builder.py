@@ -0,0 +1,120 @@
+# check_report_builder.py
+#
+# Check for the docx report batch: write_report must produce a document
+# holding every section and table row, and build_reports must write each
+# report as soon as its own data and chart are ready instead of waiting for
+# the slowest symbol. Gathering is replaced by synthetic data, so it runs
+# offline; python-docx and Matplotlib must be installed.
+#
+# Exits non-zero when a check fails, so it can gate a CI step.
+#
+# Run from the repo root:  python -m benchmarks.check_report_builder
+
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import Gen_Files.Report_Builder as Report_Builder
+from Gen_Files.Compute import price_stats, indicator_set
+from Gen_Files.Render import price_stat_rows, indicator_rows
+
+# gather delay of the slow symbol in the pipeline check
+SLOW_GATHER_SECONDS = 3.0
+
+
+# synthetic daily OHLCV bars
+def make_bars(periods=300, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2022-01-03', periods=periods, tz='America/New_York', name='Date')
+    close = 100 + np.abs(np.cumsum(rng.normal(0, 1, periods)))
+    return pd.DataFrame({'Open': close, 'High': close + rng.random(periods), 'Low': close - rng.random(periods),
+                         'Close': close, 'Volume': rng.integers(1_000, 1_000_000, periods)}, index=index)
+
+
+# what gather_report_data returns, without touching the network
+def make_report_data(symbol, seed=0):
+    hist = make_bars(seed=seed)
+    return {'symbol': symbol, 'hist': hist, 'stats': price_stats(symbol, hist),
+            'indicators': indicator_set(symbol, hist),
+            'info': {'longName': f'{symbol} Corp', 'sector': 'Technology', 'industry': 'Software'},
+            'wiki': {'url': f'https://en.wikipedia.org/wiki/{symbol}', 'status': 'ok'},
+            'summary': f'{symbol} went up.', 'articles': [{'title': f'{symbol} news', 'url': 'https://example.com'}],
+            'errors': {}}
+
+
+def check_write_report(out_dir):
+    from docx import Document
+
+    data = make_report_data('CHK')
+    path = Report_Builder.write_report(data, Report_Builder.render_chart(data['hist']), out_dir)
+    doc = Document(path)
+
+    texts = [paragraph.text for paragraph in doc.paragraphs]
+    cells = [cell.text for table in doc.tables for row in table.rows for cell in row.cells]
+    expected = ['Stock Report for CHK', 'Name: CHK Corp', data['wiki']['url'], data['summary'], 'Price Summary',
+                'Technical Indicators', 'CHK news']
+    missing = [text for text in expected if text not in texts]
+    missing += [text for rows in (price_stat_rows(data['stats']), indicator_rows(data['indicators']))
+                for row in rows for text in row if text not in cells]
+    if len(doc.inline_shapes) != 1:
+        missing.append('chart')
+    print(f"  write_report             {'ok' if not missing else 'MISSING ' + ', '.join(missing)}")
+    return ['write_report'] if missing else []
+
+
+def check_pipeline(out_dir):
+    symbols = ['SLOW', 'A', 'B', 'C']
+    written = {}
+    gather, write = Report_Builder.gather_report_data, Report_Builder.write_report
+
+    def slow_gather(symbol, *args):
+        if symbol == 'SLOW':
+            time.sleep(SLOW_GATHER_SECONDS)
+        return make_report_data(symbol, seed=len(symbol))
+
+    def timed_write(data, chart, out_dir):
+        path = write(data, chart, out_dir)
+        written[data['symbol']] = time.perf_counter() - started
+        return path
+
+    Report_Builder.gather_report_data, Report_Builder.write_report = slow_gather, timed_write
+    try:
+        started = time.perf_counter()
+        reports, errors, metrics = Report_Builder.build_reports(symbols, '2022-01-03', out_dir=out_dir,
+                                                                workers=len(symbols), processes=0)
+    finally:
+        Report_Builder.gather_report_data, Report_Builder.write_report = gather, write
+
+    failures = []
+    if errors or sorted(reports) != sorted(symbols):
+        print(f"  build_reports            FAILED reports {sorted(reports)}, errors {errors}")
+        failures.append('build_reports')
+    fast = [seconds for symbol, seconds in written.items() if symbol != 'SLOW']
+    overlapped = bool(fast) and max(fast) < SLOW_GATHER_SECONDS
+    print(f"  pipeline overlap         {'ok' if overlapped else 'MISMATCH'} "
+          f"(fast reports written by {max(fast, default=float('nan')):.2f}s, "
+          f"slow gather takes {SLOW_GATHER_SECONDS:.1f}s)")
+    if not overlapped:
+        failures.append('pipeline overlap')
+    return failures
+
+
+if __name__ == '__main__':
+    failures = []
+
+    try:
+        import docx  # noqa: F401
+    except ImportError:
+        print("FAIL: python-docx is not installed (pip install -r requirements.txt)")
+        raise SystemExit(1)
+
+    print("reports:")
+    with tempfile.TemporaryDirectory() as out_dir:
+        failures += check_write_report(out_dir)
+        failures += check_pipeline(out_dir)
+
+    for failure in failures:
+        print("FAIL:", failure)
+    raise SystemExit(1 if failures else 0)
@@ -0,0 +1,151 @@
+# check_ui_adapters.py
+#
+# Smoke check for the Tk front end: GUIs.TKInter_GUI must import, and the
+# Render.tk_* adapters must build a frame holding every row of the result
+# they draw. Uses a real (hidden) Tk root when a display is available and
+# a stub tkinter module otherwise, so it also runs on a headless CI box.
+#
+# Exits non-zero when a check fails, so it can gate a CI step.
+#
+# Run from the repo root:  python -m benchmarks.check_ui_adapters
+
+import sys
+import types
+import importlib
+
+import numpy as np
+import pandas as pd
+
+from Gen_Files.Compute import company_profile, price_stats, indicator_set
+from Gen_Files.Render import (company_profile_rows, price_stat_rows, indicator_rows, tk_company_profile,
+                              tk_price_stats, tk_indicators)
+
+
+# synthetic daily OHLCV bars
+def make_bars(periods=300, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2022-01-03', periods=periods, tz='America/New_York', name='Date')
+    close = 100 + np.abs(np.cumsum(rng.normal(0, 1, periods)))
+    return pd.DataFrame({'Open': close, 'High': close + rng.random(periods), 'Low': close - rng.random(periods),
+                         'Close': close, 'Volume': rng.integers(1_000, 1_000_000, periods)}, index=index)
+
+
+class StubWidget:
+    """
+    Stand-in for a Tk widget: remembers its options, children and geometry
+    manager, and answers the few queries the checks make.
+    """
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+        self.children = []
+        self.manager = ''
+        if master is not None:
+            master.children.append(self)
+
+    def grid(self, **options):
+        self.manager = 'grid'
+
+    def pack(self, **options):
+        self.manager = 'pack'
+
+    def cget(self, key):
+        return self.options.get(key, '')
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def winfo_manager(self):
+        return self.manager
+
+    def destroy(self):
+        if self.master is not None:
+            self.master.children.remove(self)
+
+
+# a tkinter module made of StubWidgets
+def stub_tkinter():
+    module = types.ModuleType('tkinter')
+    module.Tk = type('Tk', (StubWidget,), {'withdraw': lambda self: None})
+    module.Frame = type('Frame', (StubWidget,), {})
+    module.Label = type('Label', (StubWidget,), {})
+    return module
+
+
+# texts of every placed label under widget
+def placed_texts(widget):
+    texts = []
+    for child in widget.winfo_children():
+        if child.winfo_manager():
+            text = child.cget('text')
+            if text:
+                texts.append(str(text))
+        texts.extend(placed_texts(child))
+    return texts
+
+
+def check_adapters(tk):
+    hist = make_bars()
+    info = {'longName': 'Check Corp', 'sector': 'Technology', 'industry': 'Software', 'marketCap': 1.5e12,
+            'longBusinessSummary': 'Makes software.'}
+    profile = company_profile('CHK', info, hist)
+    stats = price_stats('CHK', hist)
+    indicators = indicator_set('CHK', hist)
+
+    cases = {
+        'tk_company_profile': (tk_company_profile, profile,
+                               [profile.name, profile.summary], company_profile_rows(profile)),
+        'tk_price_stats': (tk_price_stats, stats, ["Summary"], price_stat_rows(stats)),
+        'tk_indicators': (tk_indicators, indicators, ["Technical Indicators"], indicator_rows(indicators)),
+    }
+
+    root = tk.Tk()
+    root.withdraw()
+    failures = []
+    try:
+        for name, (adapter, result, titles, rows) in cases.items():
+            frame = adapter(root, result)
+            frame.pack()
+            texts = placed_texts(root)
+            missing = [text for text in titles + [label + ":" for label, _ in rows] + [text for _, text in rows]
+                       if text not in texts]
+            print(f"  {name:24s} {'ok' if not missing else 'MISSING ' + ', '.join(missing)}")
+            if missing:
+                failures.append(name)
+            frame.destroy()
+    finally:
+        root.destroy()
+    return failures
+
+
+if __name__ == '__main__':
+    failures = []
+
+    print("imports:")
+    try:
+        importlib.import_module('GUIs.TKInter_GUI')
+        print("  GUIs.TKInter_GUI         ok")
+    except Exception as e:
+        print(f"  GUIs.TKInter_GUI         FAILED {type(e).__name__}: {e}")
+        failures.append('GUIs.TKInter_GUI')
+
+    import tkinter
+
+    try:
+        tkinter.Tk().destroy()
+        tk, label = tkinter, "Tk"
+    except tkinter.TclError:
+        tk, label = stub_tkinter(), "stub Tk, no display"
+
+    print(f"adapters ({label}):")
+    real = sys.modules['tkinter']
+    sys.modules['tkinter'] = tk
+    try:
+        failures += check_adapters(tk)
+    finally:
+        sys.modules['tkinter'] = real
+
+    for failure in failures:
+        print("FAIL:", failure)
+    raise SystemExit(1 if failures else 0)